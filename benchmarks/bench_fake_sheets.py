@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+End-to-end sheet sync benchmark against the local FakeSheetsServer.
+
+The whole stack runs as it does in the bot: HuntBot.refresh_sheet_values through GDoc, the request
+scheduler and googleapiclient over HTTP. Only the Sheets API itself is faked.
+
+1. Throughput: refreshes back to back for --seconds with the server's --latency and no quotas,
+   once re-reading the subscribed tables (batchGet) and once re-reading the whole sheet, and
+   flushes batches of queued cell writes.
+2. Throttling: the server enforces a read quota of --quota reads per --window seconds while the
+   bot polls as fast as it can, once with the client scheduler pacing reads to the same quota and
+   once with no client side pacing. Reports successful syncs, 429s, retries and breaker trips.
+
+Usage:
+    python benchmarks/bench_fake_sheets.py [--rows 500] [--latency 0.05] [--seconds 5] [--quota 20] [--window 5]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from huntbot.FakeSheetsServer import FakeSheetsServer
+from huntbot.GDoc import GDoc
+from huntbot.HuntBot import HuntBot
+from huntbot.RequestScheduler import RequestScheduler
+
+SHEET_ID = "bench-sheet"
+SHEET_NAME = "Hunt"
+UNLIMITED = 10 ** 6
+
+
+def build_values(rows: int) -> list[list]:
+    header = ["Current Score", "", "Single Bounties", "", "", "Double Bounties", "", "Discord Conf", ""]
+    values = [header, ["Team Name", "Total Points", "Task", "Password", "Double", "Task", "Password", "Key", "Value"]]
+    for row in range(rows):
+        values.append([("Team Red", "Team Blue")[row] if row < 2 else "", str(row * 10) if row < 2 else "",
+                       f"Bounty {row}", str(1000 + row), "x" if row % 4 == 0 else "", f"Double {row}",
+                       str(2000 + row), f"KEY_{row}" if row < 30 else "", str(row) if row < 30 else ""])
+    return values
+
+
+def make_gdoc(server: FakeSheetsServer, read_per_minute: float = UNLIMITED) -> GDoc:
+    os.environ["HUNTBOT_SHEETS_ENDPOINT"] = server.url
+    gdoc = GDoc()
+    gdoc.scheduler = RequestScheduler(read_per_minute=read_per_minute, write_per_minute=UNLIMITED, burst=1)
+    return gdoc
+
+
+def make_hunt_bot() -> HuntBot:
+    hunt_bot = HuntBot()
+    hunt_bot.set_sheet_id(SHEET_ID)
+    hunt_bot.set_sheet_name(SHEET_NAME)
+    hunt_bot.subscribe_table("Current Score")
+    hunt_bot.subscribe_table("Single Bounties")
+    return hunt_bot
+
+
+async def sync_for(hunt_bot: HuntBot, gdoc: GDoc, seconds: float, full: bool) -> dict:
+    syncs = failures = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if full:
+            hunt_bot.request_full_refresh()
+        try:
+            await hunt_bot.refresh_sheet_values(gdoc)
+            syncs += 1
+        except Exception:
+            failures += 1
+            # Keep polling like the main loop would, without spinning on an open breaker
+            await asyncio.sleep(0.1)
+    return {"syncs": syncs, "failures": failures}
+
+
+async def throughput(args: argparse.Namespace, values: list[list]) -> None:
+    server = FakeSheetsServer(latency=args.latency)
+    server.set_values(SHEET_ID, SHEET_NAME, values)
+    await server.start()
+    gdoc = make_gdoc(server)
+    try:
+        print(f"Throughput, {args.latency * 1000:.0f}ms server latency, {len(values)} rows")
+        for label, full in (("subscribed tables", False), ("whole sheet", True)):
+            hunt_bot = make_hunt_bot()
+            await hunt_bot.refresh_sheet_values(gdoc)
+            result = await sync_for(hunt_bot, gdoc, args.seconds, full)
+            print(f"  refresh {label:<18} {result['syncs'] / args.seconds:8.1f} syncs/s")
+
+        flushes = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.seconds:
+            for row in range(args.writes):
+                gdoc.queue_cell_write(SHEET_ID, SHEET_NAME, f"B{row + 3}", flushes)
+            await gdoc.aflush_writes()
+            flushes += 1
+        elapsed = time.perf_counter() - start
+        print(f"  flush {args.writes} queued writes   {flushes / elapsed:8.1f} batches/s "
+              f"({flushes * args.writes / elapsed:.0f} cells/s)")
+    finally:
+        gdoc.close()
+        await server.stop()
+
+
+async def throttling(args: argparse.Namespace, values: list[list]) -> None:
+    print(f"\nThrottling, server quota {args.quota} reads per {args.window:g}s, polling for {args.seconds * 2:g}s")
+    paced_per_minute = args.quota * 60 / args.window
+    for label, read_per_minute in (("client paced to quota", paced_per_minute), ("no client pacing", UNLIMITED)):
+        server = FakeSheetsServer(latency=args.latency, read_quota=args.quota, quota_window=args.window)
+        server.set_values(SHEET_ID, SHEET_NAME, values)
+        await server.start()
+        gdoc = make_gdoc(server, read_per_minute)
+        gdoc.RETRY_BASE_DELAY = 0.2
+        try:
+            result = await sync_for(make_hunt_bot(), gdoc, args.seconds * 2, full=False)
+            print(f"  {label:<22} {result['syncs']:5d} syncs  {result['failures']:4d} failed  "
+                  f"{server.throttled_requests:5d} x 429  {gdoc.retried_reads:4d} retries  "
+                  f"breaker opened {gdoc.breaker.times_opened}x")
+        finally:
+            gdoc.close()
+            await server.stop()
+
+
+async def main(args: argparse.Namespace) -> None:
+    values = build_values(args.rows)
+    await throughput(args, values)
+    await throttling(args, values)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="Server latency per request in seconds.")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--writes", type=int, default=20, help="Cells per flushed batch.")
+    parser.add_argument("--quota", type=int, default=20)
+    parser.add_argument("--window", type=float, default=5)
+    # Retries and breaker trips are expected here, they are counted instead of logged
+    logging.disable(logging.CRITICAL)
+    asyncio.run(main(parser.parse_args()))
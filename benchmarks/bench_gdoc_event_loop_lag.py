@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Measures how much the Discord event loop stalls while the bot reads the hunt sheet.
+
+A fake Sheets service simulates the network round trip with a blocking sleep, exactly like
+googleapiclient's execute() does. A heartbeat coroutine ticks every 10ms and records how late each
+tick fires while a batch of sheet reads runs through either the blocking or the async GDoc API.
+
+Usage:
+    python benchmarks/bench_gdoc_event_loop_lag.py [--reads 20] [--latency 0.15]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from huntbot.GDoc import GDoc
+
+TICK_SECONDS = 0.01
+
+
+class FakeRequest:
+    def __init__(self, latency: float, payload: dict) -> None:
+        self.latency = latency
+        self.payload = payload
+
+    def execute(self, http=None) -> dict:
+        time.sleep(self.latency)
+        return self.payload
+
+
+class FakeValues:
+    def __init__(self, latency: float, payload: dict) -> None:
+        self.latency = latency
+        self.payload = payload
+
+    def get(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self.latency, self.payload)
+
+
+class FakeSheets:
+    def __init__(self, latency: float, payload: dict) -> None:
+        self._values = FakeValues(latency, payload)
+
+    def values(self) -> FakeValues:
+        return self._values
+
+
+def build_payload(rows: int = 200, cols: int = 26) -> dict:
+    header = ["Current Score"] + [""] * (cols - 1)
+    return {"values": [header] + [[f"r{r}c{c}" for c in range(cols)] for r in range(rows)]}
+
+
+async def heartbeat(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_reads(gdoc: GDoc, reads: int, use_async: bool) -> None:
+    for _ in range(reads):
+        if use_async:
+            await gdoc.aget_data_from_sheet(spreadsheet_id="bench", sheet_name="Hunt")
+        else:
+            gdoc.get_data_from_sheet(spreadsheet_id="bench", sheet_name="Hunt")
+        await asyncio.sleep(0)
+
+
+async def measure(gdoc: GDoc, reads: int, use_async: bool) -> dict:
+    lags = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    started = time.perf_counter()
+    await run_reads(gdoc, reads, use_async)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+
+    lags.sort()
+    return {
+        "elapsed": elapsed,
+        "ticks": len(lags),
+        "p50_ms": lags[len(lags) // 2] * 1000 if lags else 0.0,
+        "p99_ms": lags[int(len(lags) * 0.99)] * 1000 if lags else 0.0,
+        "max_ms": lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+async def main(reads: int, latency: float) -> None:
+    with patch.object(GDoc, "on_startup"):
+        gdoc = GDoc()
+    gdoc.sheets = FakeSheets(latency, build_payload())
+
+    try:
+        for label, use_async in (("blocking get_data_from_sheet", False), ("aget_data_from_sheet", True)):
+            result = await measure(gdoc, reads, use_async)
+            print(f"{label:32} reads={reads} elapsed={result['elapsed']:.2f}s heartbeat ticks={result['ticks']:4d} "
+                  f"lag p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms max={result['max_ms']:.1f}ms")
+    finally:
+        gdoc.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reads", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.15, help="Simulated API round trip in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.reads, args.latency))
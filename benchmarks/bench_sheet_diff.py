@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Measures the cost of diffing consecutive hunt sheet snapshots, which runs on every poll that
+returns a changed sheet.
+
+A synthetic sheet of side by side tables is copied and a handful of cells are edited, then
+GDoc.diff_sheet_values compares the two snapshots. The full update path (hash, table map, diff
+and typed store) is timed as well for comparison.
+
+Usage:
+    python benchmarks/bench_sheet_diff.py [--tables 13] [--rows 2000] [--edits 5] [--rounds 20]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from huntbot.GDoc import GDoc
+from huntbot.HuntBot import HuntBot
+
+
+def build_values(tables: int, rows: int) -> list[list]:
+    header = [cell for table in range(tables) for cell in (f"Table {table}", "")]
+    values = [header, [f"Column {col}" for col in range(tables * 2)]]
+    values += [[f"{row}-{col}" for col in range(tables * 2)] for row in range(rows)]
+    return values
+
+
+def edit(values: list[list], edits: int, seed: int = 0) -> list[list]:
+    rng = random.Random(seed)
+    new_values = [list(row) for row in values]
+    for _ in range(edits):
+        row = rng.randrange(2, len(values))
+        col = rng.randrange(len(values[row]))
+        new_values[row][col] = "edited"
+    return new_values
+
+
+def main(tables: int, rows: int, edits: int, rounds: int) -> None:
+    old_values = build_values(tables, rows)
+    new_values = edit(old_values, edits)
+    table_map = GDoc.build_table_map(GDoc.build_dataframe(old_values))
+    cells = sum(len(row) for row in old_values)
+
+    diff = GDoc.diff_sheet_values(old_values, new_values, table_map, table_map)
+    diff_seconds = timeit.timeit(lambda: GDoc.diff_sheet_values(old_values, new_values, table_map, table_map),
+                                 number=rounds) / rounds
+
+    def update() -> None:
+        hunt_bot = HuntBot()
+        hunt_bot.sheet_values, hunt_bot.table_map = old_values, table_map
+        hunt_bot.update_sheet_values(new_values)
+
+    update_seconds = timeit.timeit(update, number=rounds) / rounds
+
+    print(f"sheet: {cells} cells, {edits} edited, {len(diff.changed_cells)} changed cells in "
+          f"{len(diff.tables)} tables")
+    print(f"diff_sheet_values       {diff_seconds * 1000:8.2f}ms")
+    print(f"update_sheet_values     {update_seconds * 1000:8.2f}ms  (hash, table map, diff and store)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=13)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--edits", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.tables, args.rows, args.edits, args.rounds)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compares the pandas table extraction pipeline with the pandas-free SheetParser.
+
+A synthetic hunt sheet is built with several side by side tables. Each round parses the raw
+values payload and extracts every table, first through GDoc.build_dataframe, build_table_map and
+extract_table, then through SheetParser.parse_tables. A second pair of rounds extracts a single
+table, which is what the cogs do on every poll.
+
+Usage:
+    python benchmarks/bench_sheet_parser.py [--tables 13] [--columns 2] [--rows 2000] [--rounds 10]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from huntbot.GDoc import GDoc
+from huntbot import SheetParser
+
+
+def build_values(tables: int, columns: int, rows: int) -> list[list]:
+    header = []
+    for table in range(tables):
+        header.extend([f"Table {table}"] + [""] * (columns - 1))
+
+    values = [header, [f"Column {col}" for col in range(tables * columns)]]
+    for row in range(rows):
+        # Ragged like the real API: trailing empty cells are omitted
+        width = tables * columns - (row % 3)
+        values.append([str(row * col) if (row + col) % 7 else "" for col in range(width)])
+    return values
+
+
+def pandas_pipeline(values: list[list]) -> dict:
+    df = GDoc.build_dataframe(values)
+    table_map = GDoc.build_table_map(df)
+    return {name: GDoc.extract_table(df, table_map, name) for name in table_map}
+
+
+def parser_pipeline(values: list[list]) -> dict:
+    return SheetParser.parse_tables(values)[1]
+
+
+def pandas_single_table(values: list[list]) -> list[dict]:
+    df = GDoc.build_dataframe(values)
+    table_map = GDoc.build_table_map(df)
+    return GDoc.extract_table(df, table_map, "Table 0").to_dict("records")
+
+
+def parser_single_table(values: list[list]) -> list[dict]:
+    return SheetParser.extract_records(values, SheetParser.build_table_index(values), "Table 0")
+
+
+def measure(func, values: list[list], rounds: int) -> dict:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func(values)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func(values)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ms_per_round": elapsed / rounds * 1000, "peak_mib": peak / 2 ** 20}
+
+
+def main(tables: int, columns: int, rows: int, rounds: int) -> None:
+    values = build_values(tables, columns, rows)
+    cells = sum(len(row) for row in values)
+    print(f"sheet: {tables} tables x {columns} columns, {rows} rows, {cells} cells")
+
+    for label, func in (("pandas, all tables", pandas_pipeline),
+                        ("SheetParser, all tables", parser_pipeline),
+                        ("pandas, one table", pandas_single_table),
+                        ("SheetParser, one table", parser_single_table)):
+        result = measure(func, values, rounds)
+        print(f"{label:26} {result['ms_per_round']:8.1f}ms/round  peak {result['peak_mib']:6.1f}MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=13)
+    parser.add_argument("--columns", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    main(args.tables, args.columns, args.rows, args.rounds)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Compares memory and allocations of the old per-poll DataFrame with the typed SheetStore over a
+simulated hunt's worth of sheet polling.
+
+A synthetic hunt sheet (config, score, bounty and dailies tables, text and numeric columns) is
+polled repeatedly; every --change-every polls a few cells are edited, like staff updating scores
+or upcoming bounties. On every changed poll the old path rebuilds the DataFrame of the whole sheet
+and re-extracts the tables the cogs read, the new path updates the SheetStore with the snapshot's
+diff and reads the same tables from it.
+
+Reported per path: memory retained by the sheet data after the last poll, the peak allocation of a
+single poll and the total allocated over all polls (both from tracemalloc), and time per poll.
+
+Usage:
+    python benchmarks/bench_sheet_store.py [--rows 500] [--polls 1000] [--change-every 10]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from huntbot import SheetParser
+from huntbot.GDoc import GDoc
+from huntbot.SheetStore import SheetStore
+
+READ_TABLES = ("Discord Conf", "Current Score", "Single Bounties", "Double Bounties", "Single Dailies",
+               "Double Dailies")
+
+
+def build_values(rows: int) -> list[list]:
+    rng = random.Random(0)
+    header = ["Discord Conf", "", "Current Score", "", "Single Bounties", "", "", "", "", "Double Bounties", "",
+              "Single Dailies", "", "", "Double Dailies", ""]
+    values = [header, ["Key", "Value", "Team Name", "Total Points", "Task", "Password", "Points", "Double",
+                       "Total Drop", "Task", "Points", "Task", "Password", "Double", "Task", "Points"]]
+    for row in range(rows):
+        values.append([
+            f"KEY_{row}" if row < 30 else "", str(rng.randrange(10 ** 17, 10 ** 18)) if row < 30 else "",
+            ("Team Red", "Team Blue")[row] if row < 2 else "", str(rng.randrange(500)) if row < 2 else "",
+            f"Bounty task {row}: obtain {rng.choice(['a dragon bone', 'an abyssal whip', 'a pet'])}",
+            str(rng.randrange(1000, 9999)), str(rng.choice([1, 2, 5])), rng.choice(["", "", "", "x"]),
+            rng.choice(["", "", "", "", "x"]),
+            f"Double bounty task {row}", str(rng.choice([1, 2])),
+            f"Daily task {row}: {rng.choice(['skill', 'kill', 'collect'])}", str(rng.randrange(1000, 9999)),
+            rng.choice(["", "", "x"]),
+            f"Double daily task {row}", str(rng.choice([1, 2])),
+        ])
+    return values
+
+
+def poll_payloads(values: list[list], polls: int, change_every: int):
+    """Yields what each poll returns: a fresh copy of the sheet, edited every change_every polls."""
+    rng = random.Random(1)
+    current = values
+    for poll in range(polls):
+        if poll and poll % change_every == 0:
+            current = [list(row) for row in current]
+            # Score update plus an edit somewhere in the bounty tables
+            current[2 + rng.randrange(2)][3] = str(rng.randrange(500))
+            current[2 + rng.randrange(len(current) - 2)][rng.choice([4, 6, 10])] = str(rng.randrange(1, 5))
+        yield [list(row) for row in current]
+
+
+class DataFramePath:
+    """What HuntBot did before: rebuild the whole sheet DataFrame and extract tables from it."""
+
+    def __init__(self) -> None:
+        self.values = None
+        self.table_map = {}
+        self.sheet_data = None
+        self.tables = {}
+
+    def poll(self, values: list[list]) -> None:
+        if values == self.values:
+            return
+        self.sheet_data = GDoc.build_dataframe(values)
+        table_map = GDoc.build_table_map(self.sheet_data)
+        # HuntBot diffed the snapshots on this path too
+        if self.values is not None:
+            GDoc.diff_sheet_values(self.values, values, self.table_map, table_map)
+        self.values, self.table_map = values, table_map
+        self.tables = {name: GDoc.extract_table(self.sheet_data, table_map, name) for name in READ_TABLES}
+
+
+class StorePath:
+    """HuntBot now: update the SheetStore with the diff and read typed tables from it."""
+
+    def __init__(self) -> None:
+        self.values = None
+        self.table_map = {}
+        self.store = SheetStore()
+        self.tables = {}
+
+    def poll(self, values: list[list]) -> None:
+        if values == self.values:
+            return
+        table_map = SheetParser.build_table_index(values)
+        diff = None
+        if self.values is not None:
+            diff = GDoc.diff_sheet_values(self.values, values, self.table_map, table_map)
+        self.values, self.table_map = values, table_map
+        self.store.update(values, table_map, diff)
+        self.tables = {name: self.store.table(name) for name in READ_TABLES}
+
+
+def measure(path_class, values: list[list], polls: int, change_every: int) -> dict:
+    # Warm up imports and lazily initialised module state outside the measurement
+    path_class().poll(values)
+
+    path = path_class()
+    start = time.perf_counter()
+    for payload in poll_payloads(values, polls, change_every):
+        path.poll(payload)
+    seconds = time.perf_counter() - start
+
+    path = path_class()
+    tracemalloc.start()
+    total = 0
+    peak = 0
+    for payload in poll_payloads(values, polls, change_every):
+        # The payload belongs to the API client, only count what the path allocates on top of it
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        path.poll(payload)
+        current, poll_peak = tracemalloc.get_traced_memory()
+        total += poll_peak - before
+        peak = max(peak, poll_peak - before)
+
+    # Retained: what dropping the path frees, keeping the raw values it points to alive
+    raw_values = path.values
+    before = tracemalloc.get_traced_memory()[0]
+    del path
+    gc.collect()
+    retained = before - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del raw_values
+
+    return {"seconds": seconds / polls, "peak": peak, "total": total, "retained": retained}
+
+
+def main(rows: int, polls: int, change_every: int) -> None:
+    values = build_values(rows)
+    cells = sum(len(row) for row in values)
+    print(f"sheet: {cells} cells, {polls} polls, a change every {change_every} polls")
+    print(f"{'':<12}{'retained':>12}{'peak/poll':>12}{'allocated':>14}{'time/poll':>12}")
+
+    for name, path_class in (("DataFrame", DataFramePath), ("SheetStore", StorePath)):
+        result = measure(path_class, values, polls, change_every)
+        print(f"{name:<12}{result['retained'] / 1024:>10.0f}kB{result['peak'] / 1024:>10.0f}kB"
+              f"{result['total'] / 1024 ** 2:>12.1f}MB{result['seconds'] * 1000:>10.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--polls", type=int, default=1000)
+    parser.add_argument("--change-every", type=int, default=10)
+    args = parser.parse_args()
+    main(args.rows, args.polls, args.change_every)
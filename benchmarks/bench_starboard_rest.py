@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Discord REST calls per starboard reaction event, before and after the StarBoard message cache.
+
+A simulated hunt posts --drops messages to the two drop channels. The messages get ⭐/🤔 reactions
+from team leaders (some of them duplicates, some later taken off again) and from players, whose
+reactions are removed because they can't star. The same event stream is fed to:
+
+- Before: the old handler, reimplemented here. Every reaction fetched the message, the user and
+  the member, and every removal fetched the message and then the starboard message to delete it.
+- After: StarBoardCog with payload.member, the warmed member index and the LRU message cache
+  filled from on_message. It is run with the default cache and with a cache of --small-cache
+  messages, where older drops miss and are fetched.
+
+Reports REST calls per reaction event, broken down by endpoint, from a fake Discord API.
+
+Usage:
+    python benchmarks/bench_starboard_rest.py [--drops 2000] [--reactions 3] [--small-cache 10]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from huntbot.MemberTeamIndex import MemberTeamIndex
+from huntbot.cogs.StarBoard import StarBoardCog
+
+STARBOARD_ID = 10
+DROP_IDS = (20, 21)
+GUILD_ID = 1
+
+
+class Role:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class FakeDiscord:
+    """Just enough of the Discord API for the starboard, counting every REST call."""
+
+    def __init__(self, members: list) -> None:
+        self.calls: dict[str, int] = {}
+        self.messages: dict[int, SimpleNamespace] = {}
+        self.members = {m.id: m for m in members}
+        self.guild = SimpleNamespace(id=GUILD_ID, name="Hunt", chunked=True, members=members,
+                                     fetch_member=self.fetch_member)
+        self.channels = {channel_id: self.channel(channel_id) for channel_id in (STARBOARD_ID, *DROP_IDS)}
+        self.next_id = 10 ** 6
+
+    def count(self, endpoint: str) -> None:
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+
+    def channel(self, channel_id: int) -> SimpleNamespace:
+        async def fetch_message(message_id: int):
+            self.count("fetch_message")
+            return self.messages[message_id]
+
+        async def send(content: str):
+            self.count("send")
+            self.next_id += 1
+            self.messages[self.next_id] = self.message(self.next_id, channel_id, content)
+            return self.messages[self.next_id]
+
+        return SimpleNamespace(id=channel_id, mention=f"<#{channel_id}>", fetch_message=fetch_message, send=send,
+                               get_partial_message=lambda message_id: self.partial(message_id))
+
+    def message(self, message_id: int, channel_id: int, content: str) -> SimpleNamespace:
+        async def remove_reaction(emoji, member):
+            self.count("remove_reaction")
+
+        async def delete():
+            self.count("delete")
+
+        return SimpleNamespace(id=message_id, content=content, attachments=[], reactions=[],
+                               channel=SimpleNamespace(id=channel_id), remove_reaction=remove_reaction,
+                               delete=delete, jump_url=f"https://discord.com/channels/{GUILD_ID}/{channel_id}/{message_id}")
+
+    def partial(self, message_id: int) -> SimpleNamespace:
+        # Partial messages are built locally, only the calls made on them hit the API
+        return self.messages.get(message_id) or self.message(message_id, 0, "")
+
+    async def fetch_user(self, user_id: int):
+        self.count("fetch_user")
+        return SimpleNamespace(id=user_id, name=str(user_id))
+
+    async def fetch_member(self, user_id: int):
+        self.count("fetch_member")
+        return self.members[user_id]
+
+    def set_reaction(self, message_id: int, emoji: str, change: int) -> None:
+        message = self.messages[message_id]
+        counts = {r.emoji: r.count for r in message.reactions}
+        counts[emoji] = counts.get(emoji, 0) + change
+        message.reactions = [SimpleNamespace(emoji=e, count=c) for e, c in counts.items() if c > 0]
+
+
+class LegacyStarBoard:
+    """The old StarBoardCog reaction handlers, REST calls included."""
+
+    def __init__(self, api: FakeDiscord) -> None:
+        self.api = api
+        self.starred_messages: dict[int, int] = {}
+
+    async def on_raw_reaction_add(self, payload) -> None:
+        channel = self.api.channels[payload.channel_id]
+        message = await channel.fetch_message(payload.message_id)
+        await self.api.fetch_user(payload.user_id)
+        member = await self.api.guild.fetch_member(payload.user_id)
+        if not any(role.name.endswith('Team Leader') or role.name == 'Staff' for role in member.roles):
+            await message.remove_reaction(payload.emoji, member)
+            return
+        if message.id in self.starred_messages:
+            await message.remove_reaction(payload.emoji, member)
+            return
+        sent = await self.api.channels[STARBOARD_ID].send(f"{payload.emoji} {message.content}")
+        self.starred_messages[message.id] = sent.id
+
+    async def on_raw_reaction_remove(self, payload) -> None:
+        original = await self.api.channels[payload.channel_id].fetch_message(payload.message_id)
+        if not [r for r in original.reactions if str(r.emoji) in ("⭐", "🤔")]:
+            starboard_msg_id = self.starred_messages.pop(original.id, None)
+            if starboard_msg_id:
+                star_msg = await self.api.channels[STARBOARD_ID].fetch_message(starboard_msg_id)
+                await star_msg.delete()
+
+
+def build_events(drops: int, reactions: int, leaders: list, players: list) -> list[tuple]:
+    """(kind, channel_id, message_id, user, emoji) events of a hunt, in order."""
+    rng = random.Random(0)
+    events = []
+    starred = {}
+    for drop in range(drops):
+        message_id = 1000 + drop
+        channel_id = DROP_IDS[drop % 2]
+        events.append(("message", channel_id, message_id, None, None))
+        # Staff react to recent drops, a drop a few messages back is as likely as the newest
+        for _ in range(rng.randrange(reactions + 1)):
+            target = max(1000, message_id - rng.randrange(20))
+            target_channel = DROP_IDS[(target - 1000) % 2]
+            emoji = rng.choice(("⭐", "🤔"))
+            user = rng.choice(players) if rng.random() < 0.3 else rng.choice(leaders)
+            events.append(("add", target_channel, target, user, emoji))
+            if user in players:
+                events.append(("remove", target_channel, target, user, emoji))
+            elif target in starred:
+                # Duplicate, the bot takes it off again
+                events.append(("remove", target_channel, target, user, emoji))
+            else:
+                starred[target] = (user, emoji)
+        # Now and then a star is taken back
+        if starred and rng.random() < 0.05:
+            target, (user, emoji) = starred.popitem()
+            events.append(("remove", DROP_IDS[(target - 1000) % 2], target, user, emoji))
+    return events
+
+
+async def replay(handler, api: FakeDiscord, events: list[tuple]) -> int:
+    reaction_events = 0
+    for kind, channel_id, message_id, user, emoji in events:
+        if kind == "message":
+            api.messages[message_id] = api.message(message_id, channel_id, f"drop {message_id}")
+            if hasattr(handler, "on_message"):
+                await handler.on_message(api.messages[message_id])
+            continue
+
+        reaction_events += 1
+        payload = SimpleNamespace(channel_id=channel_id, message_id=message_id, guild_id=GUILD_ID, user_id=user.id,
+                                  member=user, emoji=emoji)
+        if kind == "add":
+            api.set_reaction(message_id, emoji, 1)
+            await handler.on_raw_reaction_add(payload)
+        else:
+            api.set_reaction(message_id, emoji, -1)
+            await handler.on_raw_reaction_remove(payload)
+    return reaction_events
+
+
+async def run_cog(api: FakeDiscord, members: list, cache_size: int) -> StarBoardCog:
+    hunt_bot = SimpleNamespace(team_one_name="Red", team_two_name="Blue", config_map={})
+    hunt_bot.member_index = MemberTeamIndex(hunt_bot)
+    await hunt_bot.member_index.warm(api.guild)
+    discord_bot = SimpleNamespace(get_channel=api.channels.get, get_guild=lambda guild_id: api.guild,
+                                  fetch_user=api.fetch_user)
+    cog = StarBoardCog(discord_bot, hunt_bot)
+    cog.message_cache.max_size = cache_size
+    cog.starboard_channel_id = STARBOARD_ID
+    cog.team1_drop_channel_id, cog.team2_drop_channel_id = DROP_IDS
+    return cog
+
+
+def report(label: str, calls: dict[str, int], reaction_events: int) -> None:
+    total = sum(calls.values())
+    breakdown = "  ".join(f"{endpoint} {count / reaction_events:.2f}" for endpoint, count in sorted(calls.items()))
+    print(f"{label:<24}{total / reaction_events:>6.2f} calls/event   {breakdown}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    leaders = [SimpleNamespace(id=i, roles=[Role(f"{team} Team Leader")]) for i, team in enumerate(("Red", "Blue"), 1)]
+    players = [SimpleNamespace(id=100 + i, roles=[Role(("Red", "Blue")[i % 2])]) for i in range(20)]
+    members = leaders + players
+    events = build_events(args.drops, args.reactions, leaders, players)
+
+    api = FakeDiscord(members)
+    reaction_events = await replay(LegacyStarBoard(api), api, events)
+    print(f"{args.drops} drops, {reaction_events} star reaction events")
+    report("before", api.calls, reaction_events)
+
+    for label, cache_size in (("after", StarBoardCog.MESSAGE_CACHE_SIZE),
+                              (f"after, cache {args.small_cache}", args.small_cache)):
+        api = FakeDiscord(members)
+        cog = await run_cog(api, members, cache_size)
+        await replay(cog, api, events)
+        report(label, api.calls, reaction_events)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drops", type=int, default=2000)
+    parser.add_argument("--reactions", type=int, default=3, help="Most star reactions after each drop.")
+    parser.add_argument("--small-cache", type=int, default=10)
+    logging.disable(logging.INFO)
+    asyncio.run(main(parser.parse_args()))
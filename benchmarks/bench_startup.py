@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Measures bot startup time, from importing huntbot.main until on_ready has finished.
+
+Every run happens in a fresh interpreter so module imports are cold. Discord and Google are
+faked: a throwaway service account key is generated for the credentials, and the Discord calls
+made by on_ready (avatar upload, command sync) are replaced with no-op mocks. Building the Sheets
+API client is timed separately because GDoc defers it to the first API call.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+PHASES = ("import huntbot.main", "on_ready", "first Sheets client use")
+
+
+def write_fake_credentials(path: str) -> None:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode()
+    with open(path, "w") as creds_file:
+        json.dump({"type": "service_account", "project_id": "bench", "private_key_id": "bench",
+                   "private_key": pem, "client_email": "bench@bench.iam.gserviceaccount.com",
+                   "client_id": "1", "token_uri": "https://oauth2.googleapis.com/token"}, creds_file)
+
+
+def child() -> None:
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    timings = {}
+    start = time.perf_counter()
+    from huntbot import main
+    timings["import huntbot.main"] = time.perf_counter() - start
+
+    async def ready() -> None:
+        main.bot._connection.user = MagicMock(edit=AsyncMock())
+        with patch.object(main.bot.tree, "sync", new=AsyncMock()):
+            start = time.perf_counter()
+            await main.on_ready()
+            timings["on_ready"] = time.perf_counter() - start
+        main.flush_gdoc_writes.cancel()
+
+    asyncio.run(ready())
+
+    start = time.perf_counter()
+    main.gdoc.sheets.values()
+    timings["first Sheets client use"] = time.perf_counter() - start
+
+    print(json.dumps(timings))
+
+
+def run_once(env: dict) -> dict:
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        creds_path = os.path.join(tmp, "credentials.json")
+        write_fake_credentials(creds_path)
+        env = dict(os.environ, DISCORD_TOKEN="bench", GOOGLE_CREDENTIALS_PATH=creds_path,
+                   HUNTBOT_SNAPSHOT_PATH=os.path.join(tmp, "snapshot.json.gz"))
+        env.pop("HUNTBOT_WEBHOOK_PORT", None)
+
+        runs = [run_once(env) for _ in range(args.runs)]
+
+    print(f"Startup over {args.runs} cold runs (median)")
+    for phase in PHASES:
+        print(f"  {phase:<26} {statistics.median(run[phase] for run in runs) * 1000:8.1f} ms")
+    total = statistics.median(sum(run[phase] for phase in PHASES[:2]) for run in runs)
+    print(f"  {'import through on_ready':<26} {total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
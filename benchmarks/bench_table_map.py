@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for finding the tables on the hunt sheet.
+
+Compares the original column-by-column build_table_map loop with the vectorized
+GDoc.build_table_map and the pandas-free SheetParser.build_table_index, on sheets from 26 (A:Z)
+up to 700 columns. Every sheet has side by side tables two columns wide, with a second table
+stacked under each one.
+
+Usage:
+    python benchmarks/bench_table_map.py [--rows 200] [--rounds 20]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from huntbot.GDoc import GDoc
+from huntbot import SheetParser
+
+WIDTHS = (26, 52, 104, 260, 700)
+
+
+def legacy_build_table_map(df) -> dict:
+    """The original implementation, one df.iloc lookup per column."""
+    table_map = {}
+    name = ""
+    for col in range(len(df.columns)):
+        header_value = df.iloc[0, col]
+        if header_value is not None:
+            name = header_value
+            table_map[name] = {"start_col": col}
+        elif name:
+            table_map.setdefault(name, {})["end_col"] = col
+    return table_map
+
+
+def build_values(columns: int, rows: int) -> list[list]:
+    tables = columns // 2
+    half = rows // 2
+    values = [[f"Table {table}" if col % 2 == 0 else "" for table in range(tables) for col in range(2)],
+              [f"Header {col}" for col in range(columns)]]
+    values += [[str(row * col) for col in range(columns)] for row in range(half)]
+    values.append([])
+    values.append([f"Stacked {table}" if col % 2 == 0 else "" for table in range(tables) for col in range(2)])
+    values.append([f"Header {col}" for col in range(columns)])
+    values += [[str(row + col) for col in range(columns)] for row in range(rows - half)]
+    return values
+
+
+def main(rows: int, rounds: int) -> None:
+    print(f"{'columns':>8} {'legacy loop':>14} {'vectorized':>14} {'SheetParser':>14}  tables")
+    for columns in WIDTHS:
+        values = build_values(columns, rows)
+        df = GDoc.build_dataframe(values)
+        stacked_tables = {f"Stacked {table}" for table in range(columns // 2)}
+
+        timings = [
+            timeit.timeit(lambda: legacy_build_table_map(df), number=rounds) / rounds,
+            timeit.timeit(lambda: GDoc.build_table_map(df, stacked_tables), number=rounds) / rounds,
+            timeit.timeit(lambda: SheetParser.build_table_index(values, stacked_tables), number=rounds) / rounds,
+        ]
+        tables = len(GDoc.build_table_map(df, stacked_tables))
+        print(f"{columns:>8} " + " ".join(f"{seconds * 1000:12.2f}ms" for seconds in timings) + f"  {tables}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rows, args.rounds)
@@ -1,11 +1,59 @@
 #!/usr/bin/env python3
-import sys
+import argparse
 import os
+import subprocess
+import sys
 
 # Sets the project root to /Hunt-Bot instead of /Hunt-Bot/bin since we run the bot from /bin
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+
+def profile_startup(top: int = 25) -> None:
+    """
+    Imports huntbot.main in a fresh interpreter with -X importtime and prints the modules with the
+    largest cumulative import time, plus the total per top level package.
+    """
+    # huntbot.main exits straight away without a token, the placeholder is never used to connect
+    env = dict(os.environ, DISCORD_TOKEN=os.getenv("DISCORD_TOKEN") or "profile-startup")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import huntbot.main"], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    if not modules:
+        print(result.stderr, file=sys.stderr)
+        sys.exit("Unable to profile startup, importing huntbot.main failed")
+
+    total_us = sum(self_us for _, self_us, _ in modules)
+    print(f"Importing huntbot.main took {total_us / 1000:.1f} ms ({len(modules)} modules)\n")
+
+    print(f"Top {top} modules by cumulative import time:")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: m[2], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    packages = {}
+    for name, self_us, _ in modules:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print("\nImport time per top level package:")
+    for package, package_us in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:top]:
+        print(f"  {package_us / 1000:8.1f} ms  {package}")
 
-from huntbot.main import run
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Runs the Hunt Bot.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print an import time breakdown of the bot's startup instead of running it.")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profile_startup()
+    else:
+        from huntbot.main import run
+        run()
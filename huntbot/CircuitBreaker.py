@@ -0,0 +1,70 @@
+from typing import Callable
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a failing service until it has had time to recover.
+
+    Closed: requests go through, consecutive failures are counted.
+    Open: after failure_threshold consecutive failures, requests are refused for reset_timeout seconds.
+    Half open: once reset_timeout has passed, a single trial request is let through. Success closes
+    the circuit, failure opens it again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_running = False
+
+        # Metrics
+        self.times_opened = 0
+        self.rejected_requests = 0
+
+    def allow_request(self) -> bool:
+        """True if a request may be sent now. In the half open state only one trial runs at a time."""
+        if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            logger.info(f"[CircuitBreaker] {self.name} half open, sending a trial request")
+
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self.trial_running:
+            self.trial_running = True
+            return True
+
+        self.rejected_requests += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"[CircuitBreaker] {self.name} recovered, circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_running = False
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+            self.times_opened += 1
+            logger.warning(f"[CircuitBreaker] {self.name} circuit open after {self.failures} failures, "
+                           f"pausing requests for {self.reset_timeout:.0f}s")
+
+    def release(self) -> None:
+        """Ends a trial request that neither succeeded nor failed in a way that says anything about the service."""
+        self.trial_running = False
@@ -0,0 +1,313 @@
+from aiohttp import web
+from collections import deque
+from typing import Callable, Optional
+from huntbot.GDoc import GDoc
+from huntbot.WriteOverlay import WriteOverlay
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class FakeSheetsServer:
+    """
+    Local stand-in for the Google Sheets v4 API, for running the bot, tests and benchmarks
+    without Google credentials.
+
+    Implements the four calls GDoc makes: values.get, values.update, values.batchGet and
+    values.batchUpdate, with the same URLs, payloads and error format as the real API, so the
+    googleapiclient client talks to it unchanged. Point GDoc at it with the HUNTBOT_SHEETS_ENDPOINT
+    environment variable, e.g. HUNTBOT_SHEETS_ENDPOINT=http://127.0.0.1:8765/.
+
+    Cells are stored as the API formats them: RAW writes are read back as text, e.g. 10 as "10".
+    To exercise the bot's error handling every request can be delayed, read and write quotas can
+    be enforced with 429 RESOURCE_EXHAUSTED responses like the real per-minute quotas, and errors
+    can be injected at random or for the next few requests.
+    """
+    API_PREFIX = "/v4/spreadsheets/{spreadsheet_id}"
+    ERROR_STATUSES = {400: "INVALID_ARGUMENT", 404: "NOT_FOUND", 429: "RESOURCE_EXHAUSTED", 500: "INTERNAL",
+                      503: "UNAVAILABLE"}
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 read_quota: int = None, write_quota: int = None, quota_window: float = 60.0,
+                 error_rate: float = 0.0, error_status: int = 503, seed: int = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on, 0 picks a free port.
+            latency (float): Seconds every request takes before it is answered.
+            jitter (float): Random extra latency of up to this many seconds.
+            read_quota (int): Reads allowed per quota_window, None for unlimited.
+            write_quota (int): Writes allowed per quota_window, None for unlimited.
+            quota_window (float): Length of the sliding quota window in seconds.
+            error_rate (float): Probability that a request fails with error_status.
+            error_status (int): HTTP status of randomly injected errors.
+            seed (int): Seed for latency jitter and random errors, for repeatable runs.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.quotas = {"read": read_quota, "write": write_quota}
+        self.quota_window = quota_window
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.clock = clock
+        self.random = random.Random(seed)
+        self.runner: Optional[web.AppRunner] = None
+
+        # {spreadsheet_id: {sheet_name: rows of cell text}}
+        self.spreadsheets: dict[str, dict[str, list[list[str]]]] = {}
+        # Times of the requests inside the current quota window, per kind
+        self.recent_requests = {"read": deque(), "write": deque()}
+        # Statuses of the errors the next requests fail with, see fail_next
+        self.forced_errors: deque[int] = deque()
+
+        # Metrics
+        self.requests: dict[str, int] = {"get": 0, "batchGet": 0, "update": 0, "batchUpdate": 0}
+        self.throttled_requests = 0
+        self.injected_errors = 0
+        self.cells_read = 0
+        self.cells_written = 0
+
+    @property
+    def url(self) -> str:
+        """Endpoint to use as HUNTBOT_SHEETS_ENDPOINT."""
+        return f"http://{self.host}:{self.port}/"
+
+    def set_values(self, spreadsheet_id: str, sheet_name: str, values: list[list]) -> None:
+        """Replaces the contents of a sheet, creating the spreadsheet and sheet if needed."""
+        self.spreadsheets.setdefault(spreadsheet_id, {})[sheet_name] = [
+            [WriteOverlay.cell_text(value) for value in row] for row in values]
+
+    def get_values(self, spreadsheet_id: str, sheet_name: str) -> list[list]:
+        """Returns the contents of a sheet trimmed like the API trims a read."""
+        return GDoc.trim_values(self.spreadsheets[spreadsheet_id][sheet_name])
+
+    def fail_next(self, count: int = 1, status: int = 503) -> None:
+        """Makes the next count requests fail with the given HTTP status."""
+        self.forced_errors.extend([status] * count)
+
+    async def start(self) -> None:
+        app = web.Application()
+        prefix = self.API_PREFIX
+        app.router.add_get(f"{prefix}/values:batchGet", self.handle_batch_get)
+        app.router.add_post(f"{prefix}/values:batchUpdate", self.handle_batch_update)
+        app.router.add_get(f"{prefix}/values/{{range}}", self.handle_get)
+        app.router.add_put(f"{prefix}/values/{{range}}", self.handle_update)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        # Report the real port when an ephemeral one was requested
+        self.port = self.runner.addresses[0][1]
+        logger.info(f"[FakeSheetsServer] Serving the Sheets API on {self.url}")
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    @classmethod
+    def error_response(cls, status: int, message: str) -> web.Response:
+        return web.json_response({"error": {"code": status, "message": message,
+                                            "status": cls.ERROR_STATUSES.get(status, "UNKNOWN")}}, status=status)
+
+    async def admit(self, kind: str) -> Optional[web.Response]:
+        """
+        Applies latency, injected errors and quotas to a request.
+
+        Returns:
+            web.Response | None: The error response the request fails with, None if it may proceed.
+        """
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.forced_errors or (self.error_rate and self.random.random() < self.error_rate):
+            status = self.forced_errors.popleft() if self.forced_errors else self.error_status
+            self.injected_errors += 1
+            return self.error_response(status, "Injected error")
+
+        quota = self.quotas[kind]
+        if quota is not None:
+            now = self.clock()
+            recent = self.recent_requests[kind]
+            while recent and recent[0] <= now - self.quota_window:
+                recent.popleft()
+            if len(recent) >= quota:
+                self.throttled_requests += 1
+                return self.error_response(429, f"Quota exceeded for quota metric '{kind.title()} requests' "
+                                                f"({quota} per {self.quota_window:g}s)")
+            recent.append(now)
+
+        return None
+
+    def resolve_range(self, spreadsheet_id: str, a1_range: str) -> tuple:
+        """
+        Resolves an A1 range to its sheet.
+
+        Returns:
+            tuple: (sheet rows, start_row, end_row, start_col, end_col), bounds None when unbounded.
+
+        Raises:
+            KeyError: The spreadsheet doesn't exist.
+            ValueError: The range is invalid or names an unknown sheet.
+        """
+        sheets = self.spreadsheets[spreadsheet_id]
+        if "!" not in a1_range:
+            # A bare sheet name covers the whole sheet
+            sheet_name = a1_range.strip("'")
+            start_row = end_row = start_col = end_col = None
+        else:
+            sheet_name, start_col, start_row, end_col, end_row = GDoc.parse_a1_range(a1_range)
+
+        if sheet_name not in sheets:
+            raise ValueError(f"Unable to parse range: {a1_range}")
+        return sheets[sheet_name], start_row, end_row, start_col, end_col
+
+    def read_range(self, spreadsheet_id: str, a1_range: str) -> dict:
+        rows, start_row, end_row, start_col, end_col = self.resolve_range(spreadsheet_id, a1_range)
+        start_row = start_row or 0
+        start_col = start_col or 0
+        selected = rows[start_row:None if end_row is None else end_row + 1]
+        values = GDoc.trim_values([row[start_col:None if end_col is None else end_col + 1] for row in selected])
+        self.cells_read += sum(len(row) for row in values)
+
+        value_range = {"range": a1_range, "majorDimension": "ROWS"}
+        if values:
+            value_range["values"] = values
+        return value_range
+
+    def write_range(self, spreadsheet_id: str, a1_range: str, values: list[list]) -> dict:
+        rows, start_row, _, start_col, _ = self.resolve_range(spreadsheet_id, a1_range)
+        start_row = start_row or 0
+        start_col = start_col or 0
+        cells = 0
+        for row_offset, row_values in enumerate(values):
+            while len(rows) <= start_row + row_offset:
+                rows.append([])
+            row = rows[start_row + row_offset]
+            for col_offset, value in enumerate(row_values):
+                col = start_col + col_offset
+                row.extend([""] * (col + 1 - len(row)))
+                row[col] = WriteOverlay.cell_text(value)
+                cells += 1
+
+        self.cells_written += cells
+        return {"spreadsheetId": spreadsheet_id, "updatedRange": a1_range, "updatedRows": len(values),
+                "updatedColumns": max((len(row) for row in values), default=0), "updatedCells": cells}
+
+    async def handle_get(self, request: web.Request) -> web.Response:
+        self.requests["get"] += 1
+        error = await self.admit("read")
+        if error:
+            return error
+
+        try:
+            return web.json_response(self.read_range(request.match_info["spreadsheet_id"],
+                                                     request.match_info["range"]))
+        except KeyError:
+            return self.error_response(404, "Requested entity was not found.")
+        except ValueError as e:
+            return self.error_response(400, str(e))
+
+    async def handle_batch_get(self, request: web.Request) -> web.Response:
+        self.requests["batchGet"] += 1
+        error = await self.admit("read")
+        if error:
+            return error
+
+        spreadsheet_id = request.match_info["spreadsheet_id"]
+        try:
+            value_ranges = [self.read_range(spreadsheet_id, a1_range) for a1_range in request.query.getall("ranges", [])]
+        except KeyError:
+            return self.error_response(404, "Requested entity was not found.")
+        except ValueError as e:
+            return self.error_response(400, str(e))
+        return web.json_response({"spreadsheetId": spreadsheet_id, "valueRanges": value_ranges})
+
+    async def handle_update(self, request: web.Request) -> web.Response:
+        self.requests["update"] += 1
+        error = await self.admit("write")
+        if error:
+            return error
+
+        if "valueInputOption" not in request.query:
+            return self.error_response(400, "'valueInputOption' is required but not specified")
+
+        try:
+            body = await request.json()
+            return web.json_response(self.write_range(request.match_info["spreadsheet_id"],
+                                                      request.match_info["range"], body.get("values", [])))
+        except KeyError:
+            return self.error_response(404, "Requested entity was not found.")
+        except ValueError as e:
+            return self.error_response(400, str(e))
+
+    async def handle_batch_update(self, request: web.Request) -> web.Response:
+        self.requests["batchUpdate"] += 1
+        error = await self.admit("write")
+        if error:
+            return error
+
+        spreadsheet_id = request.match_info["spreadsheet_id"]
+        try:
+            body = await request.json()
+            if "valueInputOption" not in body:
+                return self.error_response(400, "'valueInputOption' is required but not specified")
+            # Validate every range first so a bad one doesn't leave the batch half written
+            for value_range in body.get("data", []):
+                self.resolve_range(spreadsheet_id, value_range["range"])
+            responses = [self.write_range(spreadsheet_id, value_range["range"], value_range.get("values", []))
+                         for value_range in body.get("data", [])]
+        except KeyError:
+            return self.error_response(404, "Requested entity was not found.")
+        except ValueError as e:
+            return self.error_response(400, str(e))
+
+        return web.json_response({"spreadsheetId": spreadsheet_id, "responses": responses,
+                                  "totalUpdatedCells": sum(response["updatedCells"] for response in responses)})
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = FakeSheetsServer(host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                              read_quota=args.read_quota, write_quota=args.write_quota, error_rate=args.error_rate,
+                              seed=args.seed)
+    if args.sheets:
+        # {spreadsheet_id: {sheet_name: [[...], ...]}}
+        with open(args.sheets) as sheets_file:
+            for spreadsheet_id, sheets in json.load(sheets_file).items():
+                for sheet_name, values in sheets.items():
+                    server.set_values(spreadsheet_id, sheet_name, values)
+
+    await server.start()
+    print(f"Fake Sheets API listening, run the bot with HUNTBOT_SHEETS_ENDPOINT={server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs a local fake of the Google Sheets v4 API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sheets", help="JSON file with the initial contents, {spreadsheet_id: {sheet_name: rows}}")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency of up to this many seconds.")
+    parser.add_argument("--read-quota", type=int, help="Reads allowed per minute.")
+    parser.add_argument("--write-quota", type=int, help="Writes allowed per minute.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability a request fails with a 503.")
+    parser.add_argument("--seed", type=int)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -1,56 +1,559 @@
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Collection
+import asyncio
+import functools
 import logging
-import pandas as pd
 import os
+import random
+import re
+import threading
+import time
+from huntbot.CircuitBreaker import CircuitBreaker
+from huntbot.exceptions import CircuitOpenException
+from huntbot.RequestScheduler import RequestPriority, RequestScheduler
+from huntbot.WriteOverlay import WriteOverlay
+from huntbot import SheetDiff
+
+# pandas, numpy and the Google client libraries take a large share of startup time, so they are
+# imported where they're first used, after the bot has connected to the gateway
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
 class GDoc:
-    def __init__(self) -> None:
+    # Transient read errors are retried with exponential backoff and full jitter
+    MAX_READ_RETRIES = 4
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+    # Seconds a written value shadows its cell. A sheet the bot never re-reads could be edited by hand
+    # meanwhile, so after this the same value is written again instead of being suppressed.
+    WRITTEN_VALUE_TTL = 600.0
+
+    def __init__(self, max_workers: int = 4) -> None:
         self.service = None
-        self.sheets = None
+        self._sheets = None
+        self._client_lock = threading.Lock()
         self.creds_path = ""
         self.credentials = ""
+        # Alternative Sheets API endpoint, e.g. a FakeSheetsServer, used with anonymous credentials
+        self.api_endpoint = ""
         self.command_channel_id = 0
 
+        # The googleapiclient calls are blocking, so the async API runs them on a small bounded pool of
+        # worker threads to keep the Discord event loop (and gateway heartbeats) responsive
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gdoc")
+        self._thread_local = threading.local()
+
+        # Every async API request waits here for read/write quota before it is sent
+        self.scheduler = RequestScheduler()
+
+        # Reads fail fast while the Sheets API is down, so callers keep serving their last good snapshot
+        self.breaker = CircuitBreaker("Sheets API")
+        self.retried_reads = 0
+
+        # Last successful payload of every sheet or range read: {(spreadsheet_id, range): values}
+        self.last_good_values: dict[tuple[str, str], list[list]] = {}
+        # Successful writes are laid over reads until a later read confirms them
+        self.overlay = WriteOverlay()
+
+        # Cell writes waiting to be flushed as one batchUpdate per spreadsheet: {spreadsheet_id: {a1_range: value}}
+        self.pending_writes: dict[str, dict[str, object]] = {}
+        # Highest priority (lowest value) of the writes pending for each spreadsheet
+        self.pending_priorities: dict[str, RequestPriority] = {}
+        # Shadow copy of the last value successfully written to each cell: {(spreadsheet_id, a1_range): value}
+        self.written_values: dict[tuple[str, str], object] = {}
+        # When each shadow copy entry was written, by clock: {(spreadsheet_id, a1_range): seconds}
+        self.written_at: dict[tuple[str, str], float] = {}
+        self.clock = time.monotonic
+        # Values of batches being sent right now, they win over the shadow copy until the flush ends
+        self.inflight_writes: dict[tuple[str, str], object] = {}
+        self.suppressed_writes = 0
+
         self.on_startup()
 
     def on_startup(self) -> None:
+        # The service account credentials are loaded from this JSON file along with the client, on first use
+        self.creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH", "")
+        # self.creds_path = "huntbot/google_auth.json"
+
+        logger.info(f"[GDoc] GOOGLE CREDS PATH: {self.creds_path}")
+
+        self.api_endpoint = os.getenv("HUNTBOT_SHEETS_ENDPOINT", "")
+        if self.api_endpoint:
+            logger.warning(f"[GDoc] Using the Sheets API at {self.api_endpoint} without credentials")
+        elif not self.creds_path:
+            logger.error("[GDoc] Missing GOOGLE_CREDENTIALS_PATH value")
+
+    @property
+    def sheets(self):
+        """
+        The spreadsheets() resource of the Sheets API client, built on first use.
+
+        Loading the credentials and building the client (parsing the discovery document and
+        generating the resource classes) takes a noticeable part of a second, so it's kept off the
+        startup path. The document
+        bundled with googleapiclient is used instead of downloading it, and the first API call
+        runs on a worker thread, so the build doesn't block the event loop either.
+        """
+        if self._sheets is None:
+            with self._client_lock:
+                if self._sheets is None:
+                    self._build_client()
+        return self._sheets
+
+    @sheets.setter
+    def sheets(self, sheets) -> None:
+        self._sheets = sheets
+
+    def _build_client(self) -> None:
         try:
-            # Load the service account credentials from the JSON file
-            self.creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH", "")
-            # self.creds_path = "huntbot/google_auth.json"
+            from google.oauth2 import service_account
+            from googleapiclient.discovery import build
+
+            client_options = None
+            if self.api_endpoint:
+                from google.auth.credentials import AnonymousCredentials
+                client_options = {"api_endpoint": self.api_endpoint}
+                if not self.credentials:
+                    self.credentials = AnonymousCredentials()
+            elif not self.credentials:
+                self.credentials = service_account.Credentials.from_service_account_file(self.creds_path, scopes=[
+                    "https://www.googleapis.com/auth/spreadsheets"], )
+
+            self.service = build("sheets", "v4", credentials=self.credentials or None, static_discovery=True,
+                                 cache_discovery=False, client_options=client_options)
+            self._sheets = self.service.spreadsheets()
+            logger.info("[GDoc] Sheets API client built")
+        except Exception as e:
+            logger.error("[GDoc] Error building the Sheets API client", exc_info=e)
+
+    def close(self) -> None:
+        """Stops the worker pool used by the async API."""
+        self.executor.shutdown(wait=False)
+
+    def _execute(self, request):
+        """
+        Executes a googleapiclient request with an HTTP transport owned by the calling thread.
+
+        httplib2.Http objects are not thread safe, so every worker thread lazily builds its own
+        authorized transport instead of sharing the one attached to the service object.
+        """
+        http = getattr(self._thread_local, "http", None)
+        if http is None and self.credentials:
+            import google_auth_httplib2
+            import httplib2
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._thread_local.http = http
 
-            logger.info(f"[GDoc] GOOGLE CREDS PATH: {self.creds_path}")
+        return request.execute(http=http)
 
-            if not self.creds_path:
-                logger.error("[GDoc] Missing GOOGLE_CREDENTIALS_PATH value")
+    async def _run_in_executor(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
 
-            logger.info("[GDoc] Google Credentials found, attempting to establish connection to GDocs API server")
-            self.credentials = service_account.Credentials.from_service_account_file(self.creds_path, scopes=[
-                "https://www.googleapis.com/auth/spreadsheets"], )
+    async def _run_scheduled(self, kind: str, priority: RequestPriority, spreadsheet_id: str, func, *args):
+        """Waits for quota from the request scheduler, then runs func on the worker pool."""
+        await self.scheduler.acquire(kind, priority=priority, source=spreadsheet_id)
+        return await self._run_in_executor(func, *args)
 
-            # Build the Sheets API client
-            self.service = build("sheets", "v4", credentials=self.credentials)
-            self.sheets = self.service.spreadsheets()
+    async def _run_read(self, priority: RequestPriority, spreadsheet_id: str, func, *args):
+        """
+        Runs a scheduled read, retrying transient API errors with bounded exponential backoff and
+        full jitter. Every attempt waits for its own read quota.
+
+        Repeated failures open the circuit breaker, after which reads raise CircuitOpenException
+        without touching the API until the breaker lets a trial request through.
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow_request():
+                raise CircuitOpenException(self.breaker.name)
+
+            try:
+                result = await self._run_scheduled("read", priority, spreadsheet_id, func, *args)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                if not self.is_transient(e):
+                    # The API answered, the request itself was bad
+                    self.breaker.record_success()
+                    raise
+
+                self.breaker.record_failure()
+                if attempt >= self.MAX_READ_RETRIES or self.breaker.state == CircuitBreaker.OPEN:
+                    raise
+
+                delay = self.retry_delay(attempt)
+                attempt += 1
+                self.retried_reads += 1
+                logger.warning(f"[GDoc] Transient error reading {spreadsheet_id}, retry {attempt} in {delay:.1f}s: "
+                               f"{e}")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def retry_delay(self, attempt: int) -> float:
+        """Full jitter backoff: a random delay up to RETRY_BASE_DELAY * 2^attempt, capped at RETRY_MAX_DELAY."""
+        return random.uniform(0, min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt))
+
+    async def aget_sheet_values(self, spreadsheet_id: str, sheet_name: str, cell_range: str = None,
+                                priority: RequestPriority = RequestPriority.POLL) -> list[list]:
+        """Non-blocking version of get_sheet_values."""
+        return await self._run_read(priority, spreadsheet_id, self.get_sheet_values, spreadsheet_id, sheet_name,
+                                    cell_range)
+
+    async def aget_table_values(self, spreadsheet_id: str, sheet_name: str, table_map: dict, table_names: list,
+                                base_values: list[list],
+                                priority: RequestPriority = RequestPriority.POLL) -> list[list]:
+        """Non-blocking version of get_table_values."""
+        return await self._run_read(priority, spreadsheet_id, self.get_table_values, spreadsheet_id, sheet_name,
+                                    table_map, table_names, base_values)
+
+    async def aget_data_from_sheet(self, spreadsheet_id: str, sheet_name: str, cell_range: str = None,
+                                   priority: RequestPriority = RequestPriority.POLL) -> pd.DataFrame:
+        """
+        Non-blocking version of get_data_from_sheet. The read goes through the retries and the
+        circuit breaker, only when it still fails is the last good copy (or nothing) served.
+        """
+        try:
+            values = await self._run_read(priority, spreadsheet_id, self.get_sheet_values, spreadsheet_id,
+                                          sheet_name, cell_range)
         except Exception as e:
-            logger.error("[GDoc] Error during GDoc object setup", exc_info=e)
+            return self.fallback_dataframe(spreadsheet_id, sheet_name, cell_range, e)
+        return await self._run_in_executor(self.build_dataframe, values)
+
+    async def awrite_cell(self, spreadsheet_id: str, sheet_name: str, cell: str, value,
+                          priority: RequestPriority = RequestPriority.SCORE) -> bool:
+        """Non-blocking version of write_cell."""
+        # Check the shadow copy first so a skipped write doesn't use up quota
+        if self.is_unchanged_write(spreadsheet_id, self.a1notation_builder(sheet_name, cell), value):
+            self.suppressed_writes += 1
+            return True
 
-    def get_data_from_sheet(self, spreadsheet_id: str, sheet_name: str, cell_range: str = None) -> pd.DataFrame:
+        return await self._run_scheduled("write", priority, spreadsheet_id, self.write_cell, spreadsheet_id,
+                                         sheet_name, cell, value)
+
+    def queue_cell_write(self, spreadsheet_id: str, sheet_name: str, cell: str, value,
+                         priority: RequestPriority = RequestPriority.SCORE) -> None:
+        """
+        Queues a single cell write to be sent with the next flush.
+
+        Writes to the same cell are coalesced so only the latest queued value is sent. A batch is
+        scheduled with the highest priority of the writes it contains.
+        """
+        a1_range = self.a1notation_builder(sheet_name, cell)
+
+        if self.is_unchanged_write(spreadsheet_id, a1_range, value):
+            # The cell already holds this value, so also drop any different value still waiting to be sent
+            pending = self.pending_writes.get(spreadsheet_id, {})
+            pending.pop(a1_range, None)
+            if not pending:
+                self.pending_writes.pop(spreadsheet_id, None)
+                self.pending_priorities.pop(spreadsheet_id, None)
+            self.suppressed_writes += 1
+            return
+
+        self.pending_writes.setdefault(spreadsheet_id, {})[a1_range] = value
+        self.pending_priorities[spreadsheet_id] = min(priority,
+                                                      self.pending_priorities.get(spreadsheet_id, priority))
+
+    def is_unchanged_write(self, spreadsheet_id: str, a1_range: str, value) -> bool:
+        """True if the cell holds value once the writes in flight land, so writing it again can be skipped."""
+        key = (spreadsheet_id, a1_range)
+        if key in self.inflight_writes:
+            return self.inflight_writes[key] == value
+        if key not in self.written_values:
+            return False
+        if self.clock() - self.written_at.get(key, float("-inf")) >= self.WRITTEN_VALUE_TTL:
+            self.drop_written_value(spreadsheet_id, a1_range)
+            return False
+        return self.written_values[key] == value
+
+    def remember_written_value(self, spreadsheet_id: str, a1_range: str, value) -> None:
+        """Records a value successfully written to a cell in the shadow copy, for WRITTEN_VALUE_TTL seconds."""
+        self.written_values[(spreadsheet_id, a1_range)] = value
+        self.written_at[(spreadsheet_id, a1_range)] = self.clock()
+
+    def drop_written_value(self, spreadsheet_id: str, a1_range: str) -> None:
+        self.written_values.pop((spreadsheet_id, a1_range), None)
+        self.written_at.pop((spreadsheet_id, a1_range), None)
+
+    def forget_written_values(self, spreadsheet_id: str = None) -> None:
+        """
+        Clears the shadow copy of written cells, e.g. after the sheet may have been edited by hand,
+        so the next writes are sent even if the bot thinks the values are unchanged.
+        """
+        if spreadsheet_id is None:
+            self.written_values.clear()
+            self.written_at.clear()
+            return
+
+        for key in [key for key in self.written_values if key[0] == spreadsheet_id]:
+            self.drop_written_value(*key)
+
+    def _record_write(self, spreadsheet_id: str, a1_range: str, values: list) -> None:
+        """Adds a successful write of values, down the column starting at a1_range, to the read overlay."""
         try:
-            if not cell_range:
-                data = self.sheets.values().get(spreadsheetId=spreadsheet_id, range=sheet_name).execute()
+            sheet_name, col, row, _, _ = self.parse_a1_range(a1_range)
+        except ValueError:
+            return
+        if sheet_name is not None and row is not None:
+            self.overlay.record(spreadsheet_id, sheet_name, row, col, values)
+
+    def _overlay_read(self, spreadsheet_id: str, sheet_name: str, cell_range: str, values: list[list],
+                      read_started: float = None, fetched: list = None) -> list[list]:
+        """
+        Applies the read overlay to a payload read from sheet_name, or to a cached copy of one when
+        read_started is None. Writes the sheet contradicted are dropped from the shadow copy too,
+        so writing the same value again isn't suppressed.
+        """
+        bounds = None
+        if cell_range:
+            _, start_col, start_row, end_col, end_row = self.parse_a1_range(cell_range)
+            bounds = (start_row, end_row, start_col, end_col)
+
+        overlaid, invalidated = self.overlay.apply(spreadsheet_id, sheet_name, values, read_started=read_started,
+                                                   bounds=bounds, fetched=fetched)
+        for row, col in invalidated:
+            a1_range = self.a1notation_builder(sheet_name, f"{self.column_letter(col)}{row + 1}")
+            self.drop_written_value(spreadsheet_id, a1_range)
+
+        # Whole sheet payloads stay trimmed the way the API returns them
+        if overlaid is not values and not cell_range:
+            overlaid = self.trim_values(overlaid)
+        return overlaid
+
+    def cached_sheet_values(self, spreadsheet_id: str, sheet_name: str, cell_range: str = None):
+        """
+        Returns the last successful read of a sheet or range with the bot's own later writes
+        applied, without calling the API. None if it hasn't been read yet.
+        """
+        key = (spreadsheet_id, self.a1notation_builder(sheet_name, cell_range) if cell_range else sheet_name)
+        if key not in self.last_good_values:
+            return None
+        return self._overlay_read(spreadsheet_id, sheet_name, cell_range, self.last_good_values[key])
+
+    async def aflush_writes(self) -> bool:
+        """
+        Sends all queued cell writes, using one values().batchUpdate call per spreadsheet.
+
+        Writes that fail are re-queued for the next flush unless a newer value for the same
+        cell was queued in the meantime.
+
+        Returns:
+            bool: True if every batch was written successfully.
+        """
+        pending, self.pending_writes = self.pending_writes, {}
+        priorities, self.pending_priorities = self.pending_priorities, {}
+        success = True
+
+        # Send the most urgent batches first
+        for spreadsheet_id in sorted(pending, key=lambda sid: priorities.get(sid, RequestPriority.SCORE)):
+            writes = pending[spreadsheet_id]
+            priority = priorities.get(spreadsheet_id, RequestPriority.SCORE)
+            for a1_range, value in writes.items():
+                self.inflight_writes[(spreadsheet_id, a1_range)] = value
+            try:
+                written = await self._run_scheduled("write", priority, spreadsheet_id, self.batch_write_cells,
+                                                    spreadsheet_id, writes)
+            finally:
+                for a1_range, value in writes.items():
+                    # A later flush of the same cell owns the entry now
+                    if self.inflight_writes.get((spreadsheet_id, a1_range)) is value:
+                        del self.inflight_writes[(spreadsheet_id, a1_range)]
+            if written:
+                for a1_range, value in writes.items():
+                    self.remember_written_value(spreadsheet_id, a1_range, value)
             else:
-                a1_range = self.a1notation_builder(sheet_name, cell_range)
-                data = self.sheets.values().get(spreadsheetId=spreadsheet_id, range=a1_range).execute()
+                success = False
+                requeue = self.pending_writes.setdefault(spreadsheet_id, {})
+                for a1_range, value in writes.items():
+                    requeue.setdefault(a1_range, value)
+                self.pending_priorities[spreadsheet_id] = min(
+                    priority, self.pending_priorities.get(spreadsheet_id, priority))
+
+        return success
+
+    async def awrite_column(self, spreadsheet_id: str, sheet_name: str, start_cell: str, values: list,
+                            priority: RequestPriority = RequestPriority.SCORE) -> bool:
+        """Non-blocking version of write_column."""
+        return await self._run_scheduled("write", priority, spreadsheet_id, self.write_column, spreadsheet_id,
+                                         sheet_name, start_cell, values)
+
+    def get_sheet_values(self, spreadsheet_id: str, sheet_name: str, cell_range: str = None) -> list[list]:
+        """
+        Returns the raw "values" payload (a list of rows) for a sheet or range.
+
+        Unlike get_data_from_sheet, API errors are raised to the caller so a failed fetch
+        can't be mistaken for an empty sheet.
+        """
+        a1_range = self.a1notation_builder(sheet_name, cell_range) if cell_range else sheet_name
+        read_started = self.overlay.clock()
+        data = self._execute(self.sheets.values().get(spreadsheetId=spreadsheet_id, range=a1_range))
+
+        values = self._overlay_read(spreadsheet_id, sheet_name, cell_range, data.get("values", []), read_started)
+        self.last_good_values[(spreadsheet_id, a1_range)] = values
+        return values
+
+    def get_table_values(self, spreadsheet_id: str, sheet_name: str, table_map: dict, table_names: list,
+                         base_values: list[list]) -> list[list]:
+        """
+        Re-fetches only the given tables with one values().batchGet call and splices them into
+        a copy of a previous full-sheet payload.
+
+        The result is normalised the same way the API trims a full-sheet read, so an unchanged
+        sheet produces exactly the same payload as base_values. API errors are raised to the caller.
+        """
+        ranges = self.table_a1_ranges(sheet_name, table_map, table_names)
+        read_started = self.overlay.clock()
+        data = self._execute(self.sheets.values().batchGet(spreadsheetId=spreadsheet_id,
+                                                           ranges=list(ranges.values())))
+
+        values = [list(row) for row in base_values]
+        fetched = []
+        for table_name, value_range in zip(ranges, data.get("valueRanges", [])):
+            table_metadata = table_map[table_name]
+            start_col = table_metadata["start_col"]
+            end_col = table_metadata.get("end_col", start_col)
+            self.splice_columns(values, value_range.get("values", []), start_col, end_col)
+            fetched.append((None, None, start_col, end_col))
+
+        return self._overlay_read(spreadsheet_id, sheet_name, None, self.trim_values(values), read_started, fetched)
+
+    @staticmethod
+    def is_throttled(error: Exception) -> bool:
+        """True if a Sheets API error means the request was rejected for exceeding quota (429) or load (503)."""
+        status = getattr(getattr(error, "resp", None), "status", None)
+        return status in (429, 503)
+
+    @classmethod
+    def is_transient(cls, error: Exception) -> bool:
+        """True if a failed request is worth retrying: throttling, server errors, timeouts and network errors."""
+        status = getattr(getattr(error, "resp", None), "status", None)
+        if isinstance(status, int):
+            return cls.is_throttled(error) or status >= 500
+        import httplib2
+        return isinstance(error, (OSError, httplib2.HttpLib2Error))
+
+    @staticmethod
+    def column_letter(col: int) -> str:
+        """Converts a zero based column index to its A1 letter, e.g. 0 -> A, 27 -> AB."""
+        letters = ""
+        col += 1
+        while col:
+            col, remainder = divmod(col - 1, 26)
+            letters = chr(ord("A") + remainder) + letters
+        return letters
+
+    @staticmethod
+    def column_index(letters: str) -> int:
+        """Converts an A1 column letter to its zero based index, e.g. A -> 0, AB -> 27."""
+        col = 0
+        for letter in letters.upper():
+            col = col * 26 + ord(letter) - ord("A") + 1
+        return col - 1
+
+    @classmethod
+    def parse_a1_range(cls, a1_range: str) -> tuple:
+        """
+        Parses an A1 range such as "Hunt!C5:D7", "C5" or "C:D" into zero based bounds.
+
+        Returns:
+            tuple: (sheet_name, start_col, start_row, end_col, end_row). sheet_name is None when the
+            range has no sheet prefix, and rows are None for whole column ranges.
 
-            values = data.get("values", [])
-            return self.build_dataframe(values)
+        Raises:
+            ValueError: The range isn't valid A1 notation.
+        """
+        sheet_name, _, cells = a1_range.rpartition("!")
+        sheet_name = sheet_name.strip("'") or None
+
+        bounds = []
+        for cell in cells.split(":", 1):
+            match = re.fullmatch(r"\$?([A-Za-z]+)\$?(\d*)", cell.strip())
+            if not match:
+                raise ValueError(f"Invalid A1 range: {a1_range}")
+            letters, row = match.groups()
+            bounds.append((cls.column_index(letters), int(row) - 1 if row else None))
+
+        (start_col, start_row), (end_col, end_row) = bounds[0], bounds[-1]
+        return sheet_name, start_col, start_row, end_col, end_row
+
+    @classmethod
+    def table_a1_ranges(cls, sheet_name: str, table_map: dict, table_names: list) -> dict:
+        """Returns {table_name: "Sheet!C:F"} for every table in table_names found in the table map."""
+        ranges = {}
+        for table_name in table_names:
+            table_metadata = table_map.get(table_name)
+            if not table_metadata:
+                continue
+
+            start_col = table_metadata["start_col"]
+            end_col = table_metadata.get("end_col", start_col)
+            cell_range = f"{cls.column_letter(start_col)}:{cls.column_letter(end_col)}"
+            ranges[table_name] = cls.a1notation_builder(sheet_name, cell_range)
+
+        return ranges
+
+    @staticmethod
+    def splice_columns(values: list[list], block: list[list], start_col: int, end_col: int) -> None:
+        """Replaces columns start_col..end_col of every row in values with the rows of block, in place."""
+        width = end_col - start_col + 1
+
+        for row_index in range(max(len(values), len(block))):
+            if row_index >= len(values):
+                values.append([])
+            row = values[row_index]
+            block_row = block[row_index] if row_index < len(block) else []
+
+            if len(row) < start_col:
+                row.extend([""] * (start_col - len(row)))
+            padded = list(block_row[:width]) + [""] * (width - len(block_row))
+            row[start_col:end_col + 1] = padded
+
+    @staticmethod
+    def trim_values(values: list[list]) -> list[list]:
+        """Drops trailing empty cells and rows, mirroring how the Sheets API trims a values response."""
+        trimmed = []
+        for row in values:
+            end = len(row)
+            while end and row[end - 1] == "":
+                end -= 1
+            trimmed.append(row[:end])
+
+        while trimmed and not trimmed[-1]:
+            trimmed.pop()
+
+        return trimmed
+
+    def get_data_from_sheet(self, spreadsheet_id: str, sheet_name: str, cell_range: str = None) -> pd.DataFrame:
+        """
+        Returns a sheet or range as a DataFrame. If the read fails, the last payload read
+        successfully for the same range is served instead, and an empty DataFrame only if there is none.
+        """
+        try:
+            values = self.get_sheet_values(spreadsheet_id, sheet_name, cell_range)
         except Exception as e:
-            logger.error("Unable to get data", exc_info=e)
-            return pd.DataFrame()
+            return self.fallback_dataframe(spreadsheet_id, sheet_name, cell_range, e)
+        return self.build_dataframe(values)
+
+    def fallback_dataframe(self, spreadsheet_id: str, sheet_name: str, cell_range: str,
+                           error: Exception) -> pd.DataFrame:
+        """The last good copy of a range that couldn't be read, an empty DataFrame if there is none."""
+        import pandas as pd
+        cached = self.cached_sheet_values(spreadsheet_id, sheet_name, cell_range)
+        if cached is not None:
+            logger.warning(f"[GDoc] Unable to get data, serving last good copy of {sheet_name}: {error}")
+            return self.build_dataframe(cached)
+        logger.error("Unable to get data", exc_info=error)
+        return pd.DataFrame()
 
     @staticmethod
     def a1notation_builder(sheet_name: str, cell_range: str) -> str:
@@ -71,12 +574,18 @@ class GDoc:
         try:
             a1_range = self.a1notation_builder(sheet_name, cell)
 
+            if self.is_unchanged_write(spreadsheet_id, a1_range, value):
+                self.suppressed_writes += 1
+                return True
+
             body = {
                 "values": [[value]]  # single cell must still be 2D
             }
 
-            self.sheets.values().update(spreadsheetId=spreadsheet_id, range=a1_range, valueInputOption="RAW",
-                                        body=body).execute()
+            self._execute(self.sheets.values().update(spreadsheetId=spreadsheet_id, range=a1_range,
+                                                      valueInputOption="RAW", body=body))
+            self.remember_written_value(spreadsheet_id, a1_range, value)
+            self._record_write(spreadsheet_id, a1_range, [value])
 
             return True
 
@@ -84,6 +593,30 @@ class GDoc:
             logger.error("[GDoc] Unable to write single cell", exc_info=e)
             return False
 
+    def batch_write_cells(self, spreadsheet_id: str, writes: dict) -> bool:
+        """
+        Writes several single cells in one request.
+
+        Example:
+            writes={"Config!B13": 10, "Config!B14": 12}
+        """
+        try:
+            body = {
+                "valueInputOption": "RAW",
+                "data": [{"range": a1_range, "values": [[value]]} for a1_range, value in writes.items()]
+            }
+
+            self._execute(self.sheets.values().batchUpdate(spreadsheetId=spreadsheet_id, body=body))
+            for a1_range, value in writes.items():
+                self._record_write(spreadsheet_id, a1_range, [value])
+            logger.debug(f"[GDoc] Batch wrote {len(writes)} cells to {spreadsheet_id}")
+
+            return True
+
+        except Exception as e:
+            logger.error("[GDoc] Unable to batch write cells", exc_info=e)
+            return False
+
     def write_column(self, spreadsheet_id: str, sheet_name: str, start_cell: str, values: list) -> bool:
         """
         Writes a 1D list of values vertically (as a column)
@@ -107,17 +640,36 @@ class GDoc:
                 "values": [[value] for value in values]
             }
 
-            self.sheets.values().update(spreadsheetId=spreadsheet_id, range=a1_range, valueInputOption="RAW",
-                                        body=body).execute()
+            self._execute(self.sheets.values().update(spreadsheetId=spreadsheet_id, range=a1_range,
+                                                      valueInputOption="RAW", body=body))
+            for cell_range, value in zip(self._column_ranges(sheet_name, start_cell, len(values)), values):
+                self.remember_written_value(spreadsheet_id, cell_range, value)
+            self._record_write(spreadsheet_id, a1_range, values)
 
             return True
 
         except Exception as e:
             logger.error("[GDoc] Unable to write column to sheet", exc_info=e)
+            # The column may have been partly written, the shadow copy can't vouch for any of it
+            if isinstance(values, list):
+                for cell_range in self._column_ranges(sheet_name, start_cell, len(values)):
+                    self.drop_written_value(spreadsheet_id, cell_range)
             return False
 
+    def _column_ranges(self, sheet_name: str, start_cell: str, count: int) -> list[str]:
+        """Returns the A1 ranges of the count cells down the column starting at start_cell."""
+        try:
+            _, col, row, _, _ = self.parse_a1_range(start_cell)
+        except ValueError:
+            return []
+        if row is None:
+            return []
+        column = self.column_letter(col)
+        return [self.a1notation_builder(sheet_name, f"{column}{row + 1 + offset}") for offset in range(count)]
+
     @staticmethod
     def build_dataframe(data: list[list]) -> pd.DataFrame:
+        import pandas as pd
         try:
             df = pd.DataFrame(data)
             df.iloc[0] = df.iloc[0].replace({"": None})
@@ -128,25 +680,51 @@ class GDoc:
             return pd.DataFrame()
 
     @staticmethod
-    def build_table_map(df: pd.DataFrame) -> dict:
+    def build_table_map(df: pd.DataFrame, stacked_tables: Collection[str] = ()) -> dict:
+        """
+        Finds the tables on the sheet from their merged label cells.
+
+        Every non-empty cell in row 0 labels a table that spans the empty cells to its right.
+        Tables named in stacked_tables can also be stacked in the same columns: after a blank row,
+        a row with only the first cell of the span filled with the table's name labels it, as long
+        as the row below it (the column headers) is completely filled. Stacking is only detected
+        for tables at least two columns wide. It is opt-in because ordinary tables, e.g. a
+        Key/Value table with a note row, can have rows of that shape.
+
+        Returns:
+            dict: {table_name: {"start_col": int, "end_col": int}}. end_col is omitted for single
+            column tables, and stacked tables and the tables above them get "start_row"/"end_row".
+        """
+        import numpy as np
         logger.info("Building table map...")
 
-        table_map = {}
-        start_col = None
-        name = ""
-
         try:
-            for col in range(len(df.columns)):
-                header_value = df.iloc[0, col]
-
-                if header_value is not None:
-                    name = header_value
-                    start_col = col
-                    table_map[name] = {"start_col": start_col}
-
-                else:
-                    if name:
-                        table_map.setdefault(name, {})["end_col"] = col
+            if df.empty:
+                return {}
+
+            values = GDoc._object_values(df)
+            header = values[0]
+            starts = np.flatnonzero(header != None)  # noqa: E711 - elementwise comparison
+            if not len(starts):
+                return {}
+            ends = np.append(starts[1:], len(header)) - 1
+            label_rows = GDoc._stacked_label_rows(values, starts, ends, stacked_tables)
+
+            table_map = {}
+            for position, (start_col, end_col) in enumerate(zip(starts.tolist(), ends.tolist())):
+                name = header[start_col]
+                table_map[name] = {"start_col": start_col}
+
+                if end_col > start_col:
+                    table_map[name]["end_col"] = end_col
+
+                if position in label_rows:
+                    table_map[name]["end_row"] = label_rows[position][0] - 1
+                    bounds = label_rows[position] + [len(values)]
+                    for start_row, next_start_row in zip(bounds, bounds[1:]):
+                        table_map[values[start_row, start_col]] = {"start_col": start_col, "end_col": end_col,
+                                                                   "start_row": start_row,
+                                                                   "end_row": next_start_row - 1}
 
             return table_map
 
@@ -155,8 +733,75 @@ class GDoc:
             logger.error("Error building table map")
             return {}
 
+    @staticmethod
+    def _object_values(df: pd.DataFrame) -> np.ndarray:
+        """Returns the cells of df as an object array with every missing cell as None."""
+        import numpy as np
+        values = df.to_numpy(dtype=object)
+
+        # Ragged rows are padded with None, except in columns pandas inferred as float, which get NaN
+        float_cols = np.flatnonzero([dtype.kind == "f" for dtype in df.dtypes])
+        if len(float_cols):
+            missing = np.isnan(df.iloc[:, float_cols].to_numpy(dtype=float))
+            values[:, float_cols] = np.where(missing, None, values[:, float_cols])
+
+        return values
+
+    @staticmethod
+    def _filled(cells: np.ndarray) -> np.ndarray:
+        return (cells != None) & (cells != "")  # noqa: E711 - elementwise comparison
+
+    @staticmethod
+    def _stacked_label_rows(values: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                            stacked_tables: Collection[str]) -> dict:
+        """
+        Finds the label rows of the stacked_tables stacked under the tables starting at starts.
+
+        Returns:
+            dict: {table position: [label row, ...]} for every table with tables stacked under it.
+        """
+        import numpy as np
+
+        if not stacked_tables:
+            return {}
+
+        # A label row has the first cell of its span filled and the row above it blank, so first
+        # find the rows where the first column of a table goes from empty to filled
+        first = GDoc._filled(values[:, starts])
+        rows, positions = np.nonzero(first[2:-1] & ~first[1:-2])
+        if not len(rows):
+            return {}
+        rows += 2
+
+        # Only count the filled cells per span on the few rows around those candidates
+        check_rows = np.unique(np.concatenate([rows - 1, rows, rows + 1]))
+        counts = np.add.reduceat(GDoc._filled(values[check_rows]), starts, axis=1, dtype=np.intp)
+        widths = (ends - starts + 1)[positions]
+
+        above = counts[np.searchsorted(check_rows, rows - 1), positions]
+        label = counts[np.searchsorted(check_rows, rows), positions]
+        below = counts[np.searchsorted(check_rows, rows + 1), positions]
+        names = values[rows, starts[positions]]
+        is_label = ((widths > 1) & (above == 0) & (label == 1) & (below == widths)
+                    & np.array([name in stacked_tables for name in names.tolist()], dtype=bool))
+
+        label_rows = {}
+        for row, position in zip(rows[is_label].tolist(), positions[is_label].tolist()):
+            label_rows.setdefault(position, []).append(row)
+        return label_rows
+
+    @staticmethod
+    def diff_sheet_values(old_values: list[list], new_values: list[list], old_table_map: dict, new_table_map: dict,
+                          config_table_name: str = "") -> SheetDiff.SheetDiff:
+        """
+        Computes the changed cells, per table row changes and config key changes between two
+        consecutive sheet snapshots. See SheetDiff.diff_values.
+        """
+        return SheetDiff.diff_values(old_values, new_values, old_table_map, new_table_map, config_table_name)
+
     @staticmethod
     def extract_table(df: pd.DataFrame, table_map: dict, table_name: str) -> pd.DataFrame:
+        import pandas as pd
 
         logger.info("Pulling Table Data...")
 
@@ -166,13 +811,15 @@ class GDoc:
 
         start_col = table_metadata["start_col"]
         end_col = table_metadata.get("end_col", start_col)
+        start_row = table_metadata.get("start_row", 0)
+        end_row = table_metadata.get("end_row", len(df) - 1)
 
         logger.info(f"Data located between columns {start_col} and {end_col}")
 
-        table_df = df.iloc[:, start_col:end_col + 1].copy()
+        table_df = df.iloc[start_row:end_row + 1, start_col:end_col + 1].copy()
 
         # Drop merged label row
-        table_df = table_df.drop(index=0).reset_index(drop=True)
+        table_df = table_df.iloc[1:].reset_index(drop=True)
 
         # Clean data
         table_df = table_df.replace("", pd.NA)
@@ -1,8 +1,25 @@
+from __future__ import annotations
 from datetime import datetime, timedelta, timezone
-import pytz
-import pandas as pd
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Collection, Mapping
+from huntbot.GDoc import GDoc
+from huntbot.MemberTeamIndex import MemberTeamIndex
+from huntbot.RequestScheduler import RequestPriority
+from huntbot.SheetHub import SheetHub
+from huntbot.SheetStore import SheetStore, StoreTable
+from huntbot.TableCache import TableCache
+from huntbot import SheetParser
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import os
 import logging
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,10 +29,41 @@ class InvalidConfig(Exception):
 
 
 class HuntBot:
+    SNAPSHOT_FORMAT = 1
+    # Config values such as passwords keep their cell text, see get_typed_table
+    CONFIG_TEXT_COLUMNS = frozenset({"Value"})
+
     def __init__(self):
         self.table_map = {}
+        # Tables the sheet stacks under another table in the same columns, see GDoc.build_table_map
+        self.stacked_tables: frozenset[str] = frozenset()
         self.sheet_name = ""
-        self.sheet_data = pd.DataFrame()
+        # Legacy DataFrame of the whole sheet, only built when something still asks for sheet_data
+        self._sheet_data = None
+        self._sheet_data_version = None
+        # Typed tables of the current snapshot, see get_typed_table
+        self.store = SheetStore()
+        # Raw API payload of the current snapshot, its content hash and a counter bumped whenever it changes
+        self.sheet_values: list[list] = []
+        self.sheet_hash = ""
+        self.sheet_version = 0
+        # What changed between the previous snapshot and the current one, None for the first snapshot
+        self.last_diff = None
+        self.records_cache = TableCache()
+        # Tables that active cogs poll; once the sheet layout is known only these are re-fetched,
+        # with a full sheet refresh after every full_refresh_interval partial refreshes to pick up
+        # layout changes. Polls and change notifications both count, so in time this varies with the
+        # adaptive poll interval: every 24s to 6 minutes when polling every 2-30s.
+        self.subscribed_tables: set[str] = set()
+        self.full_refresh_interval = 12
+        self.polls_since_full_refresh = 0
+        # Polling and change notifications can both refresh the sheet, only one refresh runs at a time
+        self.refresh_lock = asyncio.Lock()
+        # Delivers table changes to subscribed cogs after every refresh
+        self.sheet_hub = SheetHub(self)
+        # Set while refreshes are failing, cogs keep running on the last good snapshot meanwhile
+        self.stale_since = None
+        self.failed_refreshes = 0
         self.config_table_name = ""
         self.command_channel_id = 0
         self.config_map = {}
@@ -38,9 +86,16 @@ class HuntBot:
         self.wom_event_api_url = "https://api.wiseoldman.net/v2/competitions/"
         self.wom_event_website_url = "https://wiseoldman.net/competitions/"
         self.guild_id = 699971574689955850
+        # Team and staff roles of guild members, shared by the cogs that check who did something
+        self.member_index = MemberTeamIndex(self)
         self.sheet_id = ""
         self.start_message = ""
         self.end_message = ""
+        # Warm start state: where the last good sheet snapshot is persisted, whether /start-hunt
+        # has been run and whether the start announcement was already posted
+        self.snapshot_path = ""
+        self.start_requested = False
+        self.start_announced = False
 
         # TODO hardcode these for now
         self.general_channel_id = 699971574689955853
@@ -58,20 +113,327 @@ class HuntBot:
     def set_sheet_id(self, sheet_id: str) -> None:
         self.sheet_id = sheet_id
 
-    def set_sheet_data(self, sheet_data: pd.DataFrame()) -> None:
+    @property
+    def sheet_data(self) -> pd.DataFrame:
+        """
+        The current snapshot as an object DataFrame of the whole sheet. Built on first use per
+        sheet version; cogs should use get_typed_table instead.
+        """
+        if self._sheet_data is None or self._sheet_data_version != self.sheet_version:
+            self._sheet_data = GDoc.build_dataframe(self.sheet_values)
+            self._sheet_data_version = self.sheet_version
+        return self._sheet_data
+
+    @sheet_data.setter
+    def sheet_data(self, sheet_data: pd.DataFrame) -> None:
+        self._sheet_data = sheet_data
+        self._sheet_data_version = self.sheet_version
+
+    def set_sheet_data(self, sheet_data: pd.DataFrame) -> None:
+        self.sheet_hash = ""
+        self.last_diff = None
+        self.sheet_version += 1
         self.sheet_data = sheet_data
 
+    @staticmethod
+    def hash_sheet_values(values: list[list]) -> str:
+        payload = json.dumps(values, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def update_sheet_values(self, values: list[list]) -> bool:
+        """
+        Publishes a freshly fetched sheet payload as a new snapshot if its contents changed.
+
+        The table map and typed tables are only rebuilt when the content hash differs from the
+        current snapshot, so consumers can compare sheet_version to skip work on unchanged sheets.
+
+        Returns:
+            bool: True if a new snapshot version was published, False if the sheet is unchanged.
+        """
+        sheet_hash = self.hash_sheet_values(values)
+        if sheet_hash == self.sheet_hash:
+            logger.debug(f"[HuntBot] Sheet unchanged (version {self.sheet_version})")
+            return False
+
+        old_values, old_table_map = self.sheet_values, self.table_map
+        self.sheet_values = values
+        if values:
+            self.table_map = SheetParser.build_table_index(values, self.stacked_tables)
+
+        self.last_diff = None
+        if old_values:
+            self.last_diff = GDoc.diff_sheet_values(old_values, values, old_table_map, self.table_map,
+                                                    self.config_table_name)
+            if self.last_diff.config_changes:
+                logger.info(f"[HuntBot] Config keys changed: {sorted(self.last_diff.config_changes)}")
+        self.store.update(values, self.table_map, self.last_diff)
+
+        self.sheet_hash = sheet_hash
+        self.sheet_version += 1
+        logger.info(f"[HuntBot] Sheet changed, now at version {self.sheet_version}")
+        return True
+
+    def set_stacked_tables(self, table_names) -> None:
+        """Sets the tables that may be stacked under others and re-reads the current snapshot's layout."""
+        self.stacked_tables = frozenset(table_names)
+        if self.sheet_values:
+            self.set_table_map(SheetParser.build_table_index(self.sheet_values, self.stacked_tables))
+
     def set_table_map(self, table_map: dict):
         self.table_map = table_map
+        self.records_cache.clear()
+        self.store.update(self.sheet_values, table_map)
+
+    def get_typed_table(self, table_name: str, text_columns: Collection[str] = ()) -> StoreTable:
+        """
+        Returns a table from the current sheet snapshot with typed columns: integer and decimal
+        columns hold ints and floats, everything else interned strings, empty cells are None.
+        Columns named in text_columns keep the cell text whatever it looks like.
+
+        Tables are kept between snapshots until an edit touches them, callers must not modify them.
+        """
+        return self.store.table(table_name, text_columns)
+
+    def get_records(self, table_name: str) -> tuple[Mapping, ...]:
+        """
+        Returns a table from the current sheet snapshot as a tuple of read-only row mappings.
+
+        Uses the pandas-free SheetParser on the raw sheet values and is cached per sheet version,
+        so every caller shares the same rows; they can't be modified.
+        """
+        return self.records_cache.get(self.sheet_version, table_name,
+                                      lambda: tuple(MappingProxyType(record) for record in
+                                                    SheetParser.extract_records(self.sheet_values, self.table_map,
+                                                                                table_name)))
+
+    def subscribe_table(self, table_name: str) -> None:
+        self.subscribed_tables.add(table_name)
+
+    def unsubscribe_table(self, table_name: str) -> None:
+        self.subscribed_tables.discard(table_name)
+
+    def needs_full_refresh(self, table_names: list = None) -> bool:
+        if not self.sheet_values or not self.table_map:
+            return True
+
+        table_names = self.subscribed_tables if table_names is None else table_names
+        if not any(table_name in self.table_map for table_name in table_names):
+            return True
+
+        return self.polls_since_full_refresh >= self.full_refresh_interval
+
+    def request_full_refresh(self) -> None:
+        """Makes the next refresh download the whole sheet."""
+        self.polls_since_full_refresh = self.full_refresh_interval
+
+    def tables_for_ranges(self, ranges: list) -> list | None:
+        """
+        Maps edited A1 ranges, e.g. from a change notification, to the tables they touch.
+
+        Returns:
+            list | None: Sorted names of the touched tables, empty if every edit was on another
+            sheet. None when the whole sheet must be re-read: the ranges are unknown or invalid, an
+            edit touched a table label row or an edit fell outside every known table.
+        """
+        if not ranges or not self.table_map:
+            return None
+
+        tables = set()
+        for a1_range in ranges:
+            if not isinstance(a1_range, str):
+                return None
+            try:
+                sheet_name, start_col, start_row, end_col, end_row = GDoc.parse_a1_range(a1_range)
+            except ValueError:
+                return None
+
+            if sheet_name is not None and sheet_name != self.sheet_name:
+                continue
+
+            # Row 0 holds the table labels, editing it can change the table layout
+            if start_row is None or start_row == 0:
+                return None
+
+            touched = []
+            for table_name, table_metadata in self.table_map.items():
+                table_start_col = table_metadata["start_col"]
+                table_end_col = table_metadata.get("end_col", table_start_col)
+                table_start_row = table_metadata.get("start_row", 0)
+                table_end_row = table_metadata.get("end_row", float("inf"))
+
+                if start_col > table_end_col or end_col < table_start_col:
+                    continue
+                if start_row > table_end_row or end_row < table_start_row:
+                    continue
+                if table_start_row and start_row <= table_start_row <= end_row:
+                    # Label row of a stacked table
+                    return None
+                touched.append(table_name)
+
+            if not touched:
+                return None
+            tables.update(touched)
+
+        return sorted(tables)
+
+    async def refresh_sheet_values(self, gdoc, table_names: list = None,
+                                   priority: RequestPriority = RequestPriority.POLL) -> bool:
+        """
+        Fetches the latest sheet contents and publishes them as a new snapshot if they changed.
+
+        The whole sheet is only downloaded when needed (see needs_full_refresh); otherwise just the
+        requested tables, by default the subscribed ones, are re-read with a single batchGet and
+        merged into the last snapshot. A new snapshot is published to the sheet hub's subscribers.
+
+        If the fetch fails the current snapshot is kept and marked stale, so everything keeps
+        working from cached data until a later refresh succeeds. The error is raised to the caller.
+
+        Args:
+            gdoc (GDoc): Sheets client.
+            table_names (list): Tables to re-read, defaults to the subscribed tables.
+            priority (RequestPriority): Scheduler priority of the Sheets requests.
+
+        Returns:
+            bool: True if the sheet changed.
+        """
+        async with self.refresh_lock:
+            table_names = sorted(self.subscribed_tables) if table_names is None else table_names
+
+            try:
+                if self.needs_full_refresh(table_names):
+                    values = await gdoc.aget_sheet_values(spreadsheet_id=self.sheet_id, sheet_name=self.sheet_name,
+                                                          priority=priority)
+                    self.polls_since_full_refresh = 0
+                    # Cells the bot wrote to the hunt sheet may have been edited by hand since, let the next
+                    # writes go out again. Other spreadsheets aren't re-read, their entries expire instead.
+                    gdoc.forget_written_values(self.sheet_id)
+                else:
+                    values = await gdoc.aget_table_values(spreadsheet_id=self.sheet_id, sheet_name=self.sheet_name,
+                                                          table_map=self.table_map, table_names=table_names,
+                                                          base_values=self.sheet_values, priority=priority)
+                    self.polls_since_full_refresh += 1
+            except Exception:
+                self.failed_refreshes += 1
+                if self.stale_since is None:
+                    self.stale_since = datetime.now(timezone.utc)
+                    logger.warning(f"[HuntBot] Sheet refresh failed, serving snapshot version {self.sheet_version} "
+                                   f"until the Sheets API recovers")
+                raise
+
+            if self.stale_since is not None:
+                logger.info(f"[HuntBot] Sheet refresh recovered after {self.failed_refreshes} failed attempts")
+                self.stale_since = None
+                self.failed_refreshes = 0
+
+            changed = self.update_sheet_values(values)
+            diff = self.last_diff
+
+        if changed:
+            await self.sheet_hub.publish(diff)
+        return changed
+
+    def save_sheet_snapshot(self, path: str = None) -> bool:
+        """
+        Persists the current sheet values, table map and configuration to a gzipped JSON file,
+        so a restarted bot can load its cogs before the Sheets API answers.
+
+        Returns:
+            bool: True if the snapshot was written.
+        """
+        path = path or self.snapshot_path
+        if not path or not self.sheet_values:
+            return False
+
+        snapshot = {
+            "format": self.SNAPSHOT_FORMAT,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "sheet_id": self.sheet_id,
+            "sheet_name": self.sheet_name,
+            "config_table_name": self.config_table_name,
+            "sheet_values": self.sheet_values,
+            "sheet_hash": self.sheet_hash,
+            "table_map": self.table_map,
+            # NaN, e.g. an empty cell of a config DataFrame, isn't valid JSON
+            "config_map": {key: (None if isinstance(value, float) and math.isnan(value) else value)
+                           for key, value in self.config_map.items()},
+            "start_requested": self.start_requested,
+            "start_announced": self.start_announced,
+        }
+
+        try:
+            # Write to a temporary file first so a crash mid-write never leaves a truncated snapshot
+            tmp_path = f"{path}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as snapshot_file:
+                json.dump(snapshot, snapshot_file, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp_path, path)
+            logger.debug(f"[HuntBot] Saved sheet snapshot version {self.sheet_version} to {path}")
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"[HuntBot] Failed to save sheet snapshot to {path}", exc_info=e)
+            return False
+
+    async def asave_sheet_snapshot(self) -> bool:
+        """Non-blocking version of save_sheet_snapshot."""
+        return await asyncio.to_thread(self.save_sheet_snapshot)
+
+    def load_sheet_snapshot(self, path: str = None) -> bool:
+        """
+        Restores the sheet values, table map and configuration from a snapshot file written by
+        save_sheet_snapshot. The restored data is published as a new sheet version.
+
+        Returns:
+            bool: True if a snapshot was restored.
+        """
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            return False
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except (OSError, ValueError) as e:
+            logger.error(f"[HuntBot] Unable to read sheet snapshot {path}", exc_info=e)
+            return False
+
+        if snapshot.get("format") != self.SNAPSHOT_FORMAT:
+            logger.warning(f"[HuntBot] Ignoring sheet snapshot {path} with unknown format {snapshot.get('format')}")
+            return False
+
+        self.sheet_id = snapshot.get("sheet_id", "")
+        self.sheet_name = snapshot.get("sheet_name", "")
+        self.config_table_name = snapshot.get("config_table_name", "")
+        self.sheet_values = snapshot.get("sheet_values", [])
+        self.table_map = snapshot.get("table_map", {})
+        self.sheet_hash = snapshot.get("sheet_hash", "")
+        self.sheet_version += 1
+        self.store.update(self.sheet_values, self.table_map)
+        self.start_requested = snapshot.get("start_requested", False)
+        self.start_announced = snapshot.get("start_announced", False)
+
+        config_map = snapshot.get("config_map", {})
+        if config_map:
+            try:
+                self.load_config_map(config_map)
+            except InvalidConfig as e:
+                logger.error(f"[HuntBot] Snapshot configuration is invalid: {e}")
+
+        logger.info(f"[HuntBot] Restored sheet snapshot saved at {snapshot.get('saved_at')} from {path}")
+        return True
 
     def load_config(self, df):
+        """Loads the configuration from the config table, a typed table or a DataFrame."""
         try:
-            # Turn config DF into dict
-            self.config_map = dict(zip(df['Key'], df['Value']))
+            # Turn config table into dict
+            config_map = dict(zip(df['Key'], df['Value']))
         except Exception as e:
             logger.exception("Failed to parse configuration dataframe.")
             raise InvalidConfig("Failed to parse configuration dataframe.")
 
+        self.load_config_map(config_map)
+
+    def load_config_map(self, config_map: dict):
+        self.config_map = config_map
+
         if not self.config_map:
             raise InvalidConfig("Configuration map is empty.")
 
@@ -142,8 +504,7 @@ class HuntBot:
 
     @staticmethod
     def get_current_utc_time():
-        utc_timezone = pytz.utc
-        utc_time = datetime.now(utc_timezone)
+        utc_time = datetime.now(timezone.utc)
         return utc_time
 
     def check_start(self):
@@ -174,13 +535,13 @@ class HuntBot:
         self.wom_event_website_url = self.wom_event_website_url + str(self.wom_competition_id)
 
     @staticmethod
-    def update_plugin_gdoc_master_password(password: str, gdoc) -> None:
+    async def update_plugin_gdoc_master_password(password: str, gdoc) -> None:
         master_pass_cell = "B9"
         plugin_spreadsheet_id = "1qqkjx4YjuQ9FIBDgAGzSpmoKcDow3yEa9lYFmc-JeDA"
         plugin_sheet_name = "Config"
         try:
-            success_cell = gdoc.write_cell(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
-                                           cell=master_pass_cell, value=password)
-            logger.info(f"[HuntBot] Single cell write success (B11): {success_cell}")
+            gdoc.queue_cell_write(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
+                                  cell=master_pass_cell, value=password, priority=RequestPriority.PASSWORD)
+            logger.info(f"[HuntBot] Master password write queued ({master_pass_cell})")
         except Exception as e:
             logger.error(f"[HuntBot] Error updating bounty password cell in RL Plugin GDoc", exc_info=e)
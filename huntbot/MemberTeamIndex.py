@@ -0,0 +1,169 @@
+from typing import Optional, TYPE_CHECKING
+import asyncio
+import discord
+import logging
+
+if TYPE_CHECKING:
+    from huntbot.HuntBot import HuntBot
+
+logger = logging.getLogger(__name__)
+
+
+class MemberInfo:
+    """What the bot needs to know about a guild member, derived once from their roles."""
+    __slots__ = ("user_id", "roles", "role_names", "team_name", "is_team_leader", "is_staff", "is_sheet_helper")
+
+    def __init__(self, user_id: int, roles: frozenset[str], team_name: Optional[str]) -> None:
+        self.user_id = user_id
+        # Names of every role the member has, spelled as in Discord
+        self.roles = roles
+        # The same names in lower case, for case-insensitive checks
+        self.role_names = frozenset(name.lower() for name in roles)
+        # Team their roles put them on, None if neither team
+        self.team_name = team_name
+        # The starboard's role checks are case-sensitive
+        self.is_team_leader = any(name.endswith("Team Leader") for name in roles)
+        self.is_staff = "Staff" in roles
+        self.is_sheet_helper = "Sheet helper" in roles
+
+    def has_any_role(self, role_names: set[str]) -> bool:
+        """True if the member has one of role_names, which must be lower case."""
+        return not self.role_names.isdisjoint(role_names)
+
+
+class MemberTeamIndex:
+    """
+    Resolves a user ID to the member's team and staff or leader roles without calling Discord.
+
+    The index is warmed once from the guild's member list (chunked over the gateway, which needs
+    the members intent) and kept current by the member join, update and remove events. Members it
+    hasn't seen, e.g. when chunking isn't possible, are fetched once and kept.
+
+    Without the members intent there are no member events, so set member_events to False: the
+    index is then never trusted on its own and members are fetched on every lookup that didn't
+    come with a Member.
+
+    Teams come from HuntBot's team names and are matched by role name substring, so a "Red Team
+    Leader" is on the Red team. When the team names change every member is reclassified.
+    """
+
+    def __init__(self, hunt_bot: "HuntBot") -> None:
+        self.hunt_bot = hunt_bot
+        self.members: dict[int, MemberInfo] = {}
+        # Users fetched and found not to be in the guild, until they join
+        self.missing: set[int] = set()
+        self.warmed_guild_id = 0
+        self.warm_lock = asyncio.Lock()
+        # False when the bot runs without the members intent and the index can go stale
+        self.member_events = True
+        # Team names the members were classified with
+        self.team_names = self.current_team_names()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def current_team_names(self) -> tuple[str, str]:
+        return self.hunt_bot.team_one_name, self.hunt_bot.team_two_name
+
+    def team_for_roles(self, roles: frozenset[str]) -> Optional[str]:
+        team_one, team_two = self.team_names
+        for role_name in roles:
+            role_name = role_name.lower()
+            if team_one and team_one.lower() in role_name:
+                return team_one
+            if team_two and team_two.lower() in role_name:
+                return team_two
+        return None
+
+    def update_member(self, member) -> MemberInfo:
+        """Indexes a member (anything with an id and roles), replacing what was known about them."""
+        roles = frozenset(role.name for role in getattr(member, "roles", ()))
+        info = MemberInfo(member.id, roles, self.team_for_roles(roles))
+        self.members[member.id] = info
+        self.missing.discard(member.id)
+        return info
+
+    def remove_member(self, user_id: int) -> None:
+        self.members.pop(user_id, None)
+
+    def reclassify(self) -> None:
+        self.team_names = self.current_team_names()
+        for user_id, info in self.members.items():
+            self.members[user_id] = MemberInfo(user_id, info.roles, self.team_for_roles(info.roles))
+
+    def get(self, user_id: int) -> Optional[MemberInfo]:
+        """The indexed member, None if they aren't indexed. Never calls Discord."""
+        if self.team_names != self.current_team_names():
+            self.reclassify()
+        info = self.members.get(user_id)
+        if info is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return info
+
+    def team_of(self, user_id: int) -> Optional[str]:
+        info = self.get(user_id)
+        return info.team_name if info else None
+
+    async def warm(self, guild) -> None:
+        """Indexes every member of the guild, chunking the member list first if needed. Runs once per guild."""
+        if guild is None or guild.id == self.warmed_guild_id:
+            return
+
+        async with self.warm_lock:
+            if guild.id == self.warmed_guild_id:
+                return
+            if not guild.chunked and self.member_events:
+                try:
+                    await guild.chunk()
+                except discord.ClientException as e:
+                    # Without the members intent, members are fetched one at a time as they're needed
+                    logger.warning(f"[MemberTeamIndex] Could not chunk guild members: {e}")
+            for member in guild.members:
+                self.update_member(member)
+            self.warmed_guild_id = guild.id
+            logger.info(f"[MemberTeamIndex] Indexed {len(self.members)} members of guild {guild.id}")
+
+    async def resolve(self, guild, user_id: int, member=None) -> Optional[MemberInfo]:
+        """
+        Returns the member's info. A member (a Member with roles) that came with the event is
+        indexed and used as is; otherwise the index is used, fetching the member from the guild
+        once when they aren't indexed yet. None if they aren't in the guild.
+
+        Args:
+            guild (discord.Guild): Guild to warm the index from or fetch the member from, may be None.
+            user_id (int): The user to resolve.
+            member: Optional Member object that came with the event, used instead of a fetch.
+
+        Returns:
+            Optional[MemberInfo]: The member's info, or None.
+        """
+        if member is not None and hasattr(member, "roles"):
+            # The event's own Member is current, it wins over what was indexed before
+            return self.update_member(member)
+        if not self.member_events and guild is not None:
+            return await self.fetch(guild, user_id)
+        info = self.get(user_id)
+        if info is not None:
+            return info
+        if guild is None or user_id in self.missing:
+            return None
+
+        await self.warm(guild)
+        info = self.members.get(user_id)
+        if info is not None:
+            return info
+        return await self.fetch(guild, user_id)
+
+    async def fetch(self, guild, user_id: int) -> Optional[MemberInfo]:
+        """Fetches a member from the guild and indexes them, None if they aren't in the guild."""
+        self.fetches += 1
+        try:
+            return self.update_member(await guild.fetch_member(user_id))
+        except discord.NotFound:
+            self.remove_member(user_id)
+            self.missing.add(user_id)
+            return None
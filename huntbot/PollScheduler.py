@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    Decides how often the main hunt loop runs and how often it re-reads the hunt sheet.
+
+    The loop interval follows the hunt timeline: slow while the start is far away, one second in
+    the minutes around the start and end so they're announced on time, and otherwise the sheet
+    poll interval. The sheet poll interval adapts to how often the sheet actually changes: it
+    halves whenever a poll finds a change and grows slowly while nothing changes. When the Sheets
+    API throttles, polling backs off exponentially until reads succeed again.
+    """
+    PRECISION_WINDOW = timedelta(minutes=5)
+    PRECISION_INTERVAL = 1.0
+    PRE_START_INTERVAL = 120.0
+
+    MIN_SHEET_INTERVAL = 2.0
+    MAX_SHEET_INTERVAL = 30.0
+    IDLE_GROWTH = 1.25
+    MAX_BACKOFF = 16
+
+    def __init__(self, sheet_interval: float = 5.0, min_sheet_interval: float = MIN_SHEET_INTERVAL,
+                 max_sheet_interval: float = MAX_SHEET_INTERVAL, clock: Callable[[], float] = time.monotonic) -> None:
+        self.min_sheet_interval = min_sheet_interval
+        self.max_sheet_interval = max(max_sheet_interval, min_sheet_interval)
+        self.base_sheet_interval = min(max(sheet_interval, self.min_sheet_interval), self.max_sheet_interval)
+        self.backoff = 1
+        self.clock = clock
+        self.last_poll = None
+
+        # Metrics
+        self.current_interval = self.base_sheet_interval
+        self.polls = 0
+        self.changed_polls = 0
+        self.throttled_polls = 0
+
+    def set_bounds(self, min_sheet_interval: float, max_sheet_interval: float) -> None:
+        """Changes the range the sheet poll interval adapts within, e.g. when push notifications take over."""
+        self.min_sheet_interval = min_sheet_interval
+        self.max_sheet_interval = max(max_sheet_interval, min_sheet_interval)
+        self.base_sheet_interval = min(max(self.base_sheet_interval, self.min_sheet_interval), self.max_sheet_interval)
+
+    @property
+    def sheet_interval(self) -> float:
+        """Seconds between sheet polls, including any throttling backoff."""
+        return self.base_sheet_interval * self.backoff
+
+    def record_poll(self, changed: bool) -> None:
+        """Adapts the sheet poll interval after a successful poll."""
+        self.polls += 1
+        if changed:
+            self.changed_polls += 1
+            self.base_sheet_interval = max(self.min_sheet_interval, self.base_sheet_interval / 2)
+        else:
+            self.base_sheet_interval = min(self.max_sheet_interval, self.base_sheet_interval * self.IDLE_GROWTH)
+
+        # Reads are going through again, recover from throttling gradually
+        self.backoff = max(1, self.backoff // 2)
+
+    def record_throttle(self) -> None:
+        """Backs sheet polling off after the Sheets API rejected a read for exceeding its quota."""
+        self.throttled_polls += 1
+        self.backoff = min(self.MAX_BACKOFF, self.backoff * 2)
+        logger.warning(f"[PollScheduler] Sheets API throttled, polling every {self.sheet_interval:.0f}s")
+
+    def refresh_due(self) -> bool:
+        """True if the sheet should be polled now. Marks the poll as started."""
+        now = self.clock()
+        if self.last_poll is not None and now - self.last_poll < self.sheet_interval:
+            return False
+        self.last_poll = now
+        return True
+
+    def next_interval(self, now: datetime, start: Optional[datetime], end: Optional[datetime]) -> float:
+        """
+        Returns how many seconds the main loop should sleep before its next run.
+
+        Args:
+            now (datetime): Current UTC time.
+            start (datetime): Hunt start time, None until the bot is configured.
+            end (datetime): Hunt end time, None until the bot is configured.
+        """
+        interval = self.sheet_interval
+
+        if start is not None and end is not None:
+            milestones = [start, end]
+            if any(abs(now - milestone) <= self.PRECISION_WINDOW for milestone in milestones):
+                interval = self.PRECISION_INTERVAL
+            elif now < start:
+                interval = max(interval, self.PRE_START_INTERVAL)
+
+            # Never sleep past the start of the next precision window
+            upcoming = [(milestone - self.PRECISION_WINDOW - now).total_seconds() for milestone in milestones
+                        if milestone - self.PRECISION_WINDOW > now]
+            if upcoming:
+                interval = min(interval, max(self.PRECISION_INTERVAL, min(upcoming)))
+
+        if interval != self.current_interval:
+            logger.info(f"[PollScheduler] Main loop interval {self.current_interval:.1f}s -> {interval:.1f}s")
+        self.current_interval = interval
+        return interval
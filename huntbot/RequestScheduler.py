@@ -0,0 +1,183 @@
+from collections import OrderedDict, deque
+from enum import IntEnum
+from typing import Callable
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Priority classes for Sheets API requests, lower values are served first."""
+    PASSWORD = 0  # Password writes the RuneLite plugin depends on
+    COMMAND = 1  # Reads triggered by staff slash commands, e.g. /sheet
+    SCORE = 2  # Score mirror writes to the plugin sheet
+    POLL = 3  # Background polling of the hunt sheet
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to capacity tokens and refills at rate_per_minute.
+    Every API request consumes one token.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_available(self) -> float:
+        """Returns how many seconds until a token can be consumed, 0 if one is available now."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+
+class RequestScheduler:
+    """
+    Central admission control for Sheets API requests.
+
+    Reads and writes each have their own token bucket matching the API's per-minute quotas.
+    When a bucket is empty, waiting requests are admitted by priority class, and requests of the
+    same class are admitted round-robin per source (the spreadsheet they target) so one busy
+    spreadsheet can't starve another.
+    """
+
+    # Sheets allows 300 requests/minute per project but only 60/minute per user, and the bot's
+    # service account is a single user, so 60/minute is the limit that actually applies
+    DEFAULT_REQUESTS_PER_MINUTE = 60
+    DEFAULT_BURST = 10
+
+    def __init__(self, read_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 write_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE, burst: int = DEFAULT_BURST,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.buckets = {
+            "read": TokenBucket(read_per_minute, burst, clock=clock),
+            "write": TokenBucket(write_per_minute, burst, clock=clock),
+        }
+        # {kind: {priority: {source: deque[Future]}}}
+        self.waiting: dict[str, dict[RequestPriority, OrderedDict]] = {
+            kind: {priority: OrderedDict() for priority in RequestPriority} for kind in self.buckets
+        }
+        self.dispatchers: dict[str, asyncio.Task] = {}
+
+        # Metrics
+        self.admitted_requests = 0
+        self.queued_requests = 0
+        self.last_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    def queue_depth(self, kind: str = None) -> int:
+        """Number of requests currently waiting for a token, for one kind or across both."""
+        kinds = [kind] if kind else list(self.waiting)
+        return sum(len(waiters) for k in kinds for sources in self.waiting[k].values()
+                   for waiters in sources.values())
+
+    @property
+    def average_wait_seconds(self) -> float:
+        if not self.admitted_requests:
+            return 0.0
+        return self.total_wait_seconds / self.admitted_requests
+
+    async def acquire(self, kind: str, priority: RequestPriority = RequestPriority.POLL,
+                      source: str = "default") -> float:
+        """
+        Waits until a request of the given kind may be sent.
+
+        Args:
+            kind (str): "read" or "write".
+            priority (RequestPriority): Priority class of the request.
+            source (str): Fair queuing key, usually the spreadsheet ID.
+
+        Returns:
+            float: Seconds spent waiting in the queue.
+        """
+        bucket = self.buckets[kind]
+
+        # Fast path: nobody is queued ahead of us and the quota has room
+        if not self.queue_depth(kind) and bucket.time_until_available() == 0:
+            bucket.consume()
+            self._record_wait(0.0)
+            return 0.0
+
+        queued_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        waiters = self.waiting[kind][priority].setdefault(source, deque())
+        waiters.append(future)
+        self.queued_requests += 1
+        self._ensure_dispatcher(kind)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            self._remove_waiter(kind, priority, source, future)
+            raise
+
+        waited = time.monotonic() - queued_at
+        self._record_wait(waited)
+        if waited > 1:
+            logger.info(f"[RequestScheduler] {priority.name} {kind} request waited {waited:.1f}s for quota")
+        return waited
+
+    def _record_wait(self, waited: float) -> None:
+        self.admitted_requests += 1
+        self.last_wait_seconds = waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.total_wait_seconds += waited
+
+    def _remove_waiter(self, kind: str, priority: RequestPriority, source: str, future: asyncio.Future) -> None:
+        waiters = self.waiting[kind][priority].get(source)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            if not waiters:
+                del self.waiting[kind][priority][source]
+
+    def _ensure_dispatcher(self, kind: str) -> None:
+        dispatcher = self.dispatchers.get(kind)
+        if dispatcher is None or dispatcher.done():
+            self.dispatchers[kind] = asyncio.create_task(self._dispatch(kind))
+
+    def _next_waiter(self, kind: str):
+        for priority in RequestPriority:
+            sources = self.waiting[kind][priority]
+            while sources:
+                source, waiters = next(iter(sources.items()))
+                future = waiters.popleft()
+                if waiters:
+                    # Round-robin: this source goes to the back of its priority class
+                    sources.move_to_end(source)
+                else:
+                    del sources[source]
+
+                if not future.done():
+                    return future
+        return None
+
+    async def _dispatch(self, kind: str) -> None:
+        bucket = self.buckets[kind]
+        while self.queue_depth(kind):
+            delay = bucket.time_until_available()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            future = self._next_waiter(kind)
+            if future is None:
+                break
+
+            bucket.consume()
+            future.set_result(None)
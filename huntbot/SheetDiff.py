@@ -0,0 +1,194 @@
+"""
+Structured diff between two consecutive snapshots of the hunt sheet.
+
+The diff lists every changed cell, the rows added, removed or edited in each table and the
+config keys whose values changed, so consumers can react to exactly what was edited instead of
+re-extracting and comparing whole tables themselves.
+"""
+from difflib import SequenceMatcher
+from huntbot import SheetParser
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CellChange:
+    __slots__ = ("row", "col", "old", "new")
+
+    def __init__(self, row: int, col: int, old, new) -> None:
+        self.row = row
+        self.col = col
+        self.old = old
+        self.new = new
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CellChange)
+                and (self.row, self.col, self.old, self.new) == (other.row, other.col, other.old, other.new))
+
+    def __repr__(self) -> str:
+        return f"CellChange(row={self.row}, col={self.col}, {self.old!r} -> {self.new!r})"
+
+
+class TableDiff:
+    """Changes to one table. Rows are table records as returned by SheetParser.extract_records."""
+
+    def __init__(self, table_name: str) -> None:
+        self.table_name = table_name
+        self.changed_cells: list[CellChange] = []
+        self.rows_added: list[dict] = []
+        self.rows_removed: list[dict] = []
+        # (old row, new row) pairs for rows edited in place
+        self.rows_changed: list[tuple[dict, dict]] = []
+
+    def __repr__(self) -> str:
+        return (f"TableDiff({self.table_name!r}, cells={len(self.changed_cells)}, added={len(self.rows_added)}, "
+                f"removed={len(self.rows_removed)}, changed={len(self.rows_changed)})")
+
+
+class SheetDiff:
+    def __init__(self) -> None:
+        self.changed_cells: list[CellChange] = []
+        self.tables: dict[str, TableDiff] = {}
+        # {key: (old value, new value)}, None for keys that were added or removed
+        self.config_changes: dict[str, tuple] = {}
+        self.layout_changed = False
+
+    @property
+    def empty(self) -> bool:
+        return not self.changed_cells and not self.layout_changed
+
+    @property
+    def changed_tables(self) -> list[str]:
+        return list(self.tables)
+
+    def __repr__(self) -> str:
+        return (f"SheetDiff(cells={len(self.changed_cells)}, tables={self.changed_tables}, "
+                f"config={sorted(self.config_changes)}, layout_changed={self.layout_changed})")
+
+
+def _normalise(value):
+    return None if value == "" else value
+
+
+def diff_cells(old_values: list[list], new_values: list[list]) -> list[CellChange]:
+    """
+    Lists every cell whose value differs between two raw Sheets API payloads, in row major order.
+    Missing and empty cells are treated as the same.
+    """
+    changes = []
+    old_height = len(old_values)
+    new_height = len(new_values)
+
+    for row in range(max(old_height, new_height)):
+        old_row = old_values[row] if row < old_height else []
+        new_row = new_values[row] if row < new_height else []
+        # Nearly every row is unchanged between polls, and list equality runs in C
+        if old_row == new_row:
+            continue
+
+        old_width = len(old_row)
+        new_width = len(new_row)
+        for col in range(max(old_width, new_width)):
+            old = _normalise(old_row[col]) if col < old_width else None
+            new = _normalise(new_row[col]) if col < new_width else None
+            if old != new:
+                changes.append(CellChange(row, col, old, new))
+
+    return changes
+
+
+def _tables_for_cell(table_map: dict, row: int, col: int) -> list[str]:
+    tables = []
+    for table_name, table_metadata in table_map.items():
+        start_col = table_metadata["start_col"]
+        if not start_col <= col <= table_metadata.get("end_col", start_col):
+            continue
+        if not table_metadata.get("start_row", 0) <= row <= table_metadata.get("end_row", row):
+            continue
+        tables.append(table_name)
+    return tables
+
+
+def _diff_rows(table_diff: TableDiff, old_rows: list[dict], new_rows: list[dict]) -> None:
+    # Edits are usually confined to a few rows, so skip the common head and tail before matching
+    start = 0
+    shortest = min(len(old_rows), len(new_rows))
+    while start < shortest and old_rows[start] == new_rows[start]:
+        start += 1
+
+    end = 0
+    while end < shortest - start and old_rows[-1 - end] == new_rows[-1 - end]:
+        end += 1
+
+    old_rows = old_rows[start:len(old_rows) - end]
+    new_rows = new_rows[start:len(new_rows) - end]
+
+    # Cells edited in place leave the row count alone. Pair the rows up by position unless so
+    # many differ that rows were probably inserted and deleted, which needs a real alignment.
+    if len(old_rows) == len(new_rows):
+        changed = [(old, new) for old, new in zip(old_rows, new_rows) if old != new]
+        if len(changed) <= len(old_rows) // 2:
+            table_diff.rows_changed += changed
+            return
+
+    matcher = SequenceMatcher(a=[tuple(row.items()) for row in old_rows],
+                              b=[tuple(row.items()) for row in new_rows], autojunk=False)
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if tag == "replace" and old_end - old_start == new_end - new_start:
+            table_diff.rows_changed += list(zip(old_rows[old_start:old_end], new_rows[new_start:new_end]))
+            continue
+        table_diff.rows_removed += old_rows[old_start:old_end]
+        table_diff.rows_added += new_rows[new_start:new_end]
+
+
+def _config_map(values: list[list], table_map: dict, config_table_name: str) -> dict:
+    records = SheetParser.extract_records(values, table_map, config_table_name)
+    return {record.get("Key"): record.get("Value") for record in records if record.get("Key") is not None}
+
+
+def diff_values(old_values: list[list], new_values: list[list], old_table_map: dict, new_table_map: dict,
+                config_table_name: str = "") -> SheetDiff:
+    """
+    Computes the diff between two consecutive sheet snapshots.
+
+    Args:
+        old_values (list[list]): Raw values of the previous snapshot.
+        new_values (list[list]): Raw values of the current snapshot.
+        old_table_map (dict): Table map of the previous snapshot.
+        new_table_map (dict): Table map of the current snapshot.
+        config_table_name (str): Name of the config table, to report config key changes.
+
+    Returns:
+        SheetDiff: The changes. Only tables with changed cells are extracted and compared row by row.
+    """
+    diff = SheetDiff()
+    diff.changed_cells = diff_cells(old_values, new_values)
+    diff.layout_changed = old_table_map != new_table_map
+
+    for change in diff.changed_cells:
+        # A cell belongs to the table at its position now, or the one it was part of before
+        tables = _tables_for_cell(new_table_map, change.row, change.col) or _tables_for_cell(old_table_map,
+                                                                                              change.row, change.col)
+        for table_name in tables:
+            diff.tables.setdefault(table_name, TableDiff(table_name)).changed_cells.append(change)
+
+    # Tables that appeared, disappeared or moved
+    for table_name in old_table_map.keys() | new_table_map.keys():
+        if old_table_map.get(table_name) != new_table_map.get(table_name):
+            diff.tables.setdefault(table_name, TableDiff(table_name))
+
+    for table_name, table_diff in diff.tables.items():
+        _diff_rows(table_diff,
+                   SheetParser.extract_records(old_values, old_table_map, table_name),
+                   SheetParser.extract_records(new_values, new_table_map, table_name))
+
+    if config_table_name and config_table_name in diff.tables:
+        old_config = _config_map(old_values, old_table_map, config_table_name)
+        new_config = _config_map(new_values, new_table_map, config_table_name)
+        for key in old_config.keys() | new_config.keys():
+            if old_config.get(key) != new_config.get(key):
+                diff.config_changes[key] = (old_config.get(key), new_config.get(key))
+
+    return diff
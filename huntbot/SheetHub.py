@@ -0,0 +1,130 @@
+from typing import Awaitable, Callable, Mapping, Sequence, TYPE_CHECKING
+from huntbot.SheetDiff import SheetDiff
+import asyncio
+import hashlib
+import json
+import logging
+
+if TYPE_CHECKING:
+    from huntbot.HuntBot import HuntBot
+
+logger = logging.getLogger(__name__)
+
+TableCallback = Callable[[str, Sequence[Mapping]], Awaitable[None]]
+DiffCallback = Callable[[SheetDiff], Awaitable[None]]
+
+
+class SheetHub:
+    """
+    Fans every new sheet snapshot out to the cogs that care about it.
+
+    Cogs subscribe to named tables with an async callback. Whenever HuntBot publishes a new
+    snapshot, each subscribed table is extracted once, compared with the contents delivered last
+    time, and only if it changed are its subscribers called with the table's row records. All
+    subscribers of a table get the same records list, so it must be treated as read-only.
+
+    When the cell-level SheetDiff of the new snapshot is known, only the tables it touches are
+    checked, and diff subscribers receive the whole diff (changed cells, row and config changes).
+
+    Subscribing also adds the table to HuntBot.subscribed_tables, so polling keeps re-reading it.
+    """
+
+    def __init__(self, hunt_bot: "HuntBot") -> None:
+        self.hunt_bot = hunt_bot
+        self.subscribers: dict[str, list[TableCallback]] = {}
+        self.diff_subscribers: list[DiffCallback] = []
+        # Content digest of every subscribed table as last delivered
+        self.digests: dict[str, str] = {}
+        # A diff is only trusted to narrow down the tables to check when it covers every change
+        # since the last published version
+        self.published_version = hunt_bot.sheet_version
+        self.publish_lock = asyncio.Lock()
+
+        # Metrics
+        self.publishes = 0
+        self.deliveries = 0
+
+    @staticmethod
+    def digest(records: Sequence[Mapping]) -> str:
+        payload = json.dumps([dict(record) for record in records], separators=(",", ":"), default=str).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def subscribe(self, table_name: str, callback: TableCallback) -> None:
+        """Calls callback(table_name, records) every time the table's contents change."""
+        callbacks = self.subscribers.setdefault(table_name, [])
+        if callback in callbacks:
+            return
+        callbacks.append(callback)
+        self.hunt_bot.subscribe_table(table_name)
+
+        # Subscribers load their initial state themselves, only later changes are delivered
+        if table_name not in self.digests:
+            self.digests[table_name] = self.digest(self.hunt_bot.get_records(table_name))
+
+    def unsubscribe(self, table_name: str, callback: TableCallback) -> None:
+        callbacks = self.subscribers.get(table_name, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+        if not callbacks:
+            self.subscribers.pop(table_name, None)
+            self.digests.pop(table_name, None)
+            self.hunt_bot.unsubscribe_table(table_name)
+
+    def subscribe_diff(self, callback: DiffCallback) -> None:
+        """Calls callback(diff) with the SheetDiff of every new snapshot that changed something."""
+        if callback not in self.diff_subscribers:
+            self.diff_subscribers.append(callback)
+
+    def unsubscribe_diff(self, callback: DiffCallback) -> None:
+        if callback in self.diff_subscribers:
+            self.diff_subscribers.remove(callback)
+
+    async def publish(self, diff: SheetDiff = None) -> list[str]:
+        """
+        Delivers the current sheet snapshot to the subscribers of every table that changed.
+
+        Args:
+            diff (SheetDiff): Changes since the previous snapshot. Without it every subscribed
+                table is re-checked.
+
+        Returns:
+            list[str]: Names of the tables that changed.
+        """
+        async with self.publish_lock:
+            self.publishes += 1
+            changed = []
+            deliveries = []
+            complete_diff = diff is not None and self.hunt_bot.sheet_version == self.published_version + 1
+            self.published_version = self.hunt_bot.sheet_version
+
+            for table_name, callbacks in list(self.subscribers.items()):
+                if complete_diff and table_name not in diff.tables:
+                    continue
+
+                records = self.hunt_bot.get_records(table_name)
+                digest = self.digest(records)
+                if digest == self.digests.get(table_name):
+                    continue
+
+                self.digests[table_name] = digest
+                changed.append(table_name)
+                deliveries += [(callback, table_name, records) for callback in list(callbacks)]
+
+            if changed:
+                logger.info(f"[SheetHub] Sheet version {self.hunt_bot.sheet_version} changed tables: {changed}")
+
+            calls = [(callback, table_name, callback(table_name, records))
+                     for callback, table_name, records in deliveries]
+            if diff is not None and not diff.empty:
+                calls += [(callback, "sheet diff", callback(diff)) for callback in list(self.diff_subscribers)]
+
+            # Subscribers run concurrently so a slow Discord call doesn't hold up the others
+            results = await asyncio.gather(*(call for _, _, call in calls), return_exceptions=True)
+            for (callback, table_name, _), result in zip(calls, results):
+                if isinstance(result, Exception):
+                    logger.error(f"[SheetHub] Subscriber {getattr(callback, '__qualname__', callback)} failed "
+                                 f"handling {table_name}", exc_info=result)
+
+            self.deliveries += len(calls)
+            return changed
@@ -0,0 +1,160 @@
+"""
+Pandas-free parsing of the raw "values" payload returned by the Sheets API.
+
+These functions produce the same tables as GDoc.build_dataframe, GDoc.build_table_map and
+GDoc.extract_table, but work directly on the list of rows without building a DataFrame of the
+whole sheet. Tables are returned as lists of row dicts, with empty cells as None.
+"""
+from typing import Collection
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _cell(row: list, col: int):
+    """Returns a cell value with missing and empty cells normalised to None."""
+    if col >= len(row):
+        return None
+    value = row[col]
+    return None if value == "" else value
+
+
+def build_table_index(values: list[list], stacked_tables: Collection[str] = ()) -> dict:
+    """
+    Finds the tables on the sheet exactly like GDoc.build_table_map.
+
+    Each non-empty cell in row 0 starts a table, and the empty cells that follow it extend the
+    table to the right. The stacked_tables stacked below another one in the same columns are
+    detected with the same rules as GDoc.build_table_map.
+
+    Returns:
+        dict: {table_name: {"start_col": int, "end_col": int}}. end_col is omitted for single column
+        tables, and stacked tables and the tables above them get "start_row"/"end_row".
+    """
+    if not values:
+        return {}
+
+    header = values[0]
+    width = max(len(row) for row in values)
+    starts = [col for col in range(width) if _cell(header, col) is not None]
+    ends = [next_start - 1 for next_start in starts[1:]] + [width - 1]
+
+    table_index = {}
+    for start_col, end_col in zip(starts, ends):
+        name = header[start_col]
+        table_index[name] = {"start_col": start_col}
+
+        if end_col > start_col:
+            table_index[name]["end_col"] = end_col
+            _add_stacked_tables(values, table_index, name, start_col, end_col, stacked_tables)
+
+    return table_index
+
+
+def _add_stacked_tables(values: list[list], table_index: dict, name: str, start_col: int, end_col: int,
+                        stacked_tables: Collection[str]) -> None:
+    if not stacked_tables:
+        return
+    columns = range(start_col, end_col + 1)
+
+    # Cheap check first: the span's first column goes from empty to one of the stacked table names
+    first = [start_col < len(row) and row[start_col] != "" for row in values]
+    candidates = [row for row in range(2, len(values) - 1)
+                  if first[row] and not first[row - 1] and values[row][start_col] in stacked_tables]
+
+    label_rows = [
+        row for row in candidates
+        if not any(_cell(values[row - 1], col) is not None for col in columns)
+        and not any(_cell(values[row], col) is not None for col in columns[1:])
+        and all(_cell(values[row + 1], col) is not None for col in columns)
+    ]
+
+    if not label_rows:
+        return
+
+    table_index[name]["end_row"] = label_rows[0] - 1
+    bounds = label_rows + [len(values)]
+    for start_row, next_start_row in zip(bounds, bounds[1:]):
+        table_index[values[start_row][start_col]] = {"start_col": start_col, "end_col": end_col,
+                                                     "start_row": start_row, "end_row": next_start_row - 1}
+
+
+def extract_records(values: list[list], table_index: dict, table_name: str) -> list[dict]:
+    """
+    Returns the rows of one table as dicts keyed by the table's header row.
+
+    Mirrors GDoc.extract_table: the label row is skipped, columns and rows that are completely
+    empty are dropped and the first remaining row becomes the header.
+    """
+    header, rows = extract_rows(values, table_index, table_name)
+    return [dict(zip(header, row)) for row in rows]
+
+
+def extract_rows(values: list[list], table_index: dict, table_name: str) -> tuple[tuple, list[tuple]]:
+    """
+    Returns one table as (header, rows) with every row a tuple in header order. Same rules as
+    extract_records, without building a dict per row.
+    """
+    table_metadata = table_index.get(table_name)
+    if not table_metadata:
+        return (), []
+
+    start_col = table_metadata["start_col"]
+    end_col = table_metadata.get("end_col", start_col)
+    rows = values[table_metadata.get("start_row", 0) + 1:table_metadata.get("end_row", len(values) - 1) + 1]
+
+    columns = [tuple(_cell(row, col) for row in rows) for col in range(start_col, end_col + 1)]
+    return _trim_columns(columns)
+
+
+def parse_tables(values: list[list], table_names: list = None,
+                 stacked_tables: Collection[str] = ()) -> tuple[dict, dict]:
+    """
+    Builds the table index and extracts tables in a single pass over the sheet rows.
+
+    Args:
+        values (list[list]): Raw values payload from the Sheets API.
+        table_names (list): Tables to extract, defaults to every table on the sheet.
+        stacked_tables (Collection[str]): Tables that may be stacked under another one.
+
+    Returns:
+        tuple: (table_index, {table_name: records})
+    """
+    table_index = build_table_index(values, stacked_tables)
+    names = [name for name in (table_names if table_names is not None else table_index) if name in table_index]
+    if not names:
+        return table_index, {}
+
+    # Normalise and pad every row once, then transpose so each table is a slice of columns
+    width = max(len(row) for row in values)
+    rows = [[None if value == "" else value for value in row] + [None] * (width - len(row)) for row in values]
+    columns = list(zip(*rows))
+
+    tables = {}
+    for name in names:
+        table_metadata = table_index[name]
+        start_col = table_metadata["start_col"]
+        stop_col = table_metadata.get("end_col", start_col) + 1
+        # Skip the label row of the table
+        start_row = table_metadata.get("start_row", 0) + 1
+        stop_row = table_metadata.get("end_row", len(values) - 1) + 1
+        tables[name] = _columns_to_records([column[start_row:stop_row] for column in columns[start_col:stop_col]])
+
+    return table_index, tables
+
+
+def _columns_to_records(columns: list[tuple]) -> list[dict]:
+    header, rows = _trim_columns(columns)
+    return [dict(zip(header, row)) for row in rows]
+
+
+def _trim_columns(columns: list[tuple]) -> tuple[tuple, list[tuple]]:
+    # Drop columns with no values at all, then rows with no values at all. tuple.count runs in C,
+    # which keeps this fast on sheets with thousands of rows.
+    columns = [column for column in columns if column.count(None) != len(column)]
+    rows = [row for row in zip(*columns) if row.count(None) != len(row)]
+
+    if not rows:
+        return (), []
+
+    return rows[0], rows[1:]
@@ -0,0 +1,249 @@
+"""
+Compact, typed in-memory store for the tables of the hunt sheet.
+
+Each table is kept column by column. A column whose values are all integers is stored in an
+array('q'), one whose values are all decimal numbers in an array('d'), and anything else as a list
+of interned strings, so repeated values such as team names or "x" markers share a single object.
+Callers name the free-text columns of a table, such as Task and Password, which are always kept as
+strings.
+Empty cells are None. Rows are handed out as Row views over the columns, which use __slots__ and
+hold no copy of the data.
+
+Tables are built lazily from the raw sheet values, and tables a new snapshot didn't touch are kept
+between snapshots instead of being rebuilt every poll.
+"""
+from array import array
+from typing import Collection, Iterator, Optional
+from huntbot import SheetParser
+import logging
+import re
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Only canonical numbers are converted, so values like "007" or "1e5" keep their exact text
+INT_PATTERN = re.compile(r"-?(?:0|[1-9][0-9]*)")
+FLOAT_PATTERN = re.compile(r"-?(?:0|[1-9][0-9]*)\.[0-9]+")
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+class Column:
+    """One typed table column. kind is "int", "float" or "str"."""
+    __slots__ = ("kind", "values", "missing")
+
+    def __init__(self, kind: str, values, missing: Optional[bytearray] = None) -> None:
+        self.kind = kind
+        self.values = values
+        # For numeric columns, 1 marks an empty cell. None when the column has no empty cells.
+        self.missing = missing
+
+    @classmethod
+    def from_cells(cls, cells: list, text: bool = False) -> "Column":
+        """Builds a column from its cells; with text=True it is stored as strings whatever it holds."""
+        present = [cell for cell in cells if cell is not None]
+        kind = "str" if text else cls.infer_kind(present)
+
+        if kind == "str":
+            return cls(kind, [None if cell is None else sys.intern(str(cell)) for cell in cells])
+
+        convert = int if kind == "int" else float
+        missing = bytearray(cell is None for cell in cells) if len(present) != len(cells) else None
+        return cls(kind, array("q" if kind == "int" else "d",
+                               [0 if cell is None else convert(cell) for cell in cells]), missing)
+
+    @staticmethod
+    def infer_kind(cells: list) -> str:
+        if not cells or not all(isinstance(cell, str) for cell in cells):
+            return "str"
+        if all(INT_PATTERN.fullmatch(cell) for cell in cells):
+            if all(INT64_MIN <= int(cell) <= INT64_MAX for cell in cells):
+                return "int"
+            return "str"
+        if all(INT_PATTERN.fullmatch(cell) or FLOAT_PATTERN.fullmatch(cell) for cell in cells):
+            return "float"
+        return "str"
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int):
+        if self.missing is not None and self.missing[index]:
+            return None
+        return self.values[index]
+
+    def __iter__(self) -> Iterator:
+        if self.missing is None:
+            return iter(self.values)
+        return (None if missing else value for value, missing in zip(self.values, self.missing))
+
+
+class Row:
+    """
+    Read-only view of one table row. Supports the dict style access the cogs use on records,
+    e.g. row["Task"] and row.get("Double").
+    """
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: "StoreTable", index: int) -> None:
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, column_name: str):
+        return self.table.columns[self.table.column_index[column_name]][self.index]
+
+    def get(self, column_name: str, default=None):
+        position = self.table.column_index.get(column_name)
+        if position is None:
+            return default
+        return self.table.columns[position][self.index]
+
+    def __contains__(self, column_name: str) -> bool:
+        return column_name in self.table.column_index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table.column_index)
+
+    def __len__(self) -> int:
+        return len(self.table.column_index)
+
+    def keys(self):
+        return self.table.column_index.keys()
+
+    def values(self) -> list:
+        return [self[column_name] for column_name in self.table.column_index]
+
+    def items(self) -> list[tuple]:
+        return [(column_name, self[column_name]) for column_name in self.table.column_index]
+
+    def as_dict(self) -> dict:
+        return dict(self.items())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Row):
+            return self.as_dict() == other.as_dict()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Row({self.as_dict()!r})"
+
+
+class StoreTable:
+    """
+    A table extracted from the sheet with the same rules as SheetParser.extract_records, stored
+    column by column with one type per column.
+
+    Columns named in text_columns always keep the cell text, even when every value looks like a
+    number: a password "1.50" must not come back as 1.5, nor "12" as 12.0 in a column that also has "3.5".
+    """
+
+    def __init__(self, name: str, header: tuple = (), rows: list[tuple] = (),
+                 text_columns: Collection[str] = ()) -> None:
+        self.name = name
+        self.header = tuple(None if column_name is None else sys.intern(str(column_name))
+                            for column_name in header)
+        # Like a dict built from the row, the last of two columns with the same name wins
+        self.column_index = {column_name: position for position, column_name in enumerate(self.header)}
+        self.columns = [Column.from_cells(list(cells), text=column_name in text_columns)
+                        for column_name, cells in zip(self.header, zip(*rows))] if rows else []
+        self.row_count = len(rows)
+
+    @property
+    def empty(self) -> bool:
+        return self.row_count == 0
+
+    @property
+    def column_types(self) -> dict:
+        return {column_name: self.columns[position].kind for column_name, position in self.column_index.items()}
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __iter__(self) -> Iterator[Row]:
+        return (Row(self, index) for index in range(self.row_count))
+
+    def __getitem__(self, key):
+        """table[i] returns row i, table["Column"] the values of that column as a list."""
+        if isinstance(key, str):
+            position = self.column_index.get(key)
+            if position is None:
+                raise KeyError(key)
+            return list(self.columns[position]) if self.columns else []
+
+        if key < 0:
+            key += self.row_count
+        if not 0 <= key < self.row_count:
+            raise IndexError(f"Row {key} out of range for table {self.name!r}")
+        return Row(self, key)
+
+    def rows(self, offset: int = 0) -> Iterator[Row]:
+        return (Row(self, index) for index in range(offset, self.row_count))
+
+    def records(self) -> list[dict]:
+        return [row.as_dict() for row in self]
+
+    def __repr__(self) -> str:
+        return f"StoreTable({self.name!r}, rows={self.row_count}, columns={self.column_types})"
+
+
+class SheetStore:
+    """
+    Typed tables of the current sheet snapshot.
+
+    update() is called with every new snapshot; tables are only (re)built when first asked for,
+    and tables the snapshot's SheetDiff didn't touch are carried over from the previous snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.values: list[list] = []
+        self.table_map: dict = {}
+        # Built tables by (table name, text columns they were built with)
+        self.tables: dict[tuple[str, frozenset], StoreTable] = {}
+
+        # Metrics
+        self.tables_built = 0
+        self.tables_kept = 0
+
+    def update(self, values: list[list], table_map: dict, diff=None) -> None:
+        """
+        Switches the store to a new snapshot.
+
+        Args:
+            values (list[list]): Raw values of the new snapshot.
+            table_map (dict): Table map of the new snapshot.
+            diff (SheetDiff): Changes since the previous snapshot. Without it, or when the table
+                layout changed, every table is rebuilt on its next use.
+        """
+        if diff is None or diff.layout_changed or table_map != self.table_map:
+            self.tables = {}
+        else:
+            for key in [key for key in self.tables if key[0] in diff.tables]:
+                del self.tables[key]
+            self.tables_kept += len(self.tables)
+
+        self.values = values
+        self.table_map = table_map
+
+    def table(self, table_name: str, text_columns: Collection[str] = ()) -> StoreTable:
+        """
+        Returns a table of the current snapshot, empty if the sheet has no such table.
+
+        Args:
+            table_name (str): Name of the table.
+            text_columns (Collection[str]): Free-text columns of the table, kept as strings.
+        """
+        key = (table_name, frozenset(text_columns))
+        table = self.tables.get(key)
+        if table is None:
+            header, rows = SheetParser.extract_rows(self.values, self.table_map, table_name)
+            table = StoreTable(table_name, header, rows, key[1])
+            self.tables[key] = table
+            self.tables_built += 1
+        return table
+
+    def clear(self) -> None:
+        self.values = []
+        self.table_map = {}
+        self.tables = {}
@@ -0,0 +1,122 @@
+from aiohttp import web
+from typing import Awaitable, Callable, Optional
+import asyncio
+import hmac
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SheetWebhook:
+    """
+    Small embedded HTTP endpoint that receives hunt sheet change notifications, for example from
+    an Apps Script onEdit trigger, so the bot can re-read the edited tables straight away instead
+    of waiting for the next poll.
+
+    Notifications are POSTed to /sheet-changed as JSON, {"range": "Hunt!C5:D5"} or
+    {"ranges": [...]}, with the shared secret in the X-Hunt-Bot-Token header. Bursts of edits are
+    coalesced: while one refresh runs, further notifications are collected and handled together in
+    a single follow-up refresh.
+    """
+    PATH = "/sheet-changed"
+    TOKEN_HEADER = "X-Hunt-Bot-Token"
+
+    def __init__(self, on_change: Callable[[Optional[list]], Awaitable], secret: str = "",
+                 host: str = "0.0.0.0", port: int = 8080) -> None:
+        """
+        Args:
+            on_change: Coroutine called with the edited A1 ranges, or None when a notification
+                didn't say what changed and everything should be refreshed.
+            secret (str): Shared secret notifications must present. Required, start() refuses to
+                listen without one.
+            host (str): Interface to listen on.
+            port (int): Port to listen on, 0 picks a free port.
+        """
+        self.on_change = on_change
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.runner: Optional[web.AppRunner] = None
+
+        # Changes waiting for the next refresh, None in the list means "unknown, refresh everything"
+        self.pending_ranges: list = []
+        self.worker: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.notifications_received = 0
+        self.notifications_rejected = 0
+        self.refreshes_triggered = 0
+        self.last_notification_at = 0.0
+
+    async def start(self) -> None:
+        if not self.secret:
+            # Anyone who can reach the port could force whole-sheet refreshes and use up the read quota
+            raise ValueError("A shared secret is required to accept sheet change notifications")
+
+        app = web.Application()
+        app.router.add_post(self.PATH, self.handle_change)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        # Report the real port when an ephemeral one was requested
+        self.port = self.runner.addresses[0][1]
+        logger.info(f"[SheetWebhook] Listening for sheet change notifications on {self.host}:{self.port}{self.PATH}")
+
+    async def stop(self) -> None:
+        if self.worker and not self.worker.done():
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def handle_change(self, request: web.Request) -> web.Response:
+        if self.secret and not hmac.compare_digest(request.headers.get(self.TOKEN_HEADER, ""), self.secret):
+            self.notifications_rejected += 1
+            logger.warning("[SheetWebhook] Rejected change notification with a missing or invalid token")
+            return web.json_response({"error": "unauthorized"}, status=401)
+
+        try:
+            body = await request.json() if request.can_read_body else {}
+        except ValueError:
+            self.notifications_rejected += 1
+            return web.json_response({"error": "invalid JSON"}, status=400)
+
+        if not isinstance(body, dict):
+            self.notifications_rejected += 1
+            return web.json_response({"error": "expected a JSON object"}, status=400)
+
+        ranges = body.get("ranges") or ([body["range"]] if body.get("range") else [None])
+        if not isinstance(ranges, list) or not all(a1_range is None or isinstance(a1_range, str)
+                                                   for a1_range in ranges):
+            self.notifications_rejected += 1
+            return web.json_response({"error": "expected ranges to be a list of A1 ranges"}, status=400)
+
+        self.notify(ranges)
+        return web.json_response({"status": "accepted"}, status=202)
+
+    def notify(self, ranges: list) -> None:
+        """Queues edited ranges for a refresh, starting the refresh worker if it isn't running."""
+        self.notifications_received += 1
+        self.last_notification_at = time.monotonic()
+        self.pending_ranges.extend(ranges)
+
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self.pending_ranges:
+            ranges, self.pending_ranges = self.pending_ranges, []
+            self.refreshes_triggered += 1
+
+            try:
+                await self.on_change(None if None in ranges else ranges)
+            except Exception as e:
+                logger.error("[SheetWebhook] Error refreshing sheet after change notification", exc_info=e)
@@ -0,0 +1,129 @@
+from typing import Awaitable, Callable, Optional
+import asyncio
+import discord
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StickyMessage:
+    """
+    Keeps a status message at the bottom of a channel without reading the channel.
+
+    The owner feeds it the channel's message events (observe_message / observe_delete), so it
+    always knows whether the sticky is still the newest message. update() sets the content;
+    changes are debounced and posted at most every min_interval seconds, always ending with the
+    latest content. A post edits the sticky in place while it is the newest message, otherwise it
+    deletes it and posts a new one. Nothing is fetched: edits and deletes go through partial
+    messages. A failed post is retried with exponential backoff until it goes through.
+    """
+    # Seconds to wait after a failed post, doubling with every further failure up to RETRY_MAX_DELAY
+    RETRY_BASE_DELAY = 2.0
+    RETRY_MAX_DELAY = 60.0
+
+    def __init__(self, channel, min_interval: float = 3.0, name: str = "",
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep) -> None:
+        self.channel = channel
+        self.min_interval = min_interval
+        self.name = name or "sticky"
+        self.clock = clock
+        self.sleep = sleep
+        self.message_id = 0
+        # Newest message in the channel as far as we've seen
+        self.last_message_id = 0
+        self.content = ""
+        self.posted_content = ""
+        self.posted_at: Optional[float] = None
+        self.pending: Optional[asyncio.Task] = None
+        self.post_lock = asyncio.Lock()
+
+        # Metrics
+        self.updates = 0
+        self.edits = 0
+        self.reposts = 0
+        self.failed_posts = 0
+
+    @property
+    def is_last(self) -> bool:
+        return bool(self.message_id) and self.last_message_id <= self.message_id
+
+    def observe_message(self, message_id: int) -> None:
+        """Call for every message posted in the channel."""
+        self.last_message_id = max(self.last_message_id, message_id)
+
+    def observe_delete(self, message_id: int) -> None:
+        """Call for every message deleted from the channel."""
+        if message_id == self.message_id:
+            # Posted again next time, without trying to delete it
+            self.message_id = 0
+            self.posted_content = ""
+            if self.content:
+                self.schedule()
+
+    def update(self, content: str) -> None:
+        """Sets the sticky's content; it is posted after the debounce interval if it changed."""
+        self.content = content
+        self.updates += 1
+        if content != self.posted_content:
+            self.schedule()
+
+    def schedule(self) -> None:
+        if self.pending is None or self.pending.done():
+            self.pending = asyncio.ensure_future(self.post_later())
+
+    async def post_later(self) -> None:
+        # Content can change while posting, keep going until the latest content is out
+        failures = 0
+        while self.content != self.posted_content:
+            if self.posted_at is not None:
+                delay = self.posted_at + self.min_interval - self.clock()
+                if delay > 0:
+                    await self.sleep(delay)
+            try:
+                await self.post()
+                failures = 0
+            except Exception as e:
+                delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** failures)
+                failures += 1
+                self.failed_posts += 1
+                logger.error(f"[StickyMessage] Failed to post {self.name}, retrying in {delay:.0f}s: {e}")
+                await self.sleep(delay)
+
+    async def post(self) -> None:
+        """Posts the current content now, editing in place when the sticky is still the newest message."""
+        async with self.post_lock:
+            content = self.content
+            if content == self.posted_content or self.channel is None:
+                return
+
+            if self.is_last:
+                try:
+                    await self.channel.get_partial_message(self.message_id).edit(content=content)
+                    self.edits += 1
+                    self.finish_post(content)
+                    return
+                except discord.NotFound:
+                    self.message_id = 0
+            elif self.message_id:
+                try:
+                    await self.channel.get_partial_message(self.message_id).delete()
+                except discord.NotFound:
+                    pass
+
+            sent = await self.channel.send(content)
+            self.message_id = sent.id
+            self.observe_message(sent.id)
+            self.reposts += 1
+            self.finish_post(content)
+
+    def finish_post(self, content: str) -> None:
+        self.posted_content = content
+        self.posted_at = self.clock()
+
+    def close(self) -> None:
+        """Drops any pending post."""
+        if self.pending is not None and not self.pending.done():
+            self.pending.cancel()
+        self.pending = None
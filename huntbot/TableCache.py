@@ -0,0 +1,52 @@
+from typing import Any, Callable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TableCache:
+    """
+    Memoizes extracted sheet tables for a single sheet snapshot version.
+
+    Every caller asking for the same table while the sheet version is unchanged gets the same
+    object back (a DataFrame or the row records), so the tables must be treated as read-only.
+    Entries from older versions are evicted as soon as a newer version is requested.
+    """
+
+    def __init__(self) -> None:
+        self.version = None
+        self.tables: dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: int, table_name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached table for the given snapshot version, calling loader on a miss.
+
+        Args:
+            version (int): Sheet snapshot version the table belongs to.
+            table_name (str): Name of the table in the sheet table map.
+            loader (Callable): Builds the table when it is not cached yet.
+
+        Returns:
+            Any: The extracted table, shared between all callers.
+        """
+        if version != self.version:
+            if self.tables:
+                logger.debug(f"[TableCache] Evicting {len(self.tables)} tables from version {self.version}")
+            self.tables = {}
+            self.version = version
+
+        table = self.tables.get(table_name)
+        if table is not None:
+            self.hits += 1
+            return table
+
+        self.misses += 1
+        table = loader()
+        self.tables[table_name] = table
+        return table
+
+    def clear(self) -> None:
+        self.version = None
+        self.tables = {}
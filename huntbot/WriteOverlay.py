@@ -0,0 +1,134 @@
+from typing import Callable, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# A rectangle of sheet cells as zero based (start_row, end_row, start_col, end_col), None for unbounded
+Box = tuple[Optional[int], Optional[int], Optional[int], Optional[int]]
+
+
+class WriteOverlay:
+    """
+    Read-your-writes layer for sheet values.
+
+    Every successful cell write is remembered until a read that started after the write finished
+    has covered the cell. Until then, reads (and cached copies of earlier reads) get the written
+    value laid over whatever the payload holds, so the bot never reads back data older than its
+    own writes. The first covering read settles the write: if the sheet holds the written value
+    the write is confirmed, otherwise the sheet was changed by someone else after the write and
+    the sheet's value wins.
+
+    Values are compared as the Sheets API formats them, e.g. 10 is read back as "10".
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.lock = threading.Lock()
+        # {(spreadsheet_id, sheet_name): {(row, col): (text, written_at)}}
+        self.cells: dict[tuple[str, str], dict[tuple[int, int], tuple[str, float]]] = {}
+
+        # Metrics
+        self.confirmed_writes = 0
+        self.invalidated_writes = 0
+
+    @staticmethod
+    def cell_text(value) -> str:
+        """Returns value the way a RAW write of it is read back from the Sheets API."""
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        return str(value)
+
+    def record(self, spreadsheet_id: str, sheet_name: str, start_row: int, col: int, values: list) -> None:
+        """Remembers a successful write of values to consecutive rows of one column."""
+        written_at = self.clock()
+        with self.lock:
+            cells = self.cells.setdefault((spreadsheet_id, sheet_name), {})
+            for offset, value in enumerate(values):
+                cells[(start_row + offset, col)] = (self.cell_text(value), written_at)
+
+    def pending(self, spreadsheet_id: str, sheet_name: str) -> int:
+        """Number of written cells in the sheet that no read has settled yet."""
+        with self.lock:
+            return len(self.cells.get((spreadsheet_id, sheet_name), {}))
+
+    @staticmethod
+    def _covers(boxes: Optional[list[Box]], row: int, col: int) -> bool:
+        if boxes is None:
+            return True
+        for start_row, end_row, start_col, end_col in boxes:
+            if ((start_row is None or row >= start_row) and (end_row is None or row <= end_row)
+                    and (start_col is None or col >= start_col) and (end_col is None or col <= end_col)):
+                return True
+        return False
+
+    def apply(self, spreadsheet_id: str, sheet_name: str, values: list[list], read_started: float = None,
+              bounds: Box = None, fetched: Optional[list[Box]] = None) -> tuple[list[list], list]:
+        """
+        Settles the writes a read covered and lays the others over its payload.
+
+        Args:
+            spreadsheet_id (str): Spreadsheet the values were read from.
+            sheet_name (str): Sheet the values were read from.
+            values (list[list]): Payload of the read, or a cached copy of one.
+            read_started (float): Clock time the read was sent, None for cached payloads which
+                can't settle anything.
+            bounds (tuple): Box of sheet cells the payload covers, None for the whole sheet.
+            fetched (list): Boxes of sheet cells the read actually fetched from the API, when
+                parts of the payload came from an older one. Defaults to all of bounds.
+
+        Returns:
+            tuple: (values, invalidated), values with unsettled writes applied (a copy if anything
+            changed) and the (row, col) of every write the sheet contradicted.
+        """
+        invalidated = []
+        overlaid = None
+        origin_row, origin_col = (bounds[0] or 0, bounds[2] or 0) if bounds else (0, 0)
+        if fetched is None:
+            fetched = [bounds] if bounds else None
+
+        with self.lock:
+            cells = self.cells.get((spreadsheet_id, sheet_name))
+            if not cells:
+                return values, invalidated
+
+            for (row, col), (text, written_at) in list(cells.items()):
+                if bounds and not self._covers([bounds], row, col):
+                    continue
+
+                value_row, value_col = row - origin_row, col - origin_col
+                source = overlaid if overlaid is not None else values
+                remote = ""
+                if value_row < len(source) and value_col < len(source[value_row]):
+                    remote = self.cell_text(source[value_row][value_col])
+
+                if read_started is not None and read_started > written_at and self._covers(fetched, row, col):
+                    del cells[(row, col)]
+                    if remote == text:
+                        self.confirmed_writes += 1
+                    else:
+                        self.invalidated_writes += 1
+                        invalidated.append((row, col))
+                    continue
+
+                if remote == text:
+                    continue
+
+                if overlaid is None:
+                    overlaid = [list(row_values) for row_values in values]
+                while len(overlaid) <= value_row:
+                    overlaid.append([])
+                row_values = overlaid[value_row]
+                row_values.extend([""] * (value_col + 1 - len(row_values)))
+                row_values[value_col] = text
+
+            if not cells:
+                self.cells.pop((spreadsheet_id, sheet_name), None)
+
+        if invalidated:
+            logger.warning(f"[WriteOverlay] {len(invalidated)} cells written to {sheet_name} were changed "
+                           f"on the sheet since, using the sheet's values")
+        return (overlaid if overlaid is not None else values), invalidated
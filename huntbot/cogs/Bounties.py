@@ -1,15 +1,16 @@
 import asyncio
 
 from discord.ext import commands, tasks
-import pandas as pd
 from string import Template
 from huntbot.HuntBot import HuntBot
+from huntbot.SheetStore import StoreTable
 from huntbot.exceptions import TableDataImportException, ConfigurationException
 from huntbot.GDoc import GDoc
+from huntbot.RequestScheduler import RequestPriority
 import logging
 import re
 import discord
-from huntbot.cogs.TotalBountyItemCounter import TotalBountyItemCounterCog
+from huntbot.cogs.ItemCounter import ItemCounterCog
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +58,9 @@ IMAGE_URL_PATTERN = re.compile(
 
 
 class BountiesCog(commands.Cog):
+    # Free-text columns of the task tables, kept as strings even when they look like numbers
+    TEXT_COLUMNS = frozenset({"Task", "Password"})
+
     def __init__(self, bot: commands.Bot, hunt_bot: HuntBot, gdoc: GDoc):
         self.bot = bot
         self.hunt_bot = hunt_bot
@@ -67,17 +71,22 @@ class BountiesCog(commands.Cog):
         self.bounty_interval = 0
         self.single_bounty_offset = 0
         self.double_bounty_offset = 0
-        self.single_bounties_df = pd.DataFrame()
-        self.double_bounties_df = pd.DataFrame()
+        self.single_bounties = StoreTable("")
+        self.double_bounties = StoreTable("")
         self.single_bounties_table_name = "Single Bounties"
         self.double_bounties_table_name = "Double Bounties"
         self.bounty_description = ""
         self.message_id = 0
+        # Start message of the running total-drop challenge, 0 if there isn't one
+        self.total_drop_msg_id = 0
         self.configured = False
         self.embed_message = None
 
         self.single_bounty_generator = None
         self.double_bounty_generator = None
+        # How many rows each generator has handed out, so they can be rebuilt when the tables change
+        self.single_bounties_served = 0
+        self.double_bounties_served = 0
         self.first_place = ""
         self.second_place = ""
 
@@ -92,9 +101,14 @@ class BountiesCog(commands.Cog):
             self.get_single_bounty_offset()
             self.get_double_bounty_offset()
 
-            self.single_bounty_generator = self.yield_next_row(self.single_bounties_df, offset=self.single_bounty_offset)
-            self.double_bounty_generator = self.yield_next_row(self.double_bounties_df, offset=self.double_bounty_offset)
+            self.single_bounty_generator = self.yield_next_row(self.single_bounties, offset=self.single_bounty_offset)
+            self.double_bounty_generator = self.yield_next_row(self.double_bounties, offset=self.double_bounty_offset)
             self.configured = True
+
+            # Pick up edits staff make to upcoming bounties mid-hunt
+            for table_name in (self.single_bounties_table_name, self.double_bounties_table_name):
+                self.hunt_bot.sheet_hub.subscribe(table_name, self.on_bounties_table_changed)
+
             self.start_bounties.start()
         except Exception as e:
             logger.error(f"[Bounties Cog] Initialization failed: {e}")
@@ -102,6 +116,8 @@ class BountiesCog(commands.Cog):
 
     async def cog_unload(self) -> None:
         logger.info("[Bounties Cog] Unloading cog.")
+        for table_name in (self.single_bounties_table_name, self.double_bounties_table_name):
+            self.hunt_bot.sheet_hub.unsubscribe(table_name, self.on_bounties_table_changed)
         if self.start_bounties.is_running():
             self.start_bounties.stop()
 
@@ -122,18 +138,16 @@ class BountiesCog(commands.Cog):
             raise ConfigurationException(config_key='BOUNTY_CHANNEL_ID')
 
     def get_single_bounties(self) -> None:
-        self.single_bounties_df = GDoc.extract_table(df=self.hunt_bot.sheet_data, table_map=self.hunt_bot.table_map,
-                                                     table_name=self.single_bounties_table_name)
+        self.single_bounties = self.hunt_bot.get_typed_table(self.single_bounties_table_name, self.TEXT_COLUMNS)
 
-        if self.single_bounties_df.empty:
+        if self.single_bounties.empty:
             logger.error("[Bounties Cog] Error parsing single bounties from config map")
             raise TableDataImportException(table_name=self.single_bounties_table_name)
 
     def get_double_bounties(self) -> None:
-        self.double_bounties_df = GDoc.extract_table(df=self.hunt_bot.sheet_data, table_map=self.hunt_bot.table_map,
-                                                     table_name=self.double_bounties_table_name)
+        self.double_bounties = self.hunt_bot.get_typed_table(self.double_bounties_table_name, self.TEXT_COLUMNS)
 
-        if self.double_bounties_df.empty:
+        if self.double_bounties.empty:
             logger.error("[Bounties Cog] Error parsing double bounties from config map")
             raise TableDataImportException(table_name=self.double_bounties_table_name)
 
@@ -149,13 +163,30 @@ class BountiesCog(commands.Cog):
             logger.error("[Bounties Cog] No DOUBLE_BOUNTY_OFFSET data found in config")
             raise ConfigurationException(config_key='DOUBLE_BOUNTY_OFFSET')
 
+    async def on_bounties_table_changed(self, table_name: str, records: list) -> None:
+        """
+        Sheet hub callback for the bounty tables. Rebuilds the bounty generator from the updated table,
+        skipping the bounties that have already been served.
+        """
+        if table_name == self.single_bounties_table_name:
+            self.single_bounties = self.hunt_bot.get_typed_table(table_name, self.TEXT_COLUMNS)
+            self.single_bounty_generator = self.yield_next_row(
+                self.single_bounties, offset=self.single_bounty_offset + self.single_bounties_served)
+        elif table_name == self.double_bounties_table_name:
+            self.double_bounties = self.hunt_bot.get_typed_table(table_name, self.TEXT_COLUMNS)
+            self.double_bounty_generator = self.yield_next_row(
+                self.double_bounties, offset=self.double_bounty_offset + self.double_bounties_served)
+        else:
+            return
+
+        logger.info(f"[Bounties Cog] {table_name} changed, upcoming bounties updated")
+
     @staticmethod
-    def yield_next_row(df, offset: int = 0):
+    def yield_next_row(table: StoreTable, offset: int = 0):
         if offset < 0:
             raise ValueError("[Bounties Cog] Offset cannot be negative")
 
-        for _, row in df.iloc[offset:].iterrows():
-            yield row
+        yield from table.rows(offset)
 
     async def post_team_notif(self) -> None:
         """
@@ -197,24 +228,26 @@ class BountiesCog(commands.Cog):
         try:
             logger.info("[Bounties Cog] Attempting to serve bounty")
 
-            counter_cog = self.bot.get_cog("TotalBountyItemCounterCog")
-
-            if not isinstance(counter_cog, TotalBountyItemCounterCog):
-                logger.error("[Bounties Cog] TotalBountyItemCounterCog not loaded.")
+            counter_cog = self.bot.get_cog("ItemCounterCog")
+            if not isinstance(counter_cog, ItemCounterCog):
+                logger.error("[Bounties Cog] ItemCounterCog not loaded.")
                 return
 
-            # If process is still running, go ahead and end it before next continuing
-            if counter_cog.active:
-                logger.info("[Bounties Cog] Total drop challenge over. Stopping TotalBountyItemCounter Cog.")
-                await counter_cog.stop_counter()
+            # If a total drop challenge is still running, go ahead and end it before continuing
+            if self.total_drop_msg_id:
+                logger.info("[Bounties Cog] Total drop challenge over. Stopping its counter.")
+                await counter_cog.stop_challenge(self.bounty_channel_id, self.total_drop_msg_id)
+                self.total_drop_msg_id = 0
                 await asyncio.sleep(1)  # small async buffer (optional but safer)
 
             single_bounty = next(self.single_bounty_generator)
+            self.single_bounties_served += 1
             single_task = single_bounty["Task"]
-            single_password = single_bounty["Password"]
+            # A sheet of numeric passwords is read as an int column
+            single_password = str(single_bounty["Password"])
             self.hunt_bot.bounty_password = single_password
-            is_double = not pd.isna(single_bounty.get("Double", None))
-            is_total = not pd.isna(single_bounty.get("Total Drop", None))
+            is_double = single_bounty.get("Double") is not None
+            is_total = single_bounty.get("Total Drop") is not None
 
             if not is_double:
                 logger.info("[Bounties Cog] Bounty is a single bounty")
@@ -222,9 +255,10 @@ class BountiesCog(commands.Cog):
             else:
                 logger.info("[Bounties Cog] Bounty is a double bounty")
                 double_bounty = next(self.double_bounty_generator)
+                self.double_bounties_served += 1
                 # Assumes there will never be two total drop challenges for a double
                 if not is_total:
-                    is_total = not pd.isna(double_bounty.get("Total Drop", None))
+                    is_total = double_bounty.get("Total Drop") is not None
 
                 self.bounty_description = double_bounty_template.substitute(
                     b1_task=single_task, b1_password=single_password, b2_task=double_bounty["Task"])
@@ -245,12 +279,10 @@ class BountiesCog(commands.Cog):
             await self.update_plugin_gdoc_passwords(password=single_password)
 
             if is_total:
-                logger.info("[Bounties Cog] Total drop challenge detected. Starting TotalItemCounter Cog.")
-                if isinstance(counter_cog, TotalBountyItemCounterCog):
-                    # There is a total item challenge, so we start the counter cog process
-                    await counter_cog.start_counter(start_msg_id=self.message_id, drop_channel_id=self.bounty_channel_id)
-                else:
-                    logger.error("[Bounties Cog] Tried to start counter but cog missing.")
+                logger.info("[Bounties Cog] Total drop challenge detected. Starting its counter.")
+                # There is a total item challenge, so we start counting drops after this message
+                await counter_cog.start_challenge(self.bounty_channel_id, self.message_id, name="bounty total drop")
+                self.total_drop_msg_id = self.message_id
 
         except StopIteration:
             logger.info("[Bounties Cog] No more bounties left. Stopping task.")
@@ -356,8 +388,8 @@ class BountiesCog(commands.Cog):
         plugin_spreadsheet_id = "1qqkjx4YjuQ9FIBDgAGzSpmoKcDow3yEa9lYFmc-JeDA"
         plugin_sheet_name = "Config"
         try:
-            success_cell = self.gdoc.write_cell(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
-                                                cell=bounty_pass_cell, value=password)
-            logger.info(f"[Bounties Cog] Single cell write success (B11): {success_cell}")
+            self.gdoc.queue_cell_write(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
+                                       cell=bounty_pass_cell, value=password, priority=RequestPriority.PASSWORD)
+            logger.info(f"[Bounties Cog] Bounty password write queued ({bounty_pass_cell})")
         except Exception as e:
             logger.error(f"[Bounties Cog] Error updating bounty password cell in RL Plugin GDoc", exc_info=e)
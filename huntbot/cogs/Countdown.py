@@ -1,5 +1,4 @@
-import pytz
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, timezone
 from discord.ext import commands, tasks
 from string import Template
 from huntbot.HuntBot import HuntBot
@@ -62,8 +61,7 @@ class CountdownCog(commands.Cog):
 
     @staticmethod
     def get_current_utc_time():
-        utc_timezone = pytz.utc
-        utc_time = datetime.now(utc_timezone)
+        utc_time = datetime.now(timezone.utc)
         return utc_time
 
     @tasks.loop(seconds=30)
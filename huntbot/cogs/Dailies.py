@@ -1,15 +1,16 @@
 import asyncio
 
 from discord.ext import commands, tasks
-import pandas as pd
 from string import Template
 from huntbot.HuntBot import HuntBot
+from huntbot.SheetStore import StoreTable
 from huntbot.exceptions import TableDataImportException, ConfigurationException
 from huntbot.GDoc import GDoc
+from huntbot.RequestScheduler import RequestPriority
 import logging
 import re
 import discord
-from huntbot.cogs.TotalDailyItemCounter import TotalDailyItemCounterCog
+from huntbot.cogs.ItemCounter import ItemCounterCog
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +59,9 @@ IMAGE_URL_PATTERN = re.compile(
 
 
 class DailiesCog(commands.Cog):
+    # Free-text columns of the task tables, kept as strings even when they look like numbers
+    TEXT_COLUMNS = frozenset({"Task", "Password"})
+
     def __init__(self, bot: commands.Bot, hunt_bot: HuntBot, gdoc: GDoc):
         self.bot = bot
         self.hunt_bot = hunt_bot
@@ -67,18 +71,23 @@ class DailiesCog(commands.Cog):
         self.daily_interval = 24
         self.single_daily_offset = 0
         self.double_daily_offset = 0
-        self.single_dailies_df = pd.DataFrame()
-        self.double_dailies_df = pd.DataFrame()
+        self.single_dailies = StoreTable("")
+        self.double_dailies = StoreTable("")
         self.daily_passwords: set[str] = set()
         self.single_dailies_table_name = "Single Dailies"
         self.double_dailies_table_name = "Double Dailies"
         self.daily_description = ""
         self.message_id = 0
+        # Start message of the running total-drop challenge, 0 if there isn't one
+        self.total_drop_msg_id = 0
         self.configured = False
         self.embed_message = None
 
         self.single_daily_generator = None
         self.double_daily_generator = None
+        # How many rows each generator has handed out, so they can be rebuilt when the tables change
+        self.single_dailies_served = 0
+        self.double_dailies_served = 0
         self.first_place = ""
         self.second_place = ""
 
@@ -93,9 +102,14 @@ class DailiesCog(commands.Cog):
             self.get_single_daily_offset()
             self.get_double_daily_offset()
 
-            self.single_daily_generator = self.yield_next_row(self.single_dailies_df, offset=self.single_daily_offset)
-            self.double_daily_generator = self.yield_next_row(self.double_dailies_df, offset=self.double_daily_offset)
+            self.single_daily_generator = self.yield_next_row(self.single_dailies, offset=self.single_daily_offset)
+            self.double_daily_generator = self.yield_next_row(self.double_dailies, offset=self.double_daily_offset)
             self.configured = True
+
+            # Pick up edits staff make to upcoming dailies mid-hunt
+            for table_name in (self.single_dailies_table_name, self.double_dailies_table_name):
+                self.hunt_bot.sheet_hub.subscribe(table_name, self.on_dailies_table_changed)
+
             self.start_dailies.start()
         except Exception as e:
             logger.error(f"[Dailies Cog] Initialization failed: {e}")
@@ -104,6 +118,8 @@ class DailiesCog(commands.Cog):
     async def cog_unload(self) -> None:
         """Called when the cog is unloaded to stop tasks."""
         logger.info("[Dailies Cog] Unloading cog.")
+        for table_name in (self.single_dailies_table_name, self.double_dailies_table_name):
+            self.hunt_bot.sheet_hub.unsubscribe(table_name, self.on_dailies_table_changed)
         if self.start_dailies.is_running():
             self.start_dailies.stop()
 
@@ -114,26 +130,24 @@ class DailiesCog(commands.Cog):
             raise ConfigurationException(config_key='DAILY_CHANNEL_ID')
 
     def save_daily_passwords(self) -> None:
-        if self.single_dailies_df.empty:
+        if self.single_dailies.empty:
             self.daily_passwords = set()
             return
 
-        self.daily_passwords = set(self.single_dailies_df["Password"].dropna())
+        self.daily_passwords = {str(password) for password in self.single_dailies["Password"] if password is not None}
         logger.info("[Dailies Cog] Loaded %d bounty passwords into memory", len(self.daily_passwords))
 
     def get_single_dailies(self) -> None:
-        self.single_dailies_df = GDoc.extract_table(df=self.hunt_bot.sheet_data, table_map=self.hunt_bot.table_map,
-                                                    table_name=self.single_dailies_table_name)
+        self.single_dailies = self.hunt_bot.get_typed_table(self.single_dailies_table_name, self.TEXT_COLUMNS)
 
-        if self.single_dailies_df.empty:
+        if self.single_dailies.empty:
             logger.error("[Dailies Cog] Error parsing single dailies data")
             raise TableDataImportException(table_name=self.single_dailies_table_name)
 
     def get_double_dailies(self) -> None:
-        self.double_dailies_df = GDoc.extract_table(df=self.hunt_bot.sheet_data, table_map=self.hunt_bot.table_map,
-                                                    table_name=self.double_dailies_table_name)
+        self.double_dailies = self.hunt_bot.get_typed_table(self.double_dailies_table_name, self.TEXT_COLUMNS)
 
-        if self.double_dailies_df.empty:
+        if self.double_dailies.empty:
             logger.error("[Dailies Cog] Error parsing double dailies data")
             raise TableDataImportException(table_name=self.double_dailies_table_name)
 
@@ -149,13 +163,31 @@ class DailiesCog(commands.Cog):
             logger.error("[Dailies Cog] No DOUBLE_DAILY_OFFSET data found in config")
             raise ConfigurationException(config_key='DOUBLE_DAILY_OFFSET')
 
+    async def on_dailies_table_changed(self, table_name: str, records: list) -> None:
+        """
+        Sheet hub callback for the daily tables. Rebuilds the daily generator from the updated table,
+        skipping the dailies that have already been served.
+        """
+        if table_name == self.single_dailies_table_name:
+            self.single_dailies = self.hunt_bot.get_typed_table(table_name, self.TEXT_COLUMNS)
+            self.save_daily_passwords()
+            self.single_daily_generator = self.yield_next_row(
+                self.single_dailies, offset=self.single_daily_offset + self.single_dailies_served)
+        elif table_name == self.double_dailies_table_name:
+            self.double_dailies = self.hunt_bot.get_typed_table(table_name, self.TEXT_COLUMNS)
+            self.double_daily_generator = self.yield_next_row(
+                self.double_dailies, offset=self.double_daily_offset + self.double_dailies_served)
+        else:
+            return
+
+        logger.info(f"[Dailies Cog] {table_name} changed, upcoming dailies updated")
+
     @staticmethod
-    def yield_next_row(df, offset: int = 0):
+    def yield_next_row(table: StoreTable, offset: int = 0):
         if offset < 0:
             raise ValueError("[Dailies Cog] Offset cannot be negative")
 
-        for _, row in df.iloc[offset:].iterrows():
-            yield row
+        yield from table.rows(offset)
 
     async def post_team_notif(self) -> None:
         """
@@ -196,24 +228,26 @@ class DailiesCog(commands.Cog):
 
         try:
             logger.info("[Dailies Cog] Attempting to serve daily")
-            counter_cog = self.bot.get_cog("TotalDailyItemCounterCog")
-
-            if not counter_cog:
-                logger.error("[Dailies Cog] TotalDailyItemCounterCog not loaded.")
+            counter_cog = self.bot.get_cog("ItemCounterCog")
+            if not isinstance(counter_cog, ItemCounterCog):
+                logger.error("[Dailies Cog] ItemCounterCog not loaded.")
                 return
 
-            # If process is still running, go ahead and end it before next continuing
-            if counter_cog.active:
-                logger.info("[Dailies Cog] Total drop challenge over. Stopping TotalDailyItemCounter Cog.")
-                await counter_cog.stop_counter()
+            # If a total drop challenge is still running, go ahead and end it before continuing
+            if self.total_drop_msg_id:
+                logger.info("[Dailies Cog] Total drop challenge over. Stopping its counter.")
+                await counter_cog.stop_challenge(self.daily_channel_id, self.total_drop_msg_id)
+                self.total_drop_msg_id = 0
                 await asyncio.sleep(1)  # small async buffer (optional but safer)
 
             single_daily = next(self.single_daily_generator)
+            self.single_dailies_served += 1
             single_task = single_daily["Task"]
-            single_password = single_daily["Password"]
+            # A sheet of numeric passwords is read as an int column
+            single_password = str(single_daily["Password"])
             self.hunt_bot.daily_password = single_password
-            is_double = not pd.isna(single_daily.get("Double", None))
-            is_total = not pd.isna(single_daily.get("Total Drop", None))
+            is_double = single_daily.get("Double") is not None
+            is_total = single_daily.get("Total Drop") is not None
 
             if not is_double:
                 logger.info("[Dailies Cog] Serving single daily")
@@ -221,10 +255,11 @@ class DailiesCog(commands.Cog):
             else:
                 logger.info("[Dailies Cog] Serving double daily")
                 double_daily = next(self.double_daily_generator)
+                self.double_dailies_served += 1
 
                 # Assumes there will never be two total drop challenges for a double
                 if not is_total:
-                    is_total = not pd.isna(double_daily.get("Total Drop", None))
+                    is_total = double_daily.get("Total Drop") is not None
 
                 self.daily_description = double_daily_template.substitute(b1_task=single_task,
                                                                           b1_password=single_password,
@@ -245,12 +280,10 @@ class DailiesCog(commands.Cog):
             await self.update_plugin_gdoc_passwords(password=single_password)
 
             if is_total:
-                logger.info("[Dailies Cog] Total drop challenge detected. Starting TotalItemCounter Cog.")
-                if isinstance(counter_cog, TotalDailyItemCounterCog):
-                    # There is a total item challenge, so we start the counter cog process
-                    await counter_cog.start_counter(start_msg_id=self.message_id, drop_channel_id=self.daily_channel_id)
-                else:
-                    logger.error("[Dailies Cog] Tried to start counter but cog missing.")
+                logger.info("[Dailies Cog] Total drop challenge detected. Starting its counter.")
+                # There is a total item challenge, so we start counting drops after this message
+                await counter_cog.start_challenge(self.daily_channel_id, self.message_id, name="daily total drop")
+                self.total_drop_msg_id = self.message_id
 
         except StopIteration:
             logger.info("[Dailies Cog] No more dailies left. Stopping task")
@@ -356,8 +389,8 @@ class DailiesCog(commands.Cog):
         plugin_spreadsheet_id = "1qqkjx4YjuQ9FIBDgAGzSpmoKcDow3yEa9lYFmc-JeDA"
         plugin_sheet_name = "Config"
         try:
-            success_cell = self.gdoc.write_cell(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
-                                                cell=daily_pass_cell, value=password)
-            logger.info(f"[Dailies Cog] Single cell write success (B11): {success_cell}")
+            self.gdoc.queue_cell_write(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
+                                       cell=daily_pass_cell, value=password, priority=RequestPriority.PASSWORD)
+            logger.info(f"[Dailies Cog] Daily password write queued ({daily_pass_cell})")
         except Exception as e:
             logger.error(f"[Dailies Cog] Error updating daily password cell in RL Plugin GDoc", exc_info=e)
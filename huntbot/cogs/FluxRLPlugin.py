@@ -2,7 +2,6 @@ from discord.ext import commands, tasks
 from huntbot.HuntBot import HuntBot
 from huntbot.exceptions import TableDataImportException, ConfigurationException
 import logging
-import pandas as pd
 from huntbot.GDoc import GDoc
 
 logger = logging.getLogger(__name__)
@@ -21,7 +20,7 @@ class FluxRLPluginCog(commands.Cog):
         # self.monster_whitelist_fp = "../conf/monster_whitelist.json"
         # self.item_whitelist_fp = "../conf/item_whitelist.json"
         self.flux_rl_plugin_sheet_id = ""
-        self.sheet_data = pd.DataFrame()
+        self.sheet_data = None
         self.sheet_name = "Hunt"
         self.config_table_name = "Hunt Config"
         self.score_table_name = "Current Score"
@@ -125,7 +124,7 @@ class FluxRLPluginCog(commands.Cog):
                 return
 
             try:
-                print("PUT YOUR PLUGIN LOGIC LOOP HERE")
+                logger.debug("[FluxRLPlugin Cog] PUT YOUR PLUGIN LOGIC LOOP HERE")
             except TableDataImportException as e:
                 logger.error("[FluxRLPlugin Cog] <PUT SOMETHING HERE>", exc_info=e)
         except Exception as e:
@@ -0,0 +1,495 @@
+from huntbot.HuntBot import HuntBot
+from huntbot.StickyMessage import StickyMessage
+from typing import Optional
+import asyncio
+import logging
+from discord.ext import commands
+from string import Template
+import discord
+
+logger = logging.getLogger(__name__)
+
+counting_complete_template = Template("""
+Hands off your keyboards!!!
+The challenge has ended and no further submissions will be accepted!
+
+Final Tally:
+$firstplace_team_name has won with $firstplace_total items!
+$secondplace_team_name has come in second with $secondplace_total items!
+A total of $total_items items were acquired for this challenge!
+""")
+
+sticky_msg_template = Template("""
+$team_one_name team: $team_one_total items
+$team_two_name team: $team_two_total items
+$leading_team_name leads with $leading_team_total items!
+The last valid drop counted for the challenge is here: $message_url
+""")
+
+# Emoji staff react with: a drop only counts with both ✅ (valid) and ⬆️ (total) and without ❌ (invalid)
+VALID_SUBMISSION_EMOJI = "✅"
+INVALID_SUBMISSION_EMOJI = "❌"
+TOTAL_ITEM_EMOJI = "⬆️"
+
+
+class TrackedMessage:
+    """Counting state of one message in a drop channel."""
+    __slots__ = ("message_id", "team_name", "reactions")
+
+    def __init__(self, message_id: int, team_name: Optional[str]) -> None:
+        self.message_id = message_id
+        # Team of the author, None if they aren't on a team
+        self.team_name = team_name
+        # {emoji: number of users who reacted with it}
+        self.reactions: dict[str, int] = {}
+
+    def is_counted(self) -> bool:
+        reactions = self.reactions
+        return (self.team_name is not None and reactions.get(INVALID_SUBMISSION_EMOJI, 0) == 0
+                and reactions.get(VALID_SUBMISSION_EMOJI, 0) > 0 and reactions.get(TOTAL_ITEM_EMOJI, 0) > 0)
+
+
+class Challenge:
+    """
+    Totals of one item-total challenge: the drops posted in a channel after the challenge's start
+    message. Only counts; reading Discord and posting is left to ItemCounterCog.
+    """
+
+    def __init__(self, channel_id: int, start_msg_id: int, hunt_bot: HuntBot, name: str = "") -> None:
+        self.channel_id = channel_id
+        self.start_msg_id = start_msg_id
+        self.hunt_bot = hunt_bot
+        # For logs, e.g. "bounty" or "daily"
+        self.name = name or "challenge"
+        # Every message of the challenge and the ones currently counted: {message_id: TrackedMessage}
+        self.messages: dict[int, TrackedMessage] = {}
+        self.counted_msg_ids: set[int] = set()
+        self.team_totals: dict[str, int] = {}
+        self.total_items = 0
+        self.last_valid_drop_msg_id = 0
+        self.winning_team_name = ""
+        self.losing_team_name = ""
+        self.sticky_message_string = ""
+        # Totals message kept at the bottom of the channel, None if the channel wasn't found
+        self.sticky: Optional[StickyMessage] = None
+        self.reconciling = False
+        # Messages that had events while reconciling, re-read if the last scan may have missed them
+        self.missed_msg_ids: set[int] = set()
+        self.reconcile_lock = asyncio.Lock()
+        # Set once the challenge has ended, after which a later challenge in the channel takes over
+        self.ended = False
+        self.reset_totals()
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return self.channel_id, self.start_msg_id
+
+    def reset_totals(self) -> None:
+        self.messages = {}
+        self.team_totals = {self.hunt_bot.team_one_name: 0, self.hunt_bot.team_two_name: 0}
+        self.counted_msg_ids = set()
+        self.total_items = 0
+        self.last_valid_drop_msg_id = 0
+
+    def recount(self, tracked: TrackedMessage, counted_before: bool) -> None:
+        """Moves a message in or out of the totals after its state changed."""
+        counted = tracked.message_id in self.messages and tracked.is_counted()
+        if counted == counted_before:
+            return
+
+        change = 1 if counted else -1
+        self.team_totals[tracked.team_name] = self.team_totals.get(tracked.team_name, 0) + change
+        self.total_items += change
+        if counted:
+            self.counted_msg_ids.add(tracked.message_id)
+            self.last_valid_drop_msg_id = max(self.last_valid_drop_msg_id, tracked.message_id)
+        else:
+            self.counted_msg_ids.discard(tracked.message_id)
+            if tracked.message_id == self.last_valid_drop_msg_id:
+                self.last_valid_drop_msg_id = max(self.counted_msg_ids, default=0)
+
+        self.determine_team_placements()
+        self.update_sticky_msg_string()
+
+    def add_message(self, tracked: TrackedMessage) -> TrackedMessage:
+        """Starts tracking a message. A message that is already tracked keeps its entry, which is returned."""
+        existing = self.messages.get(tracked.message_id)
+        if existing is not None:
+            return existing
+        self.messages[tracked.message_id] = tracked
+        self.recount(tracked, counted_before=False)
+        return tracked
+
+    def change_reactions(self, tracked: TrackedMessage, reactions: dict[str, int]) -> None:
+        counted_before = tracked.message_id in self.counted_msg_ids
+        tracked.reactions = reactions
+        self.recount(tracked, counted_before)
+
+    def forget_message(self, message_id: int) -> None:
+        tracked = self.messages.pop(message_id, None)
+        if tracked:
+            self.recount(tracked, counted_before=message_id in self.counted_msg_ids)
+
+    def determine_team_placements(self) -> None:
+        t1 = self.team_totals.get(self.hunt_bot.team_one_name, 0)
+        t2 = self.team_totals.get(self.hunt_bot.team_two_name, 0)
+        if t1 > t2:
+            self.winning_team_name = self.hunt_bot.team_one_name
+            self.losing_team_name = self.hunt_bot.team_two_name
+        elif t2 > t1:
+            self.winning_team_name = self.hunt_bot.team_two_name
+            self.losing_team_name = self.hunt_bot.team_one_name
+        else:
+            self.winning_team_name = "Tie"
+            self.losing_team_name = "Tie"
+
+    def update_sticky_msg_string(self) -> None:
+        team1_total = self.team_totals.get(self.hunt_bot.team_one_name, 0)
+        team2_total = self.team_totals.get(self.hunt_bot.team_two_name, 0)
+        leading_team_total = max(team1_total, team2_total)
+        if self.winning_team_name == "Tie":
+            leading_team_name = "Tie"
+        else:
+            leading_team_name = self.winning_team_name
+
+        self.sticky_message_string = sticky_msg_template.substitute(
+            team_one_name=self.hunt_bot.team_one_name,
+            team_one_total=team1_total,
+            team_two_name=self.hunt_bot.team_two_name,
+            team_two_total=team2_total,
+            leading_team_name=leading_team_name,
+            leading_team_total=leading_team_total,
+            message_url=f"https://discord.com/channels/{self.hunt_bot.guild_id}/{self.channel_id}/{self.last_valid_drop_msg_id}" if self.last_valid_drop_msg_id else "N/A"
+        )
+
+    def counting_complete_msg(self) -> str:
+        return counting_complete_template.substitute(
+            firstplace_team_name=self.winning_team_name,
+            firstplace_total=self.team_totals.get(self.winning_team_name, 0),
+            secondplace_team_name=self.losing_team_name,
+            secondplace_total=self.team_totals.get(self.losing_team_name, 0),
+            total_items=self.total_items
+        )
+
+
+class ItemCounterCog(commands.Cog):
+    """
+    Tallies total-drop challenges: every drop posted in a challenge's channel after its start
+    message that staff mark with both ✅ and ⬆️ (and not ❌) counts one item for the poster's team.
+
+    Any number of challenges can run at once, keyed by (channel ID, start message ID), e.g. a
+    bounty and a daily total-drop challenge side by side. One set of gateway listeners routes
+    every message, reaction and delete to the challenge it belongs to: the latest running one in
+    the channel that started before the message. Totals are kept incrementally from those events;
+    a challenge's channel history is only scanned when it starts and after a gateway resume or
+    reconnect.
+    Each challenge keeps its totals at the bottom of its channel with a StickyMessage.
+    """
+    # Full scans to retry when events arrive mid-scan, before settling for the last result
+    MAX_RECONCILE_PASSES = 3
+    # Seconds between edits of a challenge's totals sticky
+    STICKY_INTERVAL = 3.0
+
+    def __init__(self, discord_bot: commands.Bot, hunt_bot: HuntBot):
+        self.discord_bot = discord_bot
+        self.hunt_bot = hunt_bot
+        self.challenges: dict[tuple[int, int], Challenge] = {}
+        # Running challenges per channel, oldest start message first: {channel_id: [Challenge]}
+        self.channel_challenges: dict[int, list[Challenge]] = {}
+
+        # Metrics
+        self.events_applied = 0
+        self.reconciliations = 0
+
+    async def cog_load(self) -> None:
+        logger.info("[ItemCounter Cog] Loading cog and initializing.")
+
+    async def cog_unload(self) -> None:
+        logger.info("[ItemCounter Cog] Unloading cog.")
+        for challenge in self.challenges.values():
+            if challenge.sticky:
+                challenge.sticky.close()
+
+    def get_challenge(self, channel_id: int, start_msg_id: int) -> Optional[Challenge]:
+        return self.challenges.get((channel_id, start_msg_id))
+
+    def challenge_for(self, channel_id: int, message_id: int) -> Optional[Challenge]:
+        """The running challenge a message in channel_id belongs to, None if it isn't part of one."""
+        for challenge in reversed(self.channel_challenges.get(channel_id, ())):
+            if message_id > challenge.start_msg_id:
+                return challenge
+        return None
+
+    async def resolve_author_team(self, author) -> Optional[str]:
+        """Team of a message author from the shared member index, fetching them only if it hasn't seen them."""
+        guild = self.discord_bot.get_guild(self.hunt_bot.guild_id)
+        info = await self.hunt_bot.member_index.resolve(guild, author.id, member=author)
+        return info.team_name if info else None
+
+    async def track_message(self, message: discord.Message) -> Optional[TrackedMessage]:
+        """Tracking state of a message with its current reactions, None for the bot's own messages."""
+        if message.author.id == self.discord_bot.user.id:
+            return None
+
+        tracked = TrackedMessage(message.id, await self.resolve_author_team(message.author))
+        for reaction in message.reactions:
+            tracked.reactions[str(reaction.emoji)] = reaction.count
+        return tracked
+
+    @staticmethod
+    def defer_if_reconciling(challenge: Challenge, message_id: int) -> bool:
+        """True while the challenge is being reconciled, the message is picked up by the reconcile instead."""
+        if challenge.reconciling:
+            challenge.missed_msg_ids.add(message_id)
+            return True
+        return False
+
+    def accept_event(self, challenge: Challenge, message_id: int) -> bool:
+        if self.defer_if_reconciling(challenge, message_id):
+            return False
+        self.events_applied += 1
+        return True
+
+    @staticmethod
+    def store_message(challenge: Challenge, tracked: TrackedMessage) -> None:
+        """Adds a message read from Discord, or brings the tracked entry up to the reactions it was read with."""
+        existing = challenge.add_message(tracked)
+        if existing is not tracked:
+            challenge.change_reactions(existing, tracked.reactions)
+
+    async def reread_message(self, challenge: Challenge, drop_channel, message_id: int) -> None:
+        """Reads one message again and replaces what the challenge knows about it."""
+        try:
+            message = await drop_channel.fetch_message(message_id)
+        except discord.NotFound:
+            challenge.forget_message(message_id)
+            return
+        except discord.HTTPException as e:
+            logger.warning(f"[Counter] Could not re-read message {message_id} of {challenge.name}: {e}")
+            return
+
+        tracked = await self.track_message(message)
+        if tracked:
+            self.store_message(challenge, tracked)
+
+    @staticmethod
+    def refresh_sticky(challenge: Challenge) -> None:
+        """Hands the current totals to the challenge's sticky, once there is something to show."""
+        if challenge.sticky and challenge.messages:
+            challenge.sticky.update(challenge.sticky_message_string)
+
+    async def reconcile(self, challenge: Challenge) -> None:
+        """
+        Rebuilds a challenge's per-message state and totals from a scan of the channel history
+        after its start message. Events that arrive mid-scan make it scan again; if they still
+        arrive during the last pass, the messages they were for are re-read one by one.
+        """
+        drop_channel = self.discord_bot.get_channel(challenge.channel_id)
+        if drop_channel is None:
+            logger.warning(f"[Counter] Drop channel {challenge.channel_id} not found!")
+            return
+
+        # Messages after a later challenge's start in the same channel belong to that challenge
+        later_start = min((c.start_msg_id for c in self.channel_challenges.get(challenge.channel_id, ())
+                           if c.start_msg_id > challenge.start_msg_id), default=None)
+        async with challenge.reconcile_lock:
+            challenge.reconciling = True
+            try:
+                for _ in range(self.MAX_RECONCILE_PASSES):
+                    challenge.missed_msg_ids = set()
+                    challenge.reset_totals()
+                    # Fetch all messages after the start message, oldest first
+                    async for message in drop_channel.history(
+                            after=discord.Object(id=challenge.start_msg_id),
+                            before=discord.Object(id=later_start) if later_start else None, oldest_first=True):
+                        if challenge.sticky:
+                            challenge.sticky.observe_message(message.id)
+                        tracked = await self.track_message(message)
+                        if tracked:
+                            challenge.add_message(tracked)
+                    if not challenge.missed_msg_ids:
+                        break
+                # Events kept coming, the last scan may have read some messages before their change
+                while challenge.missed_msg_ids:
+                    await self.reread_message(challenge, drop_channel, challenge.missed_msg_ids.pop())
+            finally:
+                challenge.reconciling = False
+                challenge.missed_msg_ids = set()
+
+        self.reconciliations += 1
+        challenge.determine_team_placements()
+        challenge.update_sticky_msg_string()
+        self.refresh_sticky(challenge)
+        logger.info(f"[Counter] Reconciled {challenge.name} in channel {challenge.channel_id}: "
+                    f"{len(challenge.messages)} messages, {challenge.total_items} items counted")
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        challenge = self.challenge_for(message.channel.id, message.id)
+        if challenge is None:
+            return
+        if challenge.sticky:
+            # Every message counts for where the bottom of the channel is, the sticky itself too
+            challenge.sticky.observe_message(message.id)
+        if not self.accept_event(challenge, message.id):
+            return
+        tracked = await self.track_message(message)
+        if tracked is None or self.defer_if_reconciling(challenge, message.id):
+            return
+        # A reaction handled while the author was resolved may have added the message already
+        challenge.add_message(tracked)
+        self.refresh_sticky(challenge)
+
+    async def on_reaction_change(self, payload, change: int) -> None:
+        challenge = self.challenge_for(payload.channel_id, payload.message_id)
+        if challenge is None or not self.accept_event(challenge, payload.message_id):
+            return
+
+        tracked = challenge.messages.get(payload.message_id)
+        if tracked is None:
+            # Posted while events weren't delivered, start tracking it from its current state
+            drop_channel = self.discord_bot.get_channel(challenge.channel_id)
+            if drop_channel is None:
+                return
+            try:
+                tracked = await self.track_message(await drop_channel.fetch_message(payload.message_id))
+            except discord.NotFound:
+                return
+            if tracked is None or self.defer_if_reconciling(challenge, payload.message_id):
+                return
+            # The fetched reactions are newer than those of an entry on_message added meanwhile
+            self.store_message(challenge, tracked)
+            self.refresh_sticky(challenge)
+            return
+
+        emoji = str(payload.emoji)
+        reactions = dict(tracked.reactions)
+        reactions[emoji] = max(0, reactions.get(emoji, 0) + change)
+        challenge.change_reactions(tracked, reactions)
+        self.refresh_sticky(challenge)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
+        await self.on_reaction_change(payload, 1)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent) -> None:
+        await self.on_reaction_change(payload, -1)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear(self, payload: discord.RawReactionClearEvent) -> None:
+        challenge = self.challenge_for(payload.channel_id, payload.message_id)
+        if challenge is None or not self.accept_event(challenge, payload.message_id):
+            return
+        tracked = challenge.messages.get(payload.message_id)
+        if tracked:
+            challenge.change_reactions(tracked, {})
+            self.refresh_sticky(challenge)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload: discord.RawReactionClearEmojiEvent) -> None:
+        challenge = self.challenge_for(payload.channel_id, payload.message_id)
+        if challenge is None or not self.accept_event(challenge, payload.message_id):
+            return
+        tracked = challenge.messages.get(payload.message_id)
+        if tracked:
+            reactions = dict(tracked.reactions)
+            reactions.pop(str(payload.emoji), None)
+            challenge.change_reactions(tracked, reactions)
+            self.refresh_sticky(challenge)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        challenge = self.challenge_for(payload.channel_id, payload.message_id)
+        if challenge is None:
+            return
+        if challenge.sticky:
+            challenge.sticky.observe_delete(payload.message_id)
+        if not self.accept_event(challenge, payload.message_id):
+            return
+        challenge.forget_message(payload.message_id)
+        self.refresh_sticky(challenge)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        for message_id in payload.message_ids:
+            challenge = self.challenge_for(payload.channel_id, message_id)
+            if challenge is None:
+                continue
+            if challenge.sticky:
+                challenge.sticky.observe_delete(message_id)
+            if self.accept_event(challenge, message_id):
+                challenge.forget_message(message_id)
+                self.refresh_sticky(challenge)
+
+    async def reconcile_all(self, reason: str) -> None:
+        # Events sent while the gateway was disconnected are lost, rebuild from the channels
+        if self.challenges:
+            logger.info(f"[Counter] {reason}, reconciling totals with the channels")
+        for challenge in list(self.challenges.values()):
+            await self.reconcile(challenge)
+
+    @commands.Cog.listener()
+    async def on_resumed(self) -> None:
+        await self.reconcile_all("Gateway resumed")
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        # Also sent after a reconnect that couldn't resume the session, nothing missed is replayed then
+        await self.reconcile_all("Gateway connected")
+
+    async def start_challenge(self, channel_id: int, start_msg_id: int, name: str = "") -> Challenge:
+        """
+        Starts counting the drops posted in a channel after start_msg_id. Starting a challenge that
+        is already running just returns it.
+
+        Args:
+            channel_id (int): Channel the drops are posted in.
+            start_msg_id (int): The message announcing the challenge, only later messages count.
+            name (str): What the challenge is for, used in logs.
+
+        Returns:
+            Challenge: The running challenge.
+        """
+        challenge = self.get_challenge(channel_id, start_msg_id)
+        if challenge is not None:
+            return challenge
+
+        challenge = Challenge(channel_id, start_msg_id, self.hunt_bot, name)
+        drop_channel = self.discord_bot.get_channel(channel_id)
+        if drop_channel is not None:
+            challenge.sticky = StickyMessage(drop_channel, min_interval=self.STICKY_INTERVAL,
+                                             name=f"{challenge.name} totals")
+        self.challenges[challenge.key] = challenge
+        channel_challenges = self.channel_challenges.setdefault(channel_id, [])
+        channel_challenges.append(challenge)
+        channel_challenges.sort(key=lambda c: c.start_msg_id)
+        # Drops after the new start message now count for the new challenge
+        for earlier in channel_challenges:
+            if earlier.start_msg_id < start_msg_id:
+                for message_id in [m for m in earlier.messages if m > start_msg_id]:
+                    earlier.forget_message(message_id)
+        logger.info(f"[Counter] Counter started for {challenge.name} in channel {channel_id}")
+        await self.reconcile(challenge)
+        return challenge
+
+    async def stop_challenge(self, channel_id: int, start_msg_id: int) -> None:
+        """Stops a challenge and posts its final tally to its channel."""
+        challenge = self.challenges.pop((channel_id, start_msg_id), None)
+        if challenge is None:
+            return
+
+        challenge.ended = True
+        if challenge.sticky:
+            challenge.sticky.close()
+        channel_challenges = self.channel_challenges.get(channel_id, [])
+        channel_challenges.remove(challenge)
+        if not channel_challenges:
+            self.channel_challenges.pop(channel_id, None)
+
+        try:
+            drop_channel = self.discord_bot.get_channel(channel_id)
+            await drop_channel.send(challenge.counting_complete_msg())
+        except Exception as e:
+            logger.error("[ItemCounter Cog] Error posting counting complete message.", exc_info=e)
+        logger.info(f"[Counter] Counter stopped for {challenge.name} in channel {channel_id}")
@@ -4,7 +4,6 @@ from huntbot.exceptions import ConfigurationException
 import logging
 import random
 import re
-import yaml
 from typing import Union
 import time
 
@@ -67,6 +66,8 @@ class MemoriesCog(commands.Cog):
         
         Logs an error if no memories are found.
         """
+        import yaml
+
         with open(self.memories_filepath, 'r') as file:
             data = yaml.safe_load(file)
 
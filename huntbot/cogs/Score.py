@@ -1,9 +1,11 @@
+import asyncio
 import discord
 from discord.ext import commands, tasks
 from huntbot.HuntBot import HuntBot
-import pandas as pd
 from huntbot.exceptions import TableDataImportException, ConfigurationException
 from huntbot.GDoc import GDoc
+from huntbot.RequestScheduler import RequestPriority
+from huntbot.SheetStore import StoreTable
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,6 +41,8 @@ class ScoreCog(commands.Cog):
         self.team2_points = 0
         self.score_table_name = "Current Score"
         self.message = None
+        # Held while posting, so the loop and a table change can't both send the first message
+        self.post_lock = asyncio.Lock()
         self.lead_message = ""
         self.score_message = ""
 
@@ -53,12 +57,16 @@ class ScoreCog(commands.Cog):
             logger.error(f"[Score Cog] Failed configuration: {e}")
             return
 
+        # The sheet hub pushes score table changes, the loop only posts the initial message
+        self.hunt_bot.sheet_hub.subscribe(self.score_table_name, self.on_score_table_changed)
+
         # Start loops
         self.start_scores.start()
 
     async def cog_unload(self) -> None:
         """Cleans up background tasks on cog unload."""
         logger.info("[Score Cog] Unloading Score Cog.")
+        self.hunt_bot.sheet_hub.unsubscribe(self.score_table_name, self.on_score_table_changed)
         if self.start_scores.is_running():
             self.start_scores.stop()
 
@@ -78,38 +86,58 @@ class ScoreCog(commands.Cog):
             logger.error("[Score Cog] No POINTS_CHANNEL_ID found in configuration.")
             raise ConfigurationException(config_key='POINTS_CHANNEL_ID')
 
-    def get_score(self) -> None:
+    def get_score(self, score_table: StoreTable = None) -> None:
         """
         Retrieve and parse the score data from the HuntBot score table.
 
+        Args:
+            score_table (StoreTable): Typed score table, read from the current sheet snapshot if not given.
+
         Raises:
-            TableDataImportException: If the score table data is empty or unavailable.
+            TableDataImportException: If the score table data is empty, unavailable or the points aren't numbers.
 
         Returns:
             None
         """
         logger.info("[Score Cog] Attempting to fetch score.")
         # Use table map to find score table and pull data
-        score_df = GDoc.extract_table(df=self.hunt_bot.sheet_data, table_map=self.hunt_bot.table_map,
-                                      table_name=self.score_table_name)
+        if score_table is None:
+            score_table = self.hunt_bot.get_typed_table(self.score_table_name)
 
-        if score_df.empty:
+        if not score_table:
             logger.error("[Score Cog] Error retrieving score data from GDoc table.")
             raise TableDataImportException(table_name=self.score_table_name)
 
-        score_dict = pd.Series(score_df['Total Points'].values, index=score_df['Team Name']).to_dict()
+        try:
+            score_dict = {row.get('Team Name'): self.parse_points(row.get('Total Points')) for row in score_table}
+        except ValueError:
+            logger.error("[Score Cog] Score table has points that aren't numbers.")
+            raise TableDataImportException(table_name=self.score_table_name)
+
         self.team1_points = score_dict.get(f"Team {self.hunt_bot.team_one_name}", 0)
         self.team2_points = score_dict.get(f"Team {self.hunt_bot.team_two_name}", 0)
 
+    @staticmethod
+    def parse_points(value) -> int | float:
+        """Points from a typed table cell; numeric columns are already numbers, an empty cell is 0."""
+        if value is None or value == "":
+            return 0
+        if isinstance(value, (int, float)):
+            return value
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+
     def determine_lead(self) -> None:
         # Calculate lead
         if self.team1_points > self.team2_points:
             lead_team = self.hunt_bot.team_one_name
-            lead_points = int(self.team1_points) - int(self.team2_points)
+            lead_points = self.team1_points - self.team2_points
             self.lead_message = f"Team {lead_team} is ahead by {lead_points} point{'s' if lead_points != 1 else ''}!"
         elif self.team2_points > self.team1_points:
             lead_team = self.hunt_bot.team_two_name
-            lead_points = int(self.team2_points) - int(self.team1_points)
+            lead_points = self.team2_points - self.team1_points
             self.lead_message = f"Team {lead_team} is ahead by {lead_points} point{'s' if lead_points != 1 else ''}!"
         else:
             self.lead_message = "It's tied!"
@@ -121,43 +149,44 @@ class ScoreCog(commands.Cog):
         plugin_sheet_name = "Config"
 
         try:
-            t1_written = self.gdoc.write_cell(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
-                                              cell=team_1_score_cell, value=self.team1_points)
-
-            t2_written = self.gdoc.write_cell(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
-                                              cell=team_2_score_cell, value=self.team2_points)
-            if t1_written and t2_written:
-                logger.info(
-                    f"[Score Cog] Single cell write success..."
-                    f"Team 1 Points:{self.team1_points}"
-                    f"Team 2 Points:{self.team2_points}")
-            else:
-                logger.error(f"[Score Cog] Error writing scores to RuneLite Plugin GDoc..."
-                             f"Team 1 Write: {t1_written}"
-                             f"Team 2 Write: {t2_written}")
+            # Both cells go out together in the next batched flush
+            self.gdoc.queue_cell_write(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
+                                       cell=team_1_score_cell, value=self.team1_points,
+                                       priority=RequestPriority.SCORE)
+            self.gdoc.queue_cell_write(spreadsheet_id=plugin_spreadsheet_id, sheet_name=plugin_sheet_name,
+                                       cell=team_2_score_cell, value=self.team2_points,
+                                       priority=RequestPriority.SCORE)
+            logger.info(
+                f"[Score Cog] Score writes queued..."
+                f"Team 1 Points:{self.team1_points}"
+                f"Team 2 Points:{self.team2_points}")
         except Exception as e:
             logger.error(f"[Score Cog] Error updating team scores in RL Plugin GDoc", exc_info=e)
 
-    @tasks.loop(seconds=10)
-    async def start_scores(self) -> None:
-        """
-        Asynchronously update the score on Discord every 10 seconds.
-
-        Returns:
-            None
-        """
+    async def on_score_table_changed(self, table_name: str, records: list) -> None:
+        """Sheet hub callback, runs whenever the score table's contents change."""
         if not self.configured:
-            logger.warning("[Score Cog] Cog not properly configured. Skipping score update.")
             return
 
-        try:
+        # Read the typed table, the records the hub delivers are plain cell text
+        await self.post_score(self.hunt_bot.get_typed_table(table_name))
+
+    async def post_score(self, score_table: StoreTable = None) -> None:
+        """
+        Posts the score message, or edits it if it has already been posted, and mirrors the
+        score to the RL plugin sheet.
+
+        Args:
+            score_table (StoreTable): Typed score table, read from the current sheet snapshot if not given.
+        """
+        async with self.post_lock:
             channel = self.discord_bot.get_channel(self.score_channel_id)
             if not channel:
                 logger.warning("Score channel not found.")
                 return
 
             try:
-                self.get_score()
+                self.get_score(score_table)
             except TableDataImportException as e:
                 logger.error("[Score Cog] Failed to update score, skipping update cycle.", exc_info=e)
                 return
@@ -180,6 +209,25 @@ class ScoreCog(commands.Cog):
                 self.message = await channel.send(self.score_message)
                 await self.update_plugin_gdoc_scores()
 
+    @tasks.loop(seconds=10)
+    async def start_scores(self) -> None:
+        """
+        Asynchronously post the score message every 10 seconds until it exists. Later score
+        changes are pushed by the sheet hub.
+
+        Returns:
+            None
+        """
+        if not self.configured:
+            logger.warning("[Score Cog] Cog not properly configured. Skipping score update.")
+            return
+
+        # The score message is kept up to date by on_score_table_changed
+        if self.message:
+            return
+
+        try:
+            await self.post_score()
         except Exception as e:
             logger.error("[Score Cog] Error hit in score loop.", exc_info=e)
 
@@ -1,14 +1,89 @@
+from collections import OrderedDict
+from typing import Optional
 from discord.ext import commands
-from discord import RawReactionActionEvent
+from discord import Message, NotFound, Object, RawMessageDeleteEvent, RawMessageUpdateEvent, RawReactionActionEvent, \
+    RawReactionClearEvent, RawReactionClearEmojiEvent
 from huntbot.HuntBot import HuntBot
+from huntbot.MemberTeamIndex import MemberInfo
 from huntbot.exceptions import ConfigurationException
 import logging
 
 logger = logging.getLogger(__name__)
 
+STAR_EMOJIS = ("⭐", "🤔")
+
+
+class CachedMessage:
+    """What the starboard needs from a drop channel message: its text, link and star reaction counts."""
+    __slots__ = ("message_id", "content", "jump_url", "star_counts")
+
+    def __init__(self, message_id: int, content: str, jump_url: str, star_counts: dict[str, int]) -> None:
+        self.message_id = message_id
+        # Message text followed by its attachment URLs
+        self.content = content
+        self.jump_url = jump_url
+        self.star_counts = star_counts
+
+    @classmethod
+    def from_message(cls, message: Message) -> "CachedMessage":
+        content = message.content
+        if message.attachments:
+            attachments = "\n".join([attachment.url for attachment in message.attachments])
+            content += f"\n{attachments}"
+        star_counts = {str(r.emoji): r.count for r in message.reactions if str(r.emoji) in STAR_EMOJIS}
+        return cls(message.id, content, message.jump_url, star_counts)
+
+    @property
+    def starred(self) -> bool:
+        return any(count > 0 for count in self.star_counts.values())
+
+
+class MessageCache:
+    """Bounded LRU cache of drop channel messages: {message_id: CachedMessage}."""
+
+    def __init__(self, max_size: int = 1000) -> None:
+        self.max_size = max_size
+        self.messages: OrderedDict[int, CachedMessage] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def get(self, message_id: int) -> Optional[CachedMessage]:
+        cached = self.messages.get(message_id)
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.messages.move_to_end(message_id)
+        return cached
+
+    def put(self, cached: CachedMessage) -> None:
+        self.messages[cached.message_id] = cached
+        self.messages.move_to_end(cached.message_id)
+        while len(self.messages) > self.max_size:
+            self.messages.popitem(last=False)
+
+    def pop(self, message_id: int) -> None:
+        self.messages.pop(message_id, None)
+
+    def clear(self) -> None:
+        self.messages.clear()
+
 
 class StarBoardCog(commands.Cog):
-    """Cog for managing a starboard that mirrors starred messages from specific channels."""
+    """
+    Cog for managing a starboard that mirrors starred messages from specific channels.
+
+    Reactions are handled without reading from Discord where possible: the reacting member's roles
+    come from payload.member and the shared member index, and drop channel messages are kept in a
+    bounded LRU cache filled from on_message, with their star counts kept current by the reaction
+    events. Only messages missing from the cache are fetched. REST calls made are counted per
+    endpoint in rest_calls.
+    """
+    # Drop channel messages kept for starring, the oldest are evicted first
+    MESSAGE_CACHE_SIZE = 1000
 
     def __init__(self, discord_bot: commands.Bot, hunt_bot: HuntBot):
         """
@@ -25,6 +100,11 @@ class StarBoardCog(commands.Cog):
         self.team2_drop_channel_id: int = 0
         self.configured: bool = False
         self.starred_messages: dict[int, int] = {}
+        self.message_cache = MessageCache(self.MESSAGE_CACHE_SIZE)
+
+        # Metrics
+        self.reaction_events = 0
+        self.rest_calls: dict[str, int] = {}
 
     async def cog_load(self) -> None:
         """Called when the cog is loaded."""
@@ -43,6 +123,7 @@ class StarBoardCog(commands.Cog):
         """Called when the cog is unloaded."""
         logger.info("[Starboard Cog] Unloading cog...")
         self.starred_messages.clear()
+        self.message_cache.clear()
         self.configured = False
 
     def get_starboard_channel_id(self) -> None:
@@ -90,54 +171,113 @@ class StarBoardCog(commands.Cog):
             logger.error("[Starboard Cog] No TEAM_2_DROP_CHANNEL_ID found.")
             raise ConfigurationException(config_key='TEAM_2_DROP_CHANNEL_ID')
 
+    @staticmethod
+    def can_star(info: MemberInfo) -> bool:
+        """Only team leaders, staff and sheet helpers can star messages."""
+        return info.is_team_leader or info.is_staff or info.is_sheet_helper
+
+    def is_drop_channel(self, channel_id: int) -> bool:
+        return channel_id in (self.team1_drop_channel_id, self.team2_drop_channel_id)
+
+    def count_rest_call(self, endpoint: str) -> None:
+        self.rest_calls[endpoint] = self.rest_calls.get(endpoint, 0) + 1
+
+    async def get_message(self, channel, message_id: int) -> CachedMessage:
+        """
+        Returns a drop channel message from the cache, fetching and caching it on a miss.
+
+        Raises:
+            discord.NotFound: If the message no longer exists.
+        """
+        cached = self.message_cache.get(message_id)
+        if cached is None:
+            self.count_rest_call("fetch_message")
+            cached = CachedMessage.from_message(await channel.fetch_message(message_id))
+            self.message_cache.put(cached)
+        return cached
+
+    async def remove_reaction(self, channel, payload: RawReactionActionEvent) -> None:
+        self.count_rest_call("remove_reaction")
+        member = payload.member or Object(id=payload.user_id)
+        await channel.get_partial_message(payload.message_id).remove_reaction(payload.emoji, member)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: Message) -> None:
+        """Caches new drop channel messages, so starring them needs no fetch."""
+        if self.is_drop_channel(message.channel.id):
+            self.message_cache.put(CachedMessage.from_message(message))
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: RawMessageUpdateEvent) -> None:
+        # The cached content is stale, it's fetched again if the message is starred
+        if self.is_drop_channel(payload.channel_id):
+            self.message_cache.pop(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: RawMessageDeleteEvent) -> None:
+        if self.is_drop_channel(payload.channel_id):
+            self.message_cache.pop(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear(self, payload: RawReactionClearEvent) -> None:
+        if self.is_drop_channel(payload.channel_id):
+            self.message_cache.pop(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload: RawReactionClearEmojiEvent) -> None:
+        if self.is_drop_channel(payload.channel_id):
+            self.message_cache.pop(payload.message_id)
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: RawReactionActionEvent) -> None:
         """
         Handles new ⭐ or 🤔 reactions. If the reacting user is authorized and it's the first reaction,
         the message is copied to the starboard.
         """
-        if payload.channel_id not in [self.team1_drop_channel_id, self.team2_drop_channel_id]:
+        if not self.is_drop_channel(payload.channel_id):
             return
 
-        if str(payload.emoji) not in ["⭐", "🤔"]:
+        emoji = str(payload.emoji)
+        if emoji not in STAR_EMOJIS:
             return
 
+        self.reaction_events += 1
+        # Keep the cached star count in step with the reactions; a message fetched later already has it
+        cached = self.message_cache.get(payload.message_id)
+        if cached is not None:
+            cached.star_counts[emoji] = cached.star_counts.get(emoji, 0) + 1
+
         try:
             channel = self.discord_bot.get_channel(payload.channel_id)
-            message = await channel.fetch_message(payload.message_id)
-            user = await self.discord_bot.fetch_user(payload.user_id)
             guild = self.discord_bot.get_guild(payload.guild_id)
-
             if guild is None:
-                logger.info("[Starboard Cog] Guild not found for user %s", user.name)
+                logger.info("[Starboard Cog] Guild not found for user %s", payload.user_id)
                 return
 
-            member = await guild.fetch_member(user.id)
-            if member is None:
-                logger.info("[Starboard Cog] Member %s not found in guild %s", user.id, guild.name)
+            # payload.member is current and refreshes the shared member index; only without it does the
+            # index answer, fetching the member if it hasn't seen them
+            fetches_before = self.hunt_bot.member_index.fetches
+            info = await self.hunt_bot.member_index.resolve(guild, payload.user_id, member=payload.member)
+            if self.hunt_bot.member_index.fetches != fetches_before:
+                self.count_rest_call("fetch_member")
+            if info is None:
+                logger.info("[Starboard Cog] Member %s not found in guild %s", payload.user_id, guild.name)
                 return
 
             # Check user role
-            has_required_role = any(
-                role.name.endswith('Team Leader') or role.name == 'Staff' or role.name == "Sheet helper"
-                for role in member.roles
-            )
-            if not has_required_role:
-                await message.remove_reaction(payload.emoji, member)
-                logger.info("[Starboard Cog] User %s reaction removed due to missing roles", user.name)
+            if not self.can_star(info):
+                await self.remove_reaction(channel, payload)
+                logger.info("[Starboard Cog] User %s reaction removed due to missing roles", payload.user_id)
                 return
 
             # Check if already posted to starboard
-            if message.id in self.starred_messages:
-                await message.remove_reaction(payload.emoji, member)
-                logger.info("[Starboard Cog] Duplicate reaction removed from user %s on message %s", user.name, message.id)
+            if payload.message_id in self.starred_messages:
+                await self.remove_reaction(channel, payload)
+                logger.info("[Starboard Cog] Duplicate reaction removed from user %s on message %s", payload.user_id,
+                            payload.message_id)
                 return
 
-            # Prepare message content
-            message_content = message.content
-            if message.attachments:
-                attachments = "\n".join([attachment.url for attachment in message.attachments])
-                message_content += f"\n{attachments}"
+            message = cached or await self.get_message(channel, payload.message_id)
 
             # Send to starboard
             star_channel = self.discord_bot.get_channel(self.starboard_channel_id)
@@ -145,29 +285,30 @@ class StarBoardCog(commands.Cog):
                 logger.error("[Starboard Cog] Starboard channel not found.")
                 return
 
-            if str(payload.emoji) == "⭐":
+            if emoji == "⭐":
+                self.count_rest_call("send")
                 sent = await star_channel.send(
                     f"⭐ Starred message from {channel.mention}:\n"
-                    f"{message_content}\n"
+                    f"{message.content}\n"
                     f"[Jump to Message]({message.jump_url})"
                 )
-                logger.info("[Starboard Cog] Starred message %s sent to starboard", message.id)
+                logger.info("[Starboard Cog] Starred message %s sent to starboard", message.message_id)
 
-            elif str(payload.emoji) == "🤔":
+            elif emoji == "🤔":
+                self.count_rest_call("send")
                 sent = await star_channel.send(
                     f"🤔 Thinking message from {channel.mention}:\n"
-                    f"{message_content}\n"
+                    f"{message.content}\n"
                     f"[Jump to Message]({message.jump_url})"
                 )
-                logger.info("[Starboard Cog] Thinking message %s sent to starboard", message.id)
+                logger.info("[Starboard Cog] Thinking message %s sent to starboard", message.message_id)
 
             # Store reference
-            self.starred_messages[message.id] = sent.id
+            self.starred_messages[message.message_id] = sent.id
 
         except Exception as e:
             logger.exception("[Starboard Cog] Error handling reaction add: %s", e)
 
-
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload: RawReactionActionEvent) -> None:
         """
@@ -179,31 +320,38 @@ class StarBoardCog(commands.Cog):
         Returns:
             None
         """
-        if payload.channel_id not in [self.team1_drop_channel_id, self.team2_drop_channel_id]:
+        if not self.is_drop_channel(payload.channel_id):
             return
 
-        if str(payload.emoji) not in ["⭐", "🤔"]:
+        emoji = str(payload.emoji)
+        if emoji not in STAR_EMOJIS:
             return
 
+        self.reaction_events += 1
         try:
-            channel = self.discord_bot.get_channel(payload.channel_id)
-            original_message = await channel.fetch_message(payload.message_id)
-
-            star_reactions = [
-                r for r in original_message.reactions
-                if str(r.emoji) in ["⭐", "🤔"]
-            ]
-            
-            if not star_reactions:
-                starboard_msg_id = self.starred_messages.pop(original_message.id, None)
+            cached = self.message_cache.get(payload.message_id)
+            if cached is not None:
+                cached.star_counts[emoji] = max(0, cached.star_counts.get(emoji, 0) - 1)
+            elif payload.message_id in self.starred_messages:
+                # Only worth a fetch when there is a starboard message to take down
+                channel = self.discord_bot.get_channel(payload.channel_id)
+                cached = await self.get_message(channel, payload.message_id)
+            else:
+                return
+
+            if not cached.starred:
+                starboard_msg_id = self.starred_messages.pop(payload.message_id, None)
                 if starboard_msg_id:
                     star_channel = self.discord_bot.get_channel(self.starboard_channel_id)
-                    star_msg = await star_channel.fetch_message(starboard_msg_id)
-                    await star_msg.delete()
+                    self.count_rest_call("delete")
+                    try:
+                        await star_channel.get_partial_message(starboard_msg_id).delete()
+                    except NotFound:
+                        pass
                     logger.info(
                         "[Starboard Cog] Deleted starboard message %s for original message %s",
-                        star_msg.id,
-                        original_message.id
+                        starboard_msg_id,
+                        payload.message_id
                     )
 
         except Exception as e:
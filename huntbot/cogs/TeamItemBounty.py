@@ -125,7 +125,9 @@ class TeamItemBountyCog(commands.Cog):
         Checks whether the user invoking the interaction has one of the required roles.
 
         Compares the user's role names (case-insensitive) against a predefined set of target roles.
-        If the user lacks the required role, an ephemeral message is sent denying permission.
+        The roles are looked up in the shared member index; the interaction's member is only indexed
+        when the index hasn't seen them yet. If the user lacks the required role, an ephemeral
+        message is sent denying permission.
 
         Parameters:
             interaction (discord.Interaction): The interaction object containing the user context.
@@ -134,12 +136,13 @@ class TeamItemBountyCog(commands.Cog):
             bool: True if the user has one of the valid roles; False otherwise.
         """
         member = interaction.user
-        role_names = [role.name.lower() for role in member.roles]
+        info = await self.hunt_bot.member_index.resolve(interaction.guild, member.id, member=member)
         normalized_targets = {r.lower() for r in self.target_roles}
 
-        logger.info(f"[TeamItemBounty Cog] Checking user roles: {role_names}, valid roles: {normalized_targets}")
+        logger.info(f"[TeamItemBounty Cog] Checking user roles: {sorted(info.role_names) if info else []}, "
+                    f"valid roles: {normalized_targets}")
 
-        if not any(role in role_names for role in normalized_targets):
+        if info is None or not info.has_any_role(normalized_targets):
             await interaction.followup.send("You don't have permission to run that command.", ephemeral=True)
             return False
 
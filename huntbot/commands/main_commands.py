@@ -3,6 +3,7 @@ from discord import app_commands
 import logging
 from huntbot.HuntBot import HuntBot
 from huntbot.GDoc import GDoc
+from huntbot.RequestScheduler import RequestPriority
 from discord.ext.commands import Bot
 from huntbot.commands.command_utils import check_user_roles
 
@@ -35,6 +36,9 @@ async def start_hunt(interaction: discord.Interaction, hunt_bot: HuntBot, discor
         await interaction.followup.send("No GDoc sheet name set. Use the command '/sheet' to set one.")
         return
 
+    hunt_bot.start_requested = True
+    await hunt_bot.asave_sheet_snapshot()
+
     # Start the main Hunt logic loop
     if not discord_bot.check_start_time.is_running():
         discord_bot.check_start_time.start()
@@ -62,35 +66,35 @@ async def sheet(interaction: discord.Interaction, sheet_id: str, sheet_name: str
 
     await interaction.followup.send("Sheet ID and Name set successfully")
 
-    # Retrieve the configuration from the GDoc
+    # Retrieve the configuration from the GDoc, the sheet may have changed so read all of it
     try:
-        data = gdoc.get_data_from_sheet(spreadsheet_id=hunt_bot.sheet_id, sheet_name=hunt_bot.sheet_name)
-        hunt_bot.set_sheet_data(sheet_data=data)
+        hunt_bot.request_full_refresh()
+        await hunt_bot.refresh_sheet_values(gdoc, priority=RequestPriority.COMMAND)
     except Exception as e:
         logger.error(f"[SHEET COMMAND] Error retrieving sheet data", exc_info=e)
         await interaction.followup.send("Error retrieving sheet data.")
         return
 
-    if hunt_bot.sheet_data.empty:
+    if not hunt_bot.sheet_values:
         await interaction.followup.send("Sheet is empty or not configured properly.")
         return
 
-    hunt_bot.table_map = gdoc.build_table_map(df=hunt_bot.sheet_data)
     if not hunt_bot.table_map:
         await interaction.followup.send("Error building sheet table map.")
         return
 
-    config_df = gdoc.extract_table(df=hunt_bot.sheet_data, table_map=hunt_bot.table_map,
-                                   table_name=hunt_bot.config_table_name)
-    if config_df.empty:
+    config_table = hunt_bot.get_typed_table(hunt_bot.config_table_name, hunt_bot.CONFIG_TEXT_COLUMNS)
+    if config_table.empty:
         await interaction.followup.send("Error retrieving config data.")
         return
 
-    hunt_bot.load_config(df=config_df)
+    hunt_bot.load_config(df=config_table)
     if not hunt_bot.configured:
         await interaction.followup.send("Failed to configure hunt bot.")
         return
 
+    await hunt_bot.asave_sheet_snapshot()
+
     start_str = hunt_bot.start_datetime.strftime("%d %b %Y %H:%M %Z")
     end_str = hunt_bot.end_datetime.strftime("%d %b %Y %H:%M %Z")
 
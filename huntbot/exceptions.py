@@ -27,4 +27,12 @@ class ConfigurationException(Exception):
         # Customize the string representation of the exception
         if self.config_key:
             return f'{self.args[0]} (Config key: {self.config_key})'
-        return self.args[0]
\ No newline at end of file
+        return self.args[0]
+
+
+class CircuitOpenException(Exception):
+    """Raised instead of sending a request while the circuit breaker for a failing service is open."""
+
+    def __init__(self, service="service"):
+        super().__init__(f"{service} circuit is open, request not sent")
+        self.service = service
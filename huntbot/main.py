@@ -7,6 +7,8 @@ import os
 import traceback
 from huntbot.GDoc import GDoc
 from huntbot.HuntBot import HuntBot
+from huntbot.exceptions import CircuitOpenException
+from huntbot.PollScheduler import PollScheduler
 from huntbot.cogs.Bounties import BountiesCog
 from huntbot.cogs.Dailies import DailiesCog
 from huntbot.cogs.Score import ScoreCog
@@ -15,8 +17,7 @@ from huntbot.cogs.Memories import MemoriesCog
 from huntbot.cogs.StarBoard import StarBoardCog
 from huntbot.cogs.TeamItemBounty import TeamItemBountyCog
 from huntbot.cogs.Memes import MemesCog
-from huntbot.cogs.TotalBountyItemCounter import TotalBountyItemCounterCog
-from huntbot.cogs.TotalDailyItemCounter import TotalDailyItemCounterCog
+from huntbot.cogs.ItemCounter import ItemCounterCog
 from huntbot.commands.main_commands import register_main_commands
 from huntbot.commands.dailies_command import register_daily_commands
 from huntbot.commands.bounties_command import register_bounties_commands
@@ -37,12 +38,33 @@ if not TOKEN:
 
 logger.info("[Main Task Loop] Discord API token found successfully.")
 
+# Privileged: member list chunking and member events keep hunt_bot.member_index current. Login fails
+# unless the Server Members Intent is enabled for the bot in the Discord developer portal; set
+# HUNTBOT_MEMBERS_INTENT=0 to run without it, members are then fetched as events need them
+MEMBERS_INTENT = os.getenv("HUNTBOT_MEMBERS_INTENT", "1") != "0"
+
 intents = discord.Intents.default()
 intents.message_content = True
+intents.members = MEMBERS_INTENT
 bot = commands.Bot(command_prefix='!', intents=intents)
 
 gdoc = GDoc()
 hunt_bot = HuntBot()
+hunt_bot.member_index.member_events = MEMBERS_INTENT
+hunt_bot.snapshot_path = os.getenv("HUNTBOT_SNAPSHOT_PATH", "sheet_snapshot.json.gz")
+# Comma separated names of the tables the hunt sheet stacks under other tables
+hunt_bot.set_stacked_tables(name.strip() for name in os.getenv("HUNTBOT_STACKED_TABLES", "").split(",")
+                            if name.strip())
+sheet_refresh_task = None
+
+# Optional push mode: with HUNTBOT_WEBHOOK_PORT set, sheet edits are pushed to the bot (e.g. by an
+# Apps Script onEdit trigger) and polling drops to a slow safety net
+WEBHOOK_PORT = os.getenv("HUNTBOT_WEBHOOK_PORT")
+WEBHOOK_POLL_SECONDS = int(os.getenv("HUNTBOT_WEBHOOK_POLL_SECONDS", "60"))
+sheet_webhook = None
+
+# Adapts the main loop and sheet poll intervals to the hunt timeline, sheet activity and API throttling
+poll_scheduler = PollScheduler()
 
 
 async def generate_wom_messages() -> None:
@@ -61,6 +83,71 @@ async def generate_wom_messages() -> None:
     await t2_message.pin()
 
 
+async def refresh_sheet_data(table_names: list = None, scheduled: bool = False) -> None:
+    try:
+        # Get updated gdoc data, GDoc's request scheduler keeps us inside the Sheets read quota
+        logger.info("[Main Task Loop] Retrieving GDoc data....")
+        changed = await hunt_bot.refresh_sheet_values(gdoc=gdoc, table_names=table_names)
+        # Only scheduled polls adapt the poll interval, a change notification always finds its own edit
+        # and would otherwise keep shrinking the safety net interval
+        if scheduled:
+            poll_scheduler.record_poll(changed)
+        if changed:
+            await hunt_bot.asave_sheet_snapshot()
+    except CircuitOpenException:
+        # Already reported when the circuit opened, keep serving the last good snapshot
+        logger.debug("[Main Task Loop] Sheets API circuit open, skipping refresh")
+    except Exception as e:
+        if GDoc.is_throttled(e):
+            poll_scheduler.record_throttle()
+        logger.error(e)
+        logger.error("[Main Task Loop] Failed to retrieve GDoc data")
+
+
+def schedule_sheet_refresh() -> None:
+    """
+    Refreshes the sheet in the background so a slow Sheets API never holds up the main loop,
+    which keeps working from the current snapshot. Only one refresh runs at a time.
+    """
+    global sheet_refresh_task
+    if sheet_refresh_task is None or sheet_refresh_task.done():
+        sheet_refresh_task = asyncio.create_task(refresh_sheet_data(scheduled=True))
+
+
+async def on_sheet_changed(ranges: list = None) -> None:
+    # Only hunt sheets that have been configured with /sheet can be refreshed
+    if not hunt_bot.sheet_id:
+        return
+
+    table_names = hunt_bot.tables_for_ranges(ranges)
+    if table_names is None:
+        hunt_bot.request_full_refresh()
+    elif not table_names:
+        return
+
+    logger.info(f"[Main Task Loop] Sheet change notification, refreshing {table_names or 'the whole sheet'}")
+    await refresh_sheet_data(table_names)
+
+
+async def start_sheet_webhook() -> None:
+    global sheet_webhook
+    if not WEBHOOK_PORT or sheet_webhook is not None:
+        return
+
+    # aiohttp's web server is only imported when push mode is turned on
+    from huntbot.SheetWebhook import SheetWebhook
+
+    webhook = SheetWebhook(on_change=on_sheet_changed, secret=os.getenv("HUNTBOT_WEBHOOK_SECRET", ""),
+                           host=os.getenv("HUNTBOT_WEBHOOK_HOST", "0.0.0.0"), port=int(WEBHOOK_PORT))
+    try:
+        await webhook.start()
+        sheet_webhook = webhook
+        # Notifications deliver edits, polling is only a safety net to catch missed ones
+        poll_scheduler.set_bounds(WEBHOOK_POLL_SECONDS, WEBHOOK_POLL_SECONDS * 4)
+    except (OSError, ValueError) as e:
+        logger.error(f"[Main Task Loop] Unable to start sheet webhook, falling back to polling: {e}")
+
+
 @tasks.loop(seconds=5)
 async def check_start_time():
     logger.debug("[Main Task Loop] Checking start time task loop....")
@@ -74,14 +161,8 @@ async def check_start_time():
         memes_cog = MemesCog(bot=bot, hunt_bot=hunt_bot)
         await bot.add_cog(memes_cog)
 
-    try:
-        # Get updated gdoc data rate is 300 reads /per minute
-        logger.info("[Main Task Loop] Retrieving GDoc data....")
-        df = gdoc.get_data_from_sheet(spreadsheet_id=hunt_bot.sheet_id, sheet_name=hunt_bot.sheet_name)
-        hunt_bot.set_sheet_data(sheet_data=df)
-    except Exception as e:
-        logger.error(e)
-        logger.error("[Main Task Loop] Failed to retrieve GDoc data")
+    if poll_scheduler.refresh_due():
+        schedule_sheet_refresh()
 
     logger.debug("[Main Task Loop] Checking if Hunt Bot has been configured...")
 
@@ -95,26 +176,34 @@ async def check_start_time():
         # The hunt has started
         if hunt_bot.started:
             logger.info("[Main Task Loop] The Hunt has begun!")
-            if channel:
-                hunt_bot.update_plugin_gdoc_master_password(password=hunt_bot.master_password, gdoc=gdoc)
-                await channel.send(
-                    f"{hunt_bot.start_message}"
-                    f"\nThe password is: {hunt_bot.master_password}")
-
-            await generate_wom_messages()
+            # After a restart mid-hunt the start announcement has already gone out, only the cogs need loading
+            if not hunt_bot.start_announced:
+                if channel:
+                    await hunt_bot.update_plugin_gdoc_master_password(password=hunt_bot.master_password,
+                                                                      gdoc=gdoc)
+                    await channel.send(
+                        f"{hunt_bot.start_message}"
+                        f"\nThe password is: {hunt_bot.master_password}")
+
+                await generate_wom_messages()
+                hunt_bot.start_announced = True
+                await hunt_bot.asave_sheet_snapshot()
 
             # If we made it this far then we are ready to start loading the cogs
             cogs_to_load = [
+                # Counts bounty and daily total-drop challenges, loaded first so it's there when they start one
+                (ItemCounterCog, {'discord_bot': bot, 'hunt_bot': hunt_bot}),
                 (BountiesCog, {'bot': bot, 'hunt_bot': hunt_bot, 'gdoc': gdoc}),
                 (DailiesCog, {'bot': bot, 'hunt_bot': hunt_bot, 'gdoc': gdoc}),
                 (ScoreCog, {'discord_bot': bot, 'hunt_bot': hunt_bot, 'gdoc': gdoc}),
                 (MemoriesCog, {'discord_bot': bot, 'hunt_bot': hunt_bot}),
                 (StarBoardCog, {'discord_bot': bot, 'hunt_bot': hunt_bot}),
-                (TeamItemBountyCog, {'hunt_bot': hunt_bot}),
-                (TotalDailyItemCounterCog, {'discord_bot': bot, 'hunt_bot': hunt_bot}),
-                (TotalBountyItemCounterCog, {'discord_bot': bot, 'hunt_bot': hunt_bot})
+                (TeamItemBountyCog, {'hunt_bot': hunt_bot})
             ]
 
+            # Index every member's team and roles once, before the cogs start looking them up
+            await hunt_bot.member_index.warm(bot.get_guild(hunt_bot.guild_id))
+
             for cog_cls, params in cogs_to_load:
                 try:
                     logger.info(f"[Main Task Loop] Loading {cog_cls.__name__}...")
@@ -137,10 +226,23 @@ async def check_start_time():
             logger.info("[Main Task Loop] The Hunt has ended!")
             await channel.send(hunt_bot.end_message)
             check_start_time.stop()
+            return
+
+    interval = poll_scheduler.next_interval(now=hunt_bot.get_current_utc_time(), start=hunt_bot.start_datetime,
+                                            end=hunt_bot.end_datetime)
+    if interval != check_start_time.seconds:
+        check_start_time.change_interval(seconds=interval)
 
 bot.check_start_time = check_start_time
 
 
+@tasks.loop(seconds=2)
+async def flush_gdoc_writes():
+    # Queued plugin sheet cell writes go out as one batchUpdate per spreadsheet
+    if gdoc.pending_writes:
+        await gdoc.aflush_writes()
+
+
 async def sync_commands(test: bool = False):
     try:
         # Optional: force sync for a specific guild
@@ -173,6 +275,20 @@ async def on_ready():
 
     logger.info("[Main Task Loop] Assets Loaded")
 
+    if not flush_gdoc_writes.is_running():
+        flush_gdoc_writes.start()
+
+    await start_sheet_webhook()
+
+    # Warm start: restore the last good sheet snapshot so cogs can load without waiting on the
+    # Sheets API, then reconcile against a fresh fetch in the background
+    if not hunt_bot.sheet_id and hunt_bot.load_sheet_snapshot():
+        logger.info("[Main Task Loop] Warm started from sheet snapshot")
+        schedule_sheet_refresh()
+        if hunt_bot.configured and hunt_bot.start_requested and not check_start_time.is_running():
+            logger.info("[Main Task Loop] Resuming the Hunt logic loop")
+            check_start_time.start()
+
     register_main_commands(bot.tree, gdoc, hunt_bot, bot)
     register_bounties_commands(bot.tree, discord_bot=bot, hunt_bot=hunt_bot)
     register_daily_commands(bot.tree, discord_bot=bot, hunt_bot=hunt_bot)
@@ -187,8 +303,38 @@ async def on_ready():
     logger.info(f"[Main Task Loop] Logged in as {bot.user}")
 
 
+@bot.event
+async def on_member_join(member: discord.Member):
+    hunt_bot.member_index.update_member(member)
+
+
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    hunt_bot.member_index.update_member(after)
+
+
+@bot.event
+async def on_member_remove(member: discord.Member):
+    hunt_bot.member_index.remove_member(member.id)
+
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    # A renamed role can move its members on or off a team
+    if before.name != after.name:
+        for member in after.members:
+            hunt_bot.member_index.update_member(member)
+
+
 async def main():
-    await bot.start(TOKEN)
+    try:
+        await bot.start(TOKEN)
+    finally:
+        if sheet_webhook is not None:
+            await sheet_webhook.stop()
+        # Don't lose queued plugin sheet writes on shutdown
+        await gdoc.aflush_writes()
+        gdoc.close()
 
 
 def run():
@@ -0,0 +1,302 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from huntbot.MemberTeamIndex import MemberTeamIndex
+from huntbot.cogs.ItemCounter import ItemCounterCog
+
+BOT_USER_ID = 1
+CHANNEL_ID = 500
+START_MSG_ID = 1000
+
+
+def member(user_id: int, role_name: str):
+    role = MagicMock()
+    role.name = role_name
+    return SimpleNamespace(id=user_id, roles=[role])
+
+
+RED = member(10, "Red Team")
+BLUE = member(20, "Blue Team")
+
+
+def message(message_id: int, author, reactions: dict = None, channel_id: int = CHANNEL_ID):
+    return SimpleNamespace(id=message_id, author=author, channel=SimpleNamespace(id=channel_id),
+                           reactions=[SimpleNamespace(emoji=emoji, count=count)
+                                      for emoji, count in (reactions or {}).items()])
+
+
+def reaction(message_id: int, emoji: str, channel_id: int = CHANNEL_ID):
+    return SimpleNamespace(channel_id=channel_id, message_id=message_id, emoji=emoji)
+
+
+class FakeChannel:
+    def __init__(self, messages: list) -> None:
+        self.messages = messages
+        self.history_calls = 0
+        self.fetch_message = AsyncMock(side_effect=lambda message_id: next(
+            m for m in self.messages if m.id == message_id))
+        self.send = AsyncMock(return_value=SimpleNamespace(id=2000))
+        self.get_partial_message = MagicMock(return_value=SimpleNamespace(edit=AsyncMock(), delete=AsyncMock()))
+
+    def history(self, after=None, before=None, **kwargs):
+        self.history_calls += 1
+        messages = [m for m in self.messages if (after is None or m.id > after.id)
+                    and (before is None or m.id < before.id)]
+
+        async def iterate():
+            for m in messages:
+                yield m
+        return iterate()
+
+
+@pytest.fixture
+def hunt_bot():
+    hunt_bot = MagicMock()
+    hunt_bot.team_one_name = "Red"
+    hunt_bot.team_two_name = "Blue"
+    hunt_bot.guild_id = 1
+    hunt_bot.member_index = MemberTeamIndex(hunt_bot)
+    return hunt_bot
+
+
+@pytest.fixture
+def channel():
+    return FakeChannel([])
+
+
+@pytest.fixture
+def cog(hunt_bot, channel):
+    discord_bot = MagicMock()
+    discord_bot.user.id = BOT_USER_ID
+    discord_bot.get_channel.return_value = channel
+    return ItemCounterCog(discord_bot, hunt_bot)
+
+
+VALID = {"✅": 1, "⬆️": 1}
+
+
+@pytest.mark.asyncio
+async def test_start_reconciles_existing_messages(cog, channel):
+    channel.messages = [message(1001, RED, VALID), message(1002, BLUE, VALID), message(1003, RED, {"✅": 1}),
+                        message(1004, RED, {**VALID, "❌": 1}), message(1005, member(BOT_USER_ID, ""), VALID)]
+
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+
+    assert challenge.team_totals == {"Red": 1, "Blue": 1}
+    assert challenge.total_items == 2
+    assert challenge.last_valid_drop_msg_id == 1002
+    assert channel.history_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_reactions_update_totals_without_rescanning(cog, channel):
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    await cog.on_message(message(1001, RED))
+
+    await cog.on_raw_reaction_add(reaction(1001, "✅"))
+    assert challenge.total_items == 0
+    await cog.on_raw_reaction_add(reaction(1001, "⬆️"))
+    assert challenge.team_totals["Red"] == 1
+    assert challenge.last_valid_drop_msg_id == 1001
+
+    await cog.on_raw_reaction_add(reaction(1001, "❌"))
+    assert challenge.total_items == 0
+    await cog.on_raw_reaction_remove(reaction(1001, "❌"))
+    assert challenge.total_items == 1
+
+    assert channel.history_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_second_reaction_keeps_message_counted(cog):
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    await cog.on_message(message(1001, BLUE, {"✅": 2, "⬆️": 1}))
+
+    await cog.on_raw_reaction_remove(reaction(1001, "✅"))
+
+    assert challenge.team_totals["Blue"] == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_counted_message(cog, channel):
+    channel.messages = [message(1001, RED, VALID), message(1002, RED, VALID)]
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+
+    await cog.on_raw_message_delete(SimpleNamespace(channel_id=CHANNEL_ID, message_id=1002))
+
+    assert challenge.team_totals["Red"] == 1
+    assert challenge.last_valid_drop_msg_id == 1001
+
+
+@pytest.mark.asyncio
+async def test_reaction_on_unknown_message_fetches_it_once(cog, channel):
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    channel.messages = [message(1001, RED, VALID)]
+
+    await cog.on_raw_reaction_add(reaction(1001, "⬆️"))
+
+    channel.fetch_message.assert_awaited_once_with(1001)
+    assert challenge.team_totals["Red"] == 1
+
+
+@pytest.mark.asyncio
+async def test_events_outside_the_challenge_are_ignored(cog):
+    await cog.on_message(message(1001, RED, VALID))
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    await cog.on_message(message(999, RED, VALID))
+    await cog.on_raw_reaction_add(SimpleNamespace(channel_id=CHANNEL_ID + 1, message_id=1005, emoji="✅"))
+
+    assert challenge.messages == {}
+
+
+@pytest.mark.asyncio
+async def test_resume_reconciles_with_channel(cog, channel):
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    channel.messages = [message(1001, BLUE, VALID)]
+
+    await cog.on_resumed()
+
+    assert challenge.team_totals["Blue"] == 1
+    assert cog.reconciliations == 2
+
+
+@pytest.mark.asyncio
+async def test_reconnect_reconciles_with_channel(cog, channel):
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    channel.messages = [message(1001, BLUE, VALID)]
+
+    await cog.on_ready()
+
+    assert challenge.team_totals["Blue"] == 1
+    assert cog.reconciliations == 2
+
+
+@pytest.mark.asyncio
+async def test_events_during_last_reconcile_pass_are_reread(cog, channel):
+    cog.MAX_RECONCILE_PASSES = 1
+    channel.messages = [message(1001, RED, {"✅": 1}), message(1002, BLUE, VALID)]
+    scan = channel.history
+
+    def history(**kwargs):
+        async def iterate():
+            async for m in scan(**kwargs):
+                yield m
+                if m.id == 1001:
+                    # Staff react after the scan read the message
+                    channel.messages[0] = message(1001, RED, VALID)
+                    await cog.on_raw_reaction_add(reaction(1001, "⬆️"))
+        return iterate()
+
+    channel.history = history
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+
+    assert challenge.team_totals == {"Red": 1, "Blue": 1}
+    channel.fetch_message.assert_awaited_once_with(1001)
+    assert not challenge.reconciling and not challenge.missed_msg_ids
+
+
+@pytest.mark.asyncio
+async def test_reaction_during_author_resolve_is_kept(cog, channel):
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    channel.messages = [message(1001, RED, VALID)]
+    resolving = asyncio.Event()
+    resolved = asyncio.Event()
+
+    async def resolve_author_team(author):
+        if not resolving.is_set():
+            resolving.set()
+            await resolved.wait()
+        return "Red"
+
+    cog.resolve_author_team = resolve_author_team
+    posted = asyncio.create_task(cog.on_message(message(1001, RED)))
+    await resolving.wait()
+    # The reaction arrives first and fetches the message with both reactions
+    await cog.on_raw_reaction_add(reaction(1001, "⬆️"))
+    resolved.set()
+    await posted
+
+    assert challenge.team_totals["Red"] == 1
+    assert challenge.messages[1001].reactions == VALID
+
+
+@pytest.mark.asyncio
+async def test_sticky_follows_totals_without_reading_channel(cog, channel):
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    await cog.on_message(message(1001, RED))
+    await asyncio.sleep(0)
+
+    channel.send.assert_awaited_once()
+    assert challenge.sticky.message_id == 2000
+    channel.fetch_message.assert_not_awaited()
+
+    # The sticky's own message event doesn't push it off the bottom
+    await cog.on_message(message(2000, member(BOT_USER_ID, "")))
+    challenge.sticky.posted_at = -cog.STICKY_INTERVAL
+    await cog.on_raw_reaction_add(reaction(1001, "✅"))
+    await cog.on_raw_reaction_add(reaction(1001, "⬆️"))
+    await asyncio.sleep(0)
+
+    channel.get_partial_message.assert_called_once_with(2000)
+    assert "Red team: 1 items" in challenge.sticky.posted_content
+    assert channel.history_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_user_authors_are_fetched_once(cog, hunt_bot, channel):
+    guild = SimpleNamespace(id=1, chunked=True, members=[], fetch_member=AsyncMock(return_value=RED))
+    cog.discord_bot.get_guild.return_value = guild
+    # A discord.User author carries no roles
+    author = SimpleNamespace(id=RED.id)
+    channel.messages = [message(1001, author, VALID), message(1002, author, VALID)]
+
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    await cog.on_resumed()
+
+    assert challenge.team_totals["Red"] == 2
+    guild.fetch_member.assert_awaited_once_with(RED.id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_challenges_in_different_channels(cog, channel):
+    daily_channel = FakeChannel([])
+    cog.discord_bot.get_channel.side_effect = lambda channel_id: daily_channel if channel_id == 600 else channel
+    bounty = await cog.start_challenge(CHANNEL_ID, START_MSG_ID, name="bounty")
+    daily = await cog.start_challenge(600, START_MSG_ID, name="daily")
+
+    await cog.on_message(message(1001, RED, VALID))
+    await cog.on_message(message(1002, BLUE, {"✅": 1}, channel_id=600))
+    await cog.on_raw_reaction_add(reaction(1002, "⬆️", channel_id=600))
+
+    assert bounty.team_totals == {"Red": 1, "Blue": 0}
+    assert daily.team_totals == {"Red": 0, "Blue": 1}
+    assert cog.events_applied == 3
+
+
+@pytest.mark.asyncio
+async def test_later_challenge_in_same_channel_takes_over(cog, channel):
+    channel.messages = [message(1001, RED, VALID), message(1003, BLUE, VALID)]
+    first = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+    assert first.total_items == 2
+
+    second = await cog.start_challenge(CHANNEL_ID, 1002)
+    await cog.on_message(message(1004, RED, VALID))
+
+    assert first.team_totals == {"Red": 1, "Blue": 0}
+    assert second.team_totals == {"Red": 1, "Blue": 1}
+    assert await cog.start_challenge(CHANNEL_ID, 1002) is second
+
+
+@pytest.mark.asyncio
+async def test_stop_posts_final_tally_and_stops_counting(cog, channel):
+    channel.messages = [message(1001, RED, VALID)]
+    challenge = await cog.start_challenge(CHANNEL_ID, START_MSG_ID)
+
+    await cog.stop_challenge(CHANNEL_ID, START_MSG_ID)
+    await cog.on_message(message(1002, RED, VALID))
+
+    assert "Red has won with 1 items!" in channel.send.await_args.args[0]
+    assert challenge.ended and challenge.total_items == 1
+    assert cog.challenges == {} and cog.channel_challenges == {}
@@ -3,8 +3,8 @@ import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 import discord
 from discord.ext import commands, tasks
-import pandas as pd
 from huntbot.cogs.Score import ScoreCog, ConfigurationException, TableDataImportException
+from huntbot.HuntBot import HuntBot
 
 
 @pytest.fixture
@@ -86,19 +86,17 @@ def test_get_score_channel_failure(score_cog):
 
 
 def test_get_score_success(score_cog):
-    # Mock dataframe as GDoc.extract_table expects
-    data = [
-        ["Current Score", None],                 # merged header row
+    # Raw sheet values as returned by the Sheets API
+    values = [
+        ["Current Score", ""],                   # merged header row
         ["Team Name", "Total Points"],           # column headers
         [f"Team {score_cog.hunt_bot.team_one_name}", 100],
         [f"Team {score_cog.hunt_bot.team_two_name}", 200]
     ]
-    df = pd.DataFrame(data)
 
-    score_cog.hunt_bot.sheet_data = df.copy()
-    score_cog.hunt_bot.table_map = {
-        "Current Score": {"start_col": 0, "end_col": len(df[0]) - 1}
-    }
+    sheet_state = HuntBot()
+    sheet_state.update_sheet_values(values)
+    score_cog.hunt_bot.get_typed_table = sheet_state.get_typed_table
 
     score_cog.get_score()
 
@@ -106,17 +104,43 @@ def test_get_score_success(score_cog):
     assert score_cog.team2_points == 200
 
 
-def test_get_score_empty_dataframe_raises(score_cog):
-    # Mock dataframe with only header row (no data)
-    df = pd.DataFrame([
-        ["Current Score", None],
+def test_get_score_compares_points_as_numbers(score_cog):
+    values = [
+        ["Current Score", ""],
+        ["Team Name", "Total Points"],
+        [f"Team {score_cog.hunt_bot.team_one_name}", "9"],
+        [f"Team {score_cog.hunt_bot.team_two_name}", "10"]
+    ]
+
+    sheet_state = HuntBot()
+    sheet_state.update_sheet_values(values)
+    score_cog.hunt_bot.get_typed_table = sheet_state.get_typed_table
+
+    score_cog.get_score()
+    score_cog.determine_lead()
+
+    assert score_cog.team1_points == 9
+    assert score_cog.team2_points == 10
+    assert score_cog.lead_message == "Team Blue is ahead by 1 point!"
+
+
+def test_get_score_points_not_numbers_raises(score_cog):
+    rows = [{"Team Name": "Team Red", "Total Points": "lots"}]
+
+    with pytest.raises(TableDataImportException):
+        score_cog.get_score(rows)
+
+
+def test_get_score_empty_table_raises(score_cog):
+    # Only the header rows, no data
+    values = [
+        ["Current Score", ""],
         ["Team Name", "Total Points"]
-    ])
+    ]
 
-    score_cog.hunt_bot.sheet_data = df
-    score_cog.hunt_bot.table_map = {
-        "Current Score": {"start_col": 0, "end_col": len(df[0]) - 1}
-    }
+    sheet_state = HuntBot()
+    sheet_state.update_sheet_values(values)
+    score_cog.hunt_bot.get_typed_table = sheet_state.get_typed_table
 
     with pytest.raises(TableDataImportException):
         score_cog.get_score()
@@ -144,7 +168,19 @@ def test_determine_lead_tie(score_cog):
 
 
 @pytest.mark.asyncio
-async def test_start_scores_updates_message_success(score_cog):
+async def test_update_plugin_gdoc_scores_queues_batched_writes(score_cog):
+    score_cog.team1_points = 12
+    score_cog.team2_points = 34
+
+    await score_cog.update_plugin_gdoc_scores()
+
+    assert score_cog.gdoc.queue_cell_write.call_count == 2
+    written = {call.kwargs["cell"]: call.kwargs["value"] for call in score_cog.gdoc.queue_cell_write.call_args_list}
+    assert written == {"B13": 12, "B14": 34}
+
+
+@pytest.mark.asyncio
+async def test_score_table_change_updates_message_success(score_cog):
     # Mark configured
     score_cog.configured = True
     # Setup mock channel & message
@@ -159,16 +195,66 @@ async def test_start_scores_updates_message_success(score_cog):
     score_cog.team1_points = 50
     score_cog.team2_points = 40
     score_cog.lead_message = "Lead message"
+    rows = [{"Team Name": "Team Red", "Total Points": 50}]
 
-    await score_cog.start_scores()
+    await score_cog.on_score_table_changed("Current Score", rows)
 
-    score_cog.get_score.assert_called_once()
+    score_cog.hunt_bot.get_typed_table.assert_called_once_with("Current Score")
+    score_cog.get_score.assert_called_once_with(score_cog.hunt_bot.get_typed_table.return_value)
     score_cog.determine_lead.assert_called_once()
     score_cog.message.edit.assert_awaited_once_with(content=score_cog.score_message)
     assert "Team Red: 50" in score_cog.score_message
     assert "Team Blue: 40" in score_cog.score_message
 
 
+@pytest.mark.asyncio
+async def test_start_scores_skips_once_message_posted(score_cog):
+    score_cog.configured = True
+    score_cog.discord_bot.get_channel.return_value = AsyncMock()
+    score_cog.message = AsyncMock()
+    score_cog.get_score = MagicMock()
+
+    await score_cog.start_scores()
+
+    score_cog.get_score.assert_not_called()
+    score_cog.message.edit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_start_scores_posts_initial_message(score_cog):
+    score_cog.configured = True
+    channel = AsyncMock()
+    score_cog.discord_bot.get_channel.return_value = channel
+    score_cog.get_score = MagicMock()
+    score_cog.update_plugin_gdoc_scores = AsyncMock()
+
+    await score_cog.start_scores()
+
+    score_cog.get_score.assert_called_once_with(None)
+    channel.send.assert_awaited_once_with(score_cog.score_message)
+    assert score_cog.message == channel.send.return_value
+    score_cog.update_plugin_gdoc_scores.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_score_table_change_ignored_when_not_configured(score_cog):
+    score_cog.get_score = MagicMock()
+
+    await score_cog.on_score_table_changed("Current Score", [])
+
+    score_cog.get_score.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cog_load_subscribes_to_score_table(score_cog):
+    score_cog.get_score_channel = MagicMock()
+    score_cog.start_scores.start = MagicMock()
+
+    await score_cog.cog_load()
+
+    score_cog.hunt_bot.sheet_hub.subscribe.assert_called_once_with("Current Score", score_cog.on_score_table_changed)
+
+
 @pytest.mark.asyncio
 async def test_start_scores_channel_not_found(score_cog):
     score_cog.configured = True
@@ -178,7 +264,7 @@ async def test_start_scores_channel_not_found(score_cog):
 
 
 @pytest.mark.asyncio
-async def test_start_scores_message_notfound_sends_new(score_cog):
+async def test_score_table_change_message_notfound_sends_new(score_cog):
     score_cog.configured = True
     channel = AsyncMock()
     score_cog.discord_bot.get_channel.return_value = channel
@@ -196,7 +282,7 @@ async def test_start_scores_message_notfound_sends_new(score_cog):
     score_cog.team2_points = 10
     score_cog.lead_message = "Lead message"
 
-    await score_cog.start_scores()
+    await score_cog.on_score_table_changed("Current Score", [])
 
     channel.send.assert_awaited_once()
     assert score_cog.message == channel.send.return_value
@@ -220,3 +306,28 @@ async def test_before_start_scores_awaits_wait_until_ready(score_cog):
     score_cog.discord_bot.wait_until_ready = AsyncMock()
     await score_cog.before_start_scores()
     score_cog.discord_bot.wait_until_ready.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_loop_and_table_change_post_the_first_message_once(score_cog):
+    score_cog.configured = True
+    channel = AsyncMock()
+    score_cog.discord_bot.get_channel.return_value = channel
+    score_cog.get_score = MagicMock()
+    score_cog.update_plugin_gdoc_scores = AsyncMock()
+    sent = asyncio.Event()
+
+    async def slow_send(content):
+        await sent.wait()
+        return MagicMock(edit=AsyncMock())
+
+    channel.send = AsyncMock(side_effect=slow_send)
+
+    loop_post = asyncio.create_task(score_cog.start_scores())
+    change_post = asyncio.create_task(score_cog.on_score_table_changed("Current Score", []))
+    await asyncio.sleep(0)
+    sent.set()
+    await asyncio.gather(loop_post, change_post)
+
+    channel.send.assert_awaited_once()
+    score_cog.message.edit.assert_awaited_once_with(content=score_cog.score_message)
@@ -0,0 +1,155 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from huntbot.MemberTeamIndex import MemberTeamIndex
+from huntbot.cogs.StarBoard import StarBoardCog
+
+STARBOARD_ID = 10
+DROP_ID = 20
+GUILD_ID = 1
+
+
+def member(user_id: int, role_name: str):
+    role = MagicMock()
+    role.name = role_name
+    return SimpleNamespace(id=user_id, roles=[role])
+
+
+LEADER = member(5, "Red Team Leader")
+PLAYER = member(6, "Red Team")
+
+
+def message(message_id: int, content: str = "drop", reactions: dict = None):
+    return SimpleNamespace(id=message_id, content=content, attachments=[SimpleNamespace(url="https://img/1.png")],
+                           jump_url=f"https://discord.com/channels/1/{DROP_ID}/{message_id}",
+                           channel=SimpleNamespace(id=DROP_ID),
+                           reactions=[SimpleNamespace(emoji=e, count=c) for e, c in (reactions or {}).items()])
+
+
+def reaction(message_id: int, user, emoji: str = "⭐"):
+    return SimpleNamespace(channel_id=DROP_ID, message_id=message_id, guild_id=GUILD_ID, user_id=user.id,
+                           member=user, emoji=emoji)
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int) -> None:
+        self.id = channel_id
+        self.mention = f"<#{channel_id}>"
+        self.messages = {}
+        self.fetch_message = AsyncMock(side_effect=lambda message_id: self.messages[message_id])
+        self.send = AsyncMock(return_value=SimpleNamespace(id=900))
+        self.partial = SimpleNamespace(remove_reaction=AsyncMock(), delete=AsyncMock())
+        self.get_partial_message = MagicMock(return_value=self.partial)
+
+
+@pytest.fixture
+def channels():
+    return {STARBOARD_ID: FakeChannel(STARBOARD_ID), DROP_ID: FakeChannel(DROP_ID)}
+
+
+@pytest.fixture
+def cog(channels):
+    hunt_bot = SimpleNamespace(team_one_name="Red", team_two_name="Blue", config_map={})
+    hunt_bot.member_index = MemberTeamIndex(hunt_bot)
+    discord_bot = MagicMock()
+    discord_bot.get_channel.side_effect = channels.get
+    discord_bot.get_guild.return_value = SimpleNamespace(id=GUILD_ID, name="Hunt", chunked=True, members=[])
+    cog = StarBoardCog(discord_bot, hunt_bot)
+    cog.starboard_channel_id = STARBOARD_ID
+    cog.team1_drop_channel_id = DROP_ID
+    cog.team2_drop_channel_id = 21
+    return cog
+
+
+@pytest.mark.asyncio
+async def test_cached_message_is_starred_without_fetching(cog, channels):
+    await cog.on_message(message(100, "dragon pet"))
+
+    await cog.on_raw_reaction_add(reaction(100, LEADER))
+
+    starboard = channels[STARBOARD_ID]
+    assert "dragon pet\nhttps://img/1.png" in starboard.send.await_args.args[0]
+    assert cog.starred_messages == {100: 900}
+    assert cog.rest_calls == {"send": 1}
+    cog.discord_bot.fetch_user.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_falls_back_to_fetch(cog, channels):
+    channels[DROP_ID].messages[100] = message(100, reactions={"⭐": 1})
+
+    await cog.on_raw_reaction_add(reaction(100, LEADER))
+
+    channels[DROP_ID].fetch_message.assert_awaited_once_with(100)
+    assert cog.rest_calls == {"fetch_message": 1, "send": 1}
+    assert cog.message_cache.get(100).star_counts == {"⭐": 1}
+
+
+@pytest.mark.asyncio
+async def test_unauthorized_reaction_is_removed_with_one_call(cog, channels):
+    await cog.on_raw_reaction_add(reaction(100, PLAYER))
+
+    channels[DROP_ID].partial.remove_reaction.assert_awaited_once_with("⭐", PLAYER)
+    assert cog.rest_calls == {"remove_reaction": 1}
+    assert cog.starred_messages == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("role_name", ["red team leader", "staff", "Sheet Helper"])
+async def test_role_names_are_matched_case_sensitively(cog, channels, role_name):
+    await cog.on_raw_reaction_add(reaction(100, member(7, role_name)))
+
+    channels[DROP_ID].partial.remove_reaction.assert_awaited_once()
+    assert cog.starred_messages == {}
+
+
+@pytest.mark.asyncio
+async def test_payload_member_wins_over_stale_index_entry(cog, channels):
+    cog.hunt_bot.member_index.update_member(PLAYER)
+    promoted = member(PLAYER.id, "Red Team Leader")
+    await cog.on_message(message(100))
+
+    await cog.on_raw_reaction_add(reaction(100, promoted))
+
+    channels[DROP_ID].partial.remove_reaction.assert_not_awaited()
+    assert cog.starred_messages == {100: 900}
+    assert cog.hunt_bot.member_index.get(PLAYER.id).is_team_leader
+
+
+@pytest.mark.asyncio
+async def test_last_star_removed_deletes_starboard_message(cog, channels):
+    await cog.on_message(message(100))
+    await cog.on_raw_reaction_add(reaction(100, LEADER))
+    await cog.on_raw_reaction_add(reaction(100, LEADER, "🤔"))
+    # The duplicate is taken off again, which also sends a remove event
+    await cog.on_raw_reaction_remove(reaction(100, LEADER, "🤔"))
+    channels[STARBOARD_ID].partial.delete.assert_not_awaited()
+
+    await cog.on_raw_reaction_remove(reaction(100, LEADER))
+
+    channels[STARBOARD_ID].get_partial_message.assert_called_once_with(900)
+    channels[STARBOARD_ID].partial.delete.assert_awaited_once()
+    assert cog.starred_messages == {}
+    channels[DROP_ID].fetch_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_edited_message_is_fetched_again(cog, channels):
+    await cog.on_message(message(100, "old"))
+    await cog.on_raw_message_edit(SimpleNamespace(channel_id=DROP_ID, message_id=100))
+    channels[DROP_ID].messages[100] = message(100, "new", {"⭐": 1})
+
+    await cog.on_raw_reaction_add(reaction(100, LEADER))
+
+    assert "new" in channels[STARBOARD_ID].send.await_args.args[0]
+
+
+def test_message_cache_evicts_least_recently_used(cog):
+    cog.message_cache.max_size = 2
+    for message_id in (1, 2):
+        cog.message_cache.put(SimpleNamespace(message_id=message_id))
+    cog.message_cache.get(1)
+    cog.message_cache.put(SimpleNamespace(message_id=3))
+
+    assert list(cog.message_cache.messages) == [1, 3]
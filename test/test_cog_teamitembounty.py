@@ -2,6 +2,7 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
+from huntbot.MemberTeamIndex import MemberTeamIndex
 from huntbot.cogs.TeamItemBounty import TeamItemBountyCog, TeamItemBounty
 
 
@@ -12,6 +13,7 @@ def mock_hunt_bot():
     bot.team_two_name = "Blue"
     bot.team_one_chat_channel_id = 111
     bot.team_two_chat_channel_id = 222
+    bot.member_index = MemberTeamIndex(bot)
     return bot
 
 
@@ -0,0 +1,44 @@
+import pytest
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+import discord
+from huntbot.HuntBot import HuntBot
+from huntbot.RequestScheduler import RequestPriority
+from huntbot.commands.main_commands import sheet
+
+
+@pytest.fixture
+def mock_interaction():
+    interaction = AsyncMock(spec=discord.Interaction)
+    interaction.user = SimpleNamespace(roles=[SimpleNamespace(name="Admin")])
+    interaction.response = AsyncMock()
+    interaction.followup = AsyncMock()
+    return interaction
+
+
+@pytest.fixture
+def mock_gdoc():
+    gdoc = MagicMock()
+    gdoc.aget_sheet_values = AsyncMock(return_value=[])
+    return gdoc
+
+
+@pytest.mark.asyncio
+async def test_sheet_refreshes_under_the_refresh_lock(mock_interaction, mock_gdoc):
+    hunt_bot = HuntBot()
+    hunt_bot.polls_since_full_refresh = 0
+
+    async with hunt_bot.refresh_lock:
+        command = asyncio.create_task(sheet(mock_interaction, "sheet-id", "BotConfig", "Discord Conf",
+                                            mock_gdoc, hunt_bot))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        # A poll is refreshing, the command waits for it
+        mock_gdoc.aget_sheet_values.assert_not_awaited()
+
+    await command
+
+    mock_gdoc.aget_sheet_values.assert_awaited_once_with(spreadsheet_id="sheet-id", sheet_name="BotConfig",
+                                                         priority=RequestPriority.COMMAND)
+    mock_interaction.followup.send.assert_awaited_with("Sheet is empty or not configured properly.")
@@ -0,0 +1,166 @@
+import pytest
+import pytest_asyncio
+from googleapiclient.errors import HttpError
+from huntbot.CircuitBreaker import CircuitBreaker
+from huntbot.FakeSheetsServer import FakeSheetsServer
+from huntbot.GDoc import GDoc
+from huntbot.HuntBot import HuntBot
+from huntbot.RequestScheduler import RequestScheduler
+
+SHEET_ID = "fake-sheet"
+SHEET_VALUES = [
+    ["Current Score", "", "Single Bounties"],
+    ["Team Name", "Total Points", "Task", "Password"],
+    ["Team Red", "10", "Kill a dragon", "1234"],
+    ["Team Blue", "20"],
+]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest_asyncio.fixture
+async def server():
+    server = FakeSheetsServer(clock=FakeClock())
+    server.set_values(SHEET_ID, "Hunt", SHEET_VALUES)
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+def gdoc(server, monkeypatch):
+    monkeypatch.setenv("HUNTBOT_SHEETS_ENDPOINT", server.url)
+    gdoc = GDoc()
+    # No client side quota or backoff waits, the server decides what gets throttled
+    gdoc.scheduler = RequestScheduler(read_per_minute=6000, write_per_minute=6000, burst=100)
+    gdoc.RETRY_BASE_DELAY = 0.01
+    yield gdoc
+    gdoc.close()
+
+
+@pytest.mark.asyncio
+async def test_read_whole_sheet(server, gdoc):
+    assert await gdoc.aget_sheet_values(SHEET_ID, "Hunt") == SHEET_VALUES
+    assert server.requests["get"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_range_is_trimmed(gdoc):
+    assert await gdoc.aget_sheet_values(SHEET_ID, "Hunt", "B3:D4") == [["10", "Kill a dragon", "1234"], ["20"]]
+
+
+@pytest.mark.asyncio
+async def test_write_cell_is_read_back_as_text(server, gdoc):
+    assert await gdoc.awrite_cell(SHEET_ID, "Hunt", "B3", 11) is True
+
+    assert server.get_values(SHEET_ID, "Hunt")[2][1] == "11"
+    assert server.requests["update"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_column_grows_sheet(server, gdoc):
+    assert await gdoc.awrite_column(SHEET_ID, "Hunt", "F1", ["a", "b"]) is True
+
+    values = server.get_values(SHEET_ID, "Hunt")
+    assert values[0][5] == "a"
+    assert values[1] == ["Team Name", "Total Points", "Task", "Password", "", "b"]
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_uses_one_batch_update(server, gdoc):
+    gdoc.queue_cell_write(SHEET_ID, "Hunt", "B3", 12)
+    gdoc.queue_cell_write(SHEET_ID, "Hunt", "B4", True)
+
+    assert await gdoc.aflush_writes() is True
+
+    assert server.requests["batchUpdate"] == 1
+    assert server.cells_written == 2
+    assert [row[1] for row in server.get_values(SHEET_ID, "Hunt")[2:]] == ["12", "TRUE"]
+
+
+@pytest.mark.asyncio
+async def test_hunt_bot_refresh_round_trip(server, gdoc):
+    hunt_bot = HuntBot()
+    hunt_bot.set_sheet_id(SHEET_ID)
+    hunt_bot.set_sheet_name("Hunt")
+    hunt_bot.subscribe_table("Current Score")
+
+    assert await hunt_bot.refresh_sheet_values(gdoc) is True
+    assert hunt_bot.get_typed_table("Current Score")[1]["Total Points"] == 20
+
+    server.set_values(SHEET_ID, "Hunt", SHEET_VALUES[:3] + [["Team Blue", "25"]])
+    # Only the subscribed table is re-read, with a batchGet
+    assert await hunt_bot.refresh_sheet_values(gdoc) is True
+    assert server.requests["batchGet"] == 1
+    assert hunt_bot.get_typed_table("Current Score")[1]["Total Points"] == 25
+
+
+@pytest.mark.asyncio
+async def test_unknown_sheet_is_a_bad_request(gdoc):
+    with pytest.raises(HttpError) as error:
+        await gdoc.aget_sheet_values(SHEET_ID, "Missing")
+
+    assert error.value.resp.status == 400
+
+
+@pytest.mark.asyncio
+async def test_unknown_spreadsheet_is_not_found(gdoc):
+    with pytest.raises(HttpError) as error:
+        await gdoc.aget_sheet_values("missing", "Hunt")
+
+    assert error.value.resp.status == 404
+
+
+@pytest.mark.asyncio
+async def test_read_quota_is_enforced(server, gdoc):
+    server.quotas["read"] = 2
+    gdoc.MAX_READ_RETRIES = 0
+
+    await gdoc.aget_sheet_values(SHEET_ID, "Hunt")
+    await gdoc.aget_sheet_values(SHEET_ID, "Hunt")
+    with pytest.raises(HttpError) as error:
+        await gdoc.aget_sheet_values(SHEET_ID, "Hunt")
+
+    assert GDoc.is_throttled(error.value)
+    assert server.throttled_requests == 1
+
+    # The quota window slides
+    server.clock.now = server.quota_window
+    assert await gdoc.aget_sheet_values(SHEET_ID, "Hunt") == SHEET_VALUES
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_are_retried(server, gdoc):
+    server.fail_next(2, status=503)
+
+    assert await gdoc.aget_sheet_values(SHEET_ID, "Hunt") == SHEET_VALUES
+    assert server.injected_errors == 2
+    assert gdoc.retried_reads == 2
+
+
+@pytest.mark.asyncio
+async def test_persistent_errors_open_the_breaker(server, gdoc):
+    server.error_rate = 1.0
+    gdoc.MAX_READ_RETRIES = 10
+
+    with pytest.raises(HttpError):
+        await gdoc.aget_sheet_values(SHEET_ID, "Hunt")
+
+    assert gdoc.breaker.state == CircuitBreaker.OPEN
+    assert server.injected_errors == gdoc.breaker.failure_threshold
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_requeued(server, gdoc):
+    server.fail_next(1, status=500)
+    gdoc.queue_cell_write(SHEET_ID, "Hunt", "B3", 13)
+
+    assert await gdoc.aflush_writes() is False
+    assert await gdoc.aflush_writes() is True
+    assert server.get_values(SHEET_ID, "Hunt")[2][1] == "13"
@@ -0,0 +1,535 @@
+import pytest
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+import pandas as pd
+from huntbot.GDoc import GDoc
+from huntbot.RequestScheduler import RequestPriority
+from huntbot.exceptions import CircuitOpenException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def gdoc():
+    with patch.object(GDoc, "on_startup"):
+        gdoc = GDoc(max_workers=2)
+    gdoc.sheets = MagicMock()
+    yield gdoc
+    gdoc.close()
+
+
+@pytest.mark.asyncio
+async def test_aget_data_from_sheet_runs_off_event_loop_thread(gdoc):
+    calling_threads = []
+
+    def execute(http=None):
+        calling_threads.append(threading.current_thread())
+        return {"values": [["Current Score", ""], ["Team Name", "Total Points"], ["Team Red", "5"]]}
+
+    gdoc.sheets.values.return_value.get.return_value.execute.side_effect = execute
+
+    df = await gdoc.aget_data_from_sheet(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    assert isinstance(df, pd.DataFrame)
+    assert df.iloc[2, 1] == "5"
+    assert calling_threads and calling_threads[0] is not threading.main_thread()
+    gdoc.sheets.values.return_value.get.assert_called_with(spreadsheetId="sheet", range="Hunt")
+
+
+@pytest.mark.asyncio
+async def test_aget_data_from_sheet_returns_empty_dataframe_on_error(gdoc):
+    gdoc.sheets.values.return_value.get.return_value.execute.side_effect = RuntimeError("boom")
+
+    df = await gdoc.aget_data_from_sheet(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    assert df.empty
+
+
+@pytest.mark.asyncio
+async def test_aget_sheet_values_returns_raw_rows(gdoc):
+    gdoc.sheets.values.return_value.get.return_value.execute.return_value = {"values": [["a", "b"], ["c"]]}
+
+    values = await gdoc.aget_sheet_values(spreadsheet_id="sheet", sheet_name="Hunt", cell_range="A1:B2")
+
+    assert values == [["a", "b"], ["c"]]
+    gdoc.sheets.values.return_value.get.assert_called_with(spreadsheetId="sheet", range="Hunt!A1:B2")
+
+
+@pytest.mark.asyncio
+async def test_aget_sheet_values_raises_on_error(gdoc):
+    gdoc.sheets.values.return_value.get.return_value.execute.side_effect = RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await gdoc.aget_sheet_values(spreadsheet_id="sheet", sheet_name="Hunt")
+
+
+@pytest.mark.asyncio
+async def test_awrite_cell_writes_single_cell(gdoc):
+    result = await gdoc.awrite_cell(spreadsheet_id="sheet", sheet_name="Config", cell="B13", value=42)
+
+    assert result is True
+    gdoc.sheets.values.return_value.update.assert_called_once_with(
+        spreadsheetId="sheet", range="Config!B13", valueInputOption="RAW", body={"values": [[42]]})
+
+
+@pytest.mark.asyncio
+async def test_awrite_column_rejects_non_list(gdoc):
+    result = await gdoc.awrite_column(spreadsheet_id="sheet", sheet_name="Config", start_cell="F1", values="abc")
+
+    assert result is False
+
+
+@pytest.mark.asyncio
+async def test_queued_writes_flush_as_one_batch_update(gdoc):
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=1)
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B14", value=2)
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=3)
+
+    result = await gdoc.aflush_writes()
+
+    assert result is True
+    assert gdoc.pending_writes == {}
+    gdoc.sheets.values.return_value.batchUpdate.assert_called_once_with(spreadsheetId="plugin", body={
+        "valueInputOption": "RAW",
+        "data": [{"range": "Config!B13", "values": [[3]]}, {"range": "Config!B14", "values": [[2]]}],
+    })
+    gdoc.sheets.values.return_value.update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_writes(gdoc):
+    gdoc.sheets.values.return_value.batchUpdate.return_value.execute.side_effect = RuntimeError("quota")
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B10", value="pw")
+
+    result = await gdoc.aflush_writes()
+
+    assert result is False
+    assert gdoc.pending_writes == {"plugin": {"Config!B10": "pw"}}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_queued_write_is_suppressed(gdoc):
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=10)
+    await gdoc.aflush_writes()
+
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=10)
+
+    assert gdoc.pending_writes == {}
+    assert gdoc.suppressed_writes == 1
+    assert gdoc.written_values == {("plugin", "Config!B13"): 10}
+
+
+@pytest.mark.asyncio
+async def test_reverting_to_written_value_drops_pending_write(gdoc):
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=10)
+    await gdoc.aflush_writes()
+
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=11)
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=10)
+
+    assert gdoc.pending_writes == {}
+    assert gdoc.sheets.values.return_value.batchUpdate.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_reverting_while_write_is_in_flight_is_sent(gdoc):
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=10)
+    await gdoc.aflush_writes()
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=11)
+
+    batch_write_cells = gdoc.batch_write_cells
+
+    def revert_during_send(spreadsheet_id, writes):
+        # The old value is queued again while 11 is on its way
+        gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=10)
+        return batch_write_cells(spreadsheet_id, writes)
+
+    gdoc.batch_write_cells = revert_during_send
+    await gdoc.aflush_writes()
+    gdoc.batch_write_cells = batch_write_cells
+
+    assert gdoc.pending_writes == {"plugin": {"Config!B13": 10}}
+    assert gdoc.inflight_writes == {}
+    await gdoc.aflush_writes()
+    assert gdoc.written_values == {("plugin", "Config!B13"): 10}
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_not_shadowed(gdoc):
+    gdoc.sheets.values.return_value.batchUpdate.return_value.execute.side_effect = RuntimeError("quota")
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=10)
+    await gdoc.aflush_writes()
+
+    assert gdoc.written_values == {}
+
+
+@pytest.mark.asyncio
+async def test_write_cell_skips_unchanged_value_until_forgotten(gdoc):
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="B9", value="pw")
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="B9", value="pw")
+
+    assert gdoc.sheets.values.return_value.update.call_count == 1
+    assert gdoc.suppressed_writes == 1
+
+    gdoc.forget_written_values("plugin")
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="B9", value="pw")
+
+    assert gdoc.sheets.values.return_value.update.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_written_values_expire(gdoc):
+    clock = FakeClock()
+    gdoc.clock = clock
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="B9", value="pw")
+
+    clock.now = GDoc.WRITTEN_VALUE_TTL - 1
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="B9", value="pw")
+    assert gdoc.sheets.values.return_value.update.call_count == 1
+
+    clock.now = GDoc.WRITTEN_VALUE_TTL
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="B9", value="pw")
+    assert gdoc.sheets.values.return_value.update.call_count == 2
+
+
+@pytest.mark.parametrize("col, letter", [(0, "A"), (25, "Z"), (26, "AA"), (27, "AB"), (701, "ZZ"), (702, "AAA")])
+def test_column_letter(col, letter):
+    assert GDoc.column_letter(col) == letter
+
+
+@pytest.mark.parametrize("a1_range, bounds", [
+    ("Hunt!C5:D7", ("Hunt", 2, 4, 3, 6)),
+    ("C5", (None, 2, 4, 2, 4)),
+    ("C:D", (None, 2, None, 3, None)),
+    ("'My Sheet'!$AA$1:AB", ("My Sheet", 26, 0, 27, None)),
+])
+def test_parse_a1_range(a1_range, bounds):
+    assert GDoc.parse_a1_range(a1_range) == bounds
+
+
+@pytest.mark.parametrize("a1_range", ["5:6", "", "Hunt!"])
+def test_parse_a1_range_invalid(a1_range):
+    with pytest.raises(ValueError):
+        GDoc.parse_a1_range(a1_range)
+
+
+def test_table_a1_ranges_skips_unknown_tables():
+    table_map = {"Current Score": {"start_col": 2, "end_col": 3}, "Config": {"start_col": 5}}
+
+    ranges = GDoc.table_a1_ranges("Hunt", table_map, ["Current Score", "Config", "Missing"])
+
+    assert ranges == {"Current Score": "Hunt!C:D", "Config": "Hunt!F:F"}
+
+
+STACKED_SHEET = [
+    ["Discord Conf", "", "Notes"],
+    ["Key", "Value", "Note"],
+    ["A", "1", "n1"],
+    ["B", "2", ""],
+    [],
+    ["Current Score"],
+    ["Team Name", "Total Points"],
+    ["Team Red", "10"],
+    ["", "", "n2"],
+    ["Leaderboard"],
+    ["Player", "Points"],
+    ["Zezima", "99"],
+]
+
+
+def test_build_table_map_side_by_side_tables():
+    df = GDoc.build_dataframe(FULL_SHEET)
+
+    assert GDoc.build_table_map(df) == TABLE_MAP
+
+
+def test_build_table_map_detects_stacked_tables():
+    df = GDoc.build_dataframe(STACKED_SHEET)
+
+    table_map = GDoc.build_table_map(df, stacked_tables={"Current Score", "Leaderboard"})
+
+    assert table_map == {
+        "Discord Conf": {"start_col": 0, "end_col": 1, "end_row": 4},
+        "Current Score": {"start_col": 0, "end_col": 1, "start_row": 5, "end_row": 8},
+        "Leaderboard": {"start_col": 0, "end_col": 1, "start_row": 9, "end_row": 11},
+        "Notes": {"start_col": 2},
+    }
+    assert GDoc.extract_table(df, table_map, "Discord Conf").to_dict("records") == [
+        {"Key": "A", "Value": "1"}, {"Key": "B", "Value": "2"}]
+    assert GDoc.extract_table(df, table_map, "Current Score").to_dict("records") == [
+        {"Team Name": "Team Red", "Total Points": "10"}]
+    assert GDoc.extract_table(df, table_map, "Leaderboard").to_dict("records") == [
+        {"Player": "Zezima", "Points": "99"}]
+    assert GDoc.extract_table(df, table_map, "Notes")["Note"].tolist() == ["n1", "n2"]
+
+
+def test_build_table_map_only_stacks_listed_tables():
+    # A note row after a blank row in a Key/Value table has the shape of a stacked table's label
+    values = [["Config", ""], ["Key", "Value"], ["START", "1"], ["", ""], ["NOTE", ""], ["END", "3"]]
+    df = GDoc.build_dataframe(values)
+
+    assert GDoc.build_table_map(df) == {"Config": {"start_col": 0, "end_col": 1}}
+    assert GDoc.build_table_map(df, stacked_tables={"Leaderboard"}) == {"Config": {"start_col": 0, "end_col": 1}}
+
+
+def test_build_table_map_ignores_partial_rows_after_gaps():
+    # A row with only the first cell filled is data, not a label, unless a full header row follows
+    values = [["Current Score", ""], ["Team Name", "Total Points"], ["Team Red", "10"], [], ["Team Blue"],
+              ["Team Green", ""]]
+
+    assert GDoc.build_table_map(GDoc.build_dataframe(values)) == {"Current Score": {"start_col": 0, "end_col": 1}}
+
+
+FULL_SHEET = [
+    ["Discord Conf", "", "Current Score"],
+    ["Key", "Value", "Team Name", "Total Points"],
+    ["A", "1", "Team Red", "10"],
+    ["B", "2", "Team Blue", "20"],
+]
+TABLE_MAP = {"Discord Conf": {"start_col": 0, "end_col": 1}, "Current Score": {"start_col": 2, "end_col": 3}}
+
+
+@pytest.mark.asyncio
+async def test_aget_table_values_only_fetches_subscribed_tables(gdoc):
+    score_block = [["Current Score"], ["Team Name", "Total Points"], ["Team Red", "15"], ["Team Blue", "20"]]
+    gdoc.sheets.values.return_value.batchGet.return_value.execute.return_value = {
+        "valueRanges": [{"range": "Hunt!C1:D4", "values": score_block}]}
+
+    values = await gdoc.aget_table_values(spreadsheet_id="sheet", sheet_name="Hunt", table_map=TABLE_MAP,
+                                          table_names=["Current Score"], base_values=FULL_SHEET)
+
+    gdoc.sheets.values.return_value.batchGet.assert_called_once_with(spreadsheetId="sheet", ranges=["Hunt!C:D"])
+    assert values[2] == ["A", "1", "Team Red", "15"]
+    assert values[3] == FULL_SHEET[3]
+    assert FULL_SHEET[2][3] == "10"
+
+
+def test_get_table_values_matches_base_when_unchanged(gdoc):
+    score_block = [row[2:] for row in FULL_SHEET]
+    gdoc.sheets.values.return_value.batchGet.return_value.execute.return_value = {
+        "valueRanges": [{"values": score_block}]}
+
+    values = gdoc.get_table_values("sheet", "Hunt", TABLE_MAP, ["Current Score"], FULL_SHEET)
+
+    assert values == FULL_SHEET
+
+
+def test_get_table_values_handles_shrinking_and_growing_tables(gdoc):
+    score_block = [["Current Score"], ["Team Name", "Total Points"], ["Team Red", "10"], [], [], ["Team Green", "5"]]
+    gdoc.sheets.values.return_value.batchGet.return_value.execute.return_value = {
+        "valueRanges": [{"values": score_block}]}
+
+    values = gdoc.get_table_values("sheet", "Hunt", TABLE_MAP, ["Current Score"], FULL_SHEET)
+
+    assert values == [
+        ["Discord Conf", "", "Current Score"],
+        ["Key", "Value", "Team Name", "Total Points"],
+        ["A", "1", "Team Red", "10"],
+        ["B", "2"],
+        [],
+        ["", "", "Team Green", "5"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flush_schedules_batch_with_highest_pending_priority(gdoc):
+    gdoc.scheduler.acquire = AsyncMock(return_value=0.0)
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B13", value=1,
+                          priority=RequestPriority.SCORE)
+    gdoc.queue_cell_write(spreadsheet_id="plugin", sheet_name="Config", cell="B10", value="pw",
+                          priority=RequestPriority.PASSWORD)
+
+    await gdoc.aflush_writes()
+
+    gdoc.scheduler.acquire.assert_awaited_once_with("write", priority=RequestPriority.PASSWORD, source="plugin")
+    assert gdoc.pending_priorities == {}
+
+
+@pytest.mark.asyncio
+async def test_reads_are_scheduled_as_polls_by_default(gdoc):
+    gdoc.scheduler.acquire = AsyncMock(return_value=0.0)
+    gdoc.sheets.values.return_value.get.return_value.execute.return_value = {"values": []}
+
+    await gdoc.aget_sheet_values(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    gdoc.scheduler.acquire.assert_awaited_once_with("read", priority=RequestPriority.POLL, source="sheet")
+
+
+@pytest.mark.asyncio
+async def test_suppressed_write_does_not_use_quota(gdoc):
+    gdoc.remember_written_value("plugin", "Config!B9", "pw")
+    gdoc.scheduler.acquire = AsyncMock(return_value=0.0)
+
+    assert await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="B9", value="pw") is True
+
+    gdoc.scheduler.acquire.assert_not_awaited()
+
+
+def http_error(status):
+    error = Exception(f"HTTP {status}")
+    error.resp = MagicMock(status=status)
+    return error
+
+
+@pytest.mark.asyncio
+async def test_transient_read_errors_are_retried(gdoc):
+    gdoc.sheets.values.return_value.get.return_value.execute.side_effect = [
+        http_error(503), ConnectionResetError("reset"), {"values": [["A"]]}]
+
+    with patch("huntbot.GDoc.asyncio.sleep", new=AsyncMock()) as sleep:
+        values = await gdoc.aget_sheet_values(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    assert values == [["A"]]
+    assert gdoc.retried_reads == 2
+    assert sleep.await_count == 2
+    assert gdoc.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_non_transient_read_errors_are_not_retried(gdoc):
+    gdoc.sheets.values.return_value.get.return_value.execute.side_effect = http_error(400)
+
+    with pytest.raises(Exception, match="HTTP 400"):
+        await gdoc.aget_sheet_values(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    assert gdoc.retried_reads == 0
+    assert gdoc.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_using_quota(gdoc):
+    gdoc.sheets.values.return_value.get.return_value.execute.side_effect = http_error(500)
+
+    with patch("huntbot.GDoc.asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(Exception, match="HTTP 500"):
+            await gdoc.aget_sheet_values(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    assert gdoc.breaker.state == "open"
+    # The breaker opened on its failure threshold before the retries ran out
+    assert gdoc.retried_reads == gdoc.breaker.failure_threshold - 1
+
+    gdoc.scheduler.acquire = AsyncMock(return_value=0.0)
+    with pytest.raises(CircuitOpenException):
+        await gdoc.aget_sheet_values(spreadsheet_id="sheet", sheet_name="Hunt")
+    gdoc.scheduler.acquire.assert_not_awaited()
+
+
+def test_retry_delay_is_bounded(gdoc):
+    for attempt in range(10):
+        assert 0 <= gdoc.retry_delay(attempt) <= min(GDoc.RETRY_MAX_DELAY, GDoc.RETRY_BASE_DELAY * 2 ** attempt)
+
+
+def test_get_data_from_sheet_serves_last_good_copy_on_error(gdoc):
+    execute = gdoc.sheets.values.return_value.get.return_value.execute
+    execute.return_value = {"values": [["Current Score", ""], ["Team Name", "Total Points"]]}
+    gdoc.get_data_from_sheet(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    execute.side_effect = RuntimeError("boom")
+    df = gdoc.get_data_from_sheet(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    assert df.iloc[1, 1] == "Total Points"
+
+
+@pytest.mark.asyncio
+async def test_aget_data_from_sheet_retries_then_serves_last_good_copy(gdoc):
+    execute = gdoc.sheets.values.return_value.get.return_value.execute
+    execute.return_value = {"values": [["Current Score", ""], ["Team Name", "Total Points"]]}
+    await gdoc.aget_data_from_sheet(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    execute.side_effect = http_error(503)
+    with patch("huntbot.GDoc.asyncio.sleep", new=AsyncMock()):
+        df = await gdoc.aget_data_from_sheet(spreadsheet_id="sheet", sheet_name="Hunt")
+
+    assert df.iloc[1, 1] == "Total Points"
+    assert gdoc.retried_reads == GDoc.MAX_READ_RETRIES
+    assert gdoc.breaker.failures == GDoc.MAX_READ_RETRIES + 1
+
+
+@pytest.mark.parametrize("error, transient", [
+    (http_error(429), True),
+    (http_error(502), True),
+    (http_error(404), False),
+    (TimeoutError("timed out"), True),
+    (ValueError("bad"), False),
+])
+def test_is_transient(error, transient):
+    assert GDoc.is_transient(error) is transient
+
+
+def test_sheets_client_is_built_lazily_once():
+    with patch.object(GDoc, "on_startup"), patch("googleapiclient.discovery.build") as build:
+        gdoc = GDoc(max_workers=1)
+        gdoc.credentials = MagicMock()
+        build.assert_not_called()
+
+        sheets = gdoc.sheets
+        assert gdoc.sheets is sheets
+
+    build.assert_called_once()
+    assert build.call_args.kwargs["static_discovery"] is True
+    assert sheets is build.return_value.spreadsheets.return_value
+    gdoc.close()
+
+
+def test_reads_see_own_writes_until_confirmed(gdoc):
+    values_api = gdoc.sheets.values.return_value
+    values_api.get.return_value.execute.return_value = {"values": [["Key", "Value"], ["Password", "old"]]}
+    assert gdoc.get_sheet_values("plugin", "Config") == [["Key", "Value"], ["Password", "old"]]
+
+    gdoc.write_cell("plugin", "Config", "B2", "new")
+
+    # The cached copy is served with the write applied, without an API call
+    values_api.get.reset_mock()
+    assert gdoc.cached_sheet_values("plugin", "Config") == [["Key", "Value"], ["Password", "new"]]
+    values_api.get.assert_not_called()
+
+    values_api.get.return_value.execute.return_value = {"values": [["Key", "Value"], ["Password", "new"]]}
+    gdoc.get_sheet_values("plugin", "Config")
+    assert gdoc.overlay.confirmed_writes == 1
+    assert gdoc.overlay.pending("plugin", "Config") == 0
+
+
+def test_read_contradicting_write_invalidates_shadow_copy(gdoc):
+    gdoc.write_cell("plugin", "Config", "B13", 10)
+    assert ("plugin", "Config!B13") in gdoc.written_values
+
+    gdoc.sheets.values.return_value.get.return_value.execute.return_value = {"values": [["12"]]}
+    values = gdoc.get_sheet_values("plugin", "Config", "B13")
+
+    assert values == [["12"]]
+    assert ("plugin", "Config!B13") not in gdoc.written_values
+    assert gdoc.overlay.invalidated_writes == 1
+
+
+@pytest.mark.asyncio
+async def test_write_column_updates_written_values(gdoc):
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="D2", value="old")
+    gdoc.write_column("plugin", "Config", "D1", ["a", "new"])
+
+    assert gdoc.written_values == {("plugin", "Config!D1"): "a", ("plugin", "Config!D2"): "new"}
+
+    # Writing back the value the column replaced must go out
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="D2", value="old")
+    assert gdoc.sheets.values.return_value.update.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_write_column_drops_written_values(gdoc):
+    await gdoc.awrite_cell(spreadsheet_id="plugin", sheet_name="Config", cell="D2", value="old")
+    gdoc.sheets.values.return_value.update.return_value.execute.side_effect = RuntimeError("quota")
+
+    assert gdoc.write_column("plugin", "Config", "D1", ["a", "new"]) is False
+    assert gdoc.written_values == {}
+
+
+def test_batch_and_column_writes_are_overlaid(gdoc):
+    gdoc.batch_write_cells("plugin", {"Config!B13": 10, "Config!B14": 12})
+    gdoc.write_column("plugin", "Config", "D1", ["a", "b"])
+
+    assert gdoc.overlay.pending("plugin", "Config") == 4
@@ -1,4 +1,7 @@
+import gzip
+import json
 import pytest
+from unittest.mock import AsyncMock, MagicMock
 from huntbot.HuntBot import HuntBot
 
 
@@ -21,3 +24,322 @@ def test_generate_wom_competition_urls_with_zero_id(hunt_bot):
 
     assert hunt_bot.wom_event_api_url.endswith("0")
     assert hunt_bot.wom_event_website_url.endswith("0")
+
+
+SHEET_VALUES = [
+    ["Current Score", ""],
+    ["Team Name", "Total Points"],
+    ["Team Red", "10"],
+]
+
+
+def test_update_sheet_values_publishes_new_version(hunt_bot):
+    changed = hunt_bot.update_sheet_values(SHEET_VALUES)
+
+    assert changed is True
+    assert hunt_bot.sheet_version == 1
+    assert hunt_bot.sheet_hash
+    assert hunt_bot.sheet_data.iloc[2, 1] == "10"
+    assert hunt_bot.table_map == {"Current Score": {"start_col": 0, "end_col": 1}}
+
+
+def test_update_sheet_values_skips_unchanged_sheet(hunt_bot):
+    hunt_bot.update_sheet_values(SHEET_VALUES)
+    sheet_data = hunt_bot.sheet_data
+
+    changed = hunt_bot.update_sheet_values([list(row) for row in SHEET_VALUES])
+
+    assert changed is False
+    assert hunt_bot.sheet_version == 1
+    assert hunt_bot.sheet_data is sheet_data
+
+
+def test_update_sheet_values_detects_cell_change(hunt_bot):
+    hunt_bot.update_sheet_values(SHEET_VALUES)
+    first_hash = hunt_bot.sheet_hash
+
+    changed = hunt_bot.update_sheet_values(SHEET_VALUES[:2] + [["Team Red", "11"]])
+
+    assert changed is True
+    assert hunt_bot.sheet_version == 2
+    assert hunt_bot.sheet_hash != first_hash
+
+
+def test_set_sheet_data_bumps_version(hunt_bot):
+    hunt_bot.update_sheet_values(SHEET_VALUES)
+    hunt_bot.set_sheet_data(hunt_bot.sheet_data)
+
+    assert hunt_bot.sheet_version == 2
+    # The same payload must be republished after a manual override
+    assert hunt_bot.update_sheet_values(SHEET_VALUES) is True
+
+
+def test_get_records_is_cached_per_sheet_version(hunt_bot):
+    hunt_bot.update_sheet_values(SHEET_VALUES)
+
+    first = hunt_bot.get_records("Current Score")
+
+    assert first == ({"Team Name": "Team Red", "Total Points": "10"},)
+    assert hunt_bot.get_records("Current Score") is first
+
+    hunt_bot.update_sheet_values(SHEET_VALUES[:2] + [["Team Red", "11"]])
+
+    assert hunt_bot.get_records("Current Score") == ({"Team Name": "Team Red", "Total Points": "11"},)
+    assert hunt_bot.get_records("Single Bounties") == ()
+
+
+def test_get_records_are_read_only(hunt_bot):
+    hunt_bot.update_sheet_values(SHEET_VALUES)
+    records = hunt_bot.get_records("Current Score")
+
+    with pytest.raises(TypeError):
+        records[0]["Total Points"] = "99"
+    with pytest.raises(AttributeError):
+        records.append({"Team Name": "Team Blue"})
+
+    assert hunt_bot.get_records("Current Score") == ({"Team Name": "Team Red", "Total Points": "10"},)
+
+
+@pytest.fixture
+def mock_gdoc():
+    gdoc = MagicMock()
+    gdoc.aget_sheet_values = AsyncMock(return_value=SHEET_VALUES)
+    gdoc.aget_table_values = AsyncMock(return_value=SHEET_VALUES)
+    return gdoc
+
+
+@pytest.mark.asyncio
+async def test_refresh_sheet_values_starts_with_full_fetch(hunt_bot, mock_gdoc):
+    hunt_bot.subscribe_table("Current Score")
+
+    changed = await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    assert changed is True
+    mock_gdoc.aget_sheet_values.assert_awaited_once()
+    mock_gdoc.aget_table_values.assert_not_awaited()
+    # Hand edits to cells the bot writes are picked up by rewriting them after a full refresh
+    mock_gdoc.forget_written_values.assert_called_once_with(hunt_bot.sheet_id)
+
+
+@pytest.mark.asyncio
+async def test_refresh_sheet_values_fetches_subscribed_tables_after_first_fetch(hunt_bot, mock_gdoc):
+    hunt_bot.subscribe_table("Current Score")
+    hunt_bot.subscribe_table("Not A Table")
+    await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    changed = await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    assert changed is False
+    mock_gdoc.aget_table_values.assert_awaited_once()
+    assert mock_gdoc.aget_table_values.await_args.kwargs["table_names"] == ["Current Score", "Not A Table"]
+    assert hunt_bot.polls_since_full_refresh == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_sheet_values_periodically_does_full_refresh(hunt_bot, mock_gdoc):
+    hunt_bot.subscribe_table("Current Score")
+    hunt_bot.full_refresh_interval = 2
+
+    for _ in range(4):
+        await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    assert mock_gdoc.aget_sheet_values.await_count == 2
+    assert mock_gdoc.aget_table_values.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_last_good_snapshot(hunt_bot, mock_gdoc):
+    hunt_bot.subscribe_table("Current Score")
+    await hunt_bot.refresh_sheet_values(mock_gdoc)
+    version = hunt_bot.sheet_version
+    mock_gdoc.aget_table_values.side_effect = RuntimeError("Sheets API down")
+
+    with pytest.raises(RuntimeError):
+        await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    assert hunt_bot.sheet_version == version
+    assert hunt_bot.stale_since is not None
+    assert hunt_bot.failed_refreshes == 1
+    assert hunt_bot.get_records("Current Score") == ({"Team Name": "Team Red", "Total Points": "10"},)
+
+    mock_gdoc.aget_table_values.side_effect = None
+    await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    assert hunt_bot.stale_since is None
+    assert hunt_bot.failed_refreshes == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_sheet_values_without_subscriptions_fetches_whole_sheet(hunt_bot, mock_gdoc):
+    await hunt_bot.refresh_sheet_values(mock_gdoc)
+    await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    assert mock_gdoc.aget_sheet_values.await_count == 2
+    mock_gdoc.aget_table_values.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_refresh_sheet_values_reads_requested_tables(hunt_bot, mock_gdoc):
+    hunt_bot.subscribe_table("Current Score")
+    hunt_bot.subscribe_table("Not A Table")
+    await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    await hunt_bot.refresh_sheet_values(mock_gdoc, table_names=["Current Score"])
+
+    assert mock_gdoc.aget_table_values.await_args.kwargs["table_names"] == ["Current Score"]
+
+
+@pytest.mark.asyncio
+async def test_request_full_refresh(hunt_bot, mock_gdoc):
+    hunt_bot.subscribe_table("Current Score")
+    await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    hunt_bot.request_full_refresh()
+    await hunt_bot.refresh_sheet_values(mock_gdoc)
+
+    assert mock_gdoc.aget_sheet_values.await_count == 2
+    mock_gdoc.aget_table_values.assert_not_awaited()
+
+
+STACKED_VALUES = [
+    ["Discord Conf", "", "Current Score", ""],
+    ["Key", "Value", "Team Name", "Total Points"],
+    ["A", "1", "Team Red", "10"],
+    ["", "", "Team Blue", "20"],
+    ["Bounties", ""],
+    ["Item", "Reward"],
+    ["Whip", "5"],
+]
+
+
+@pytest.mark.parametrize("ranges, tables", [
+    (["Hunt!D3"], ["Current Score"]),
+    (["C3:D4", "Hunt!B3"], ["Current Score", "Discord Conf"]),
+    (["A6:B7"], ["Bounties"]),
+    (["A3:A7"], None),  # Crosses the label row of the stacked table
+    (["Hunt!A1"], None),  # Table label row
+    (["C:D"], None),  # Whole columns
+    (["Z5"], None),  # Outside every table
+    (["not a range"], None),
+    ([None], None),
+    (["Other Sheet!C3"], []),
+])
+def test_tables_for_ranges(hunt_bot, ranges, tables):
+    hunt_bot.sheet_name = "Hunt"
+    hunt_bot.set_stacked_tables(["Bounties"])
+    hunt_bot.update_sheet_values(STACKED_VALUES)
+
+    assert hunt_bot.tables_for_ranges(ranges) == tables
+
+
+def test_set_stacked_tables_rereads_the_layout(hunt_bot):
+    hunt_bot.update_sheet_values(STACKED_VALUES)
+    assert "Bounties" not in hunt_bot.table_map
+
+    hunt_bot.set_stacked_tables(["Bounties"])
+
+    assert hunt_bot.table_map["Bounties"]["start_row"] == 4
+    assert hunt_bot.get_typed_table("Bounties").records() == [{"Item": "Whip", "Reward": 5}]
+
+
+CONFIG_VALUES = [
+    ["Discord Conf", "", "Current Score"],
+    ["Key", "Value", "Team Name", "Total Points"],
+    ["HUNT_START_DATE", "01/05/2025", "Team Red", "10"],
+    ["HUNT_START_TIME_UTC", "18:00"],
+    ["MASTER_PASSWORD", "hunter2"],
+    ["ANNOUNCEMENTS_CHANNEL_ID", "1"],
+    ["GENERAL_CHANNEL_ID", "2"],
+    ["ADMIN_CHANNEL_ID", "3"],
+    ["TEAM_ONE_NAME", "Red"],
+    ["TEAM_TWO_NAME", "Blue"],
+    ["TEAM_1_CHAT_CHANNEL_ID", "4"],
+    ["TEAM_2_CHAT_CHANNEL_ID", "5"],
+    ["WOM_COMPETITION_ID", "6"],
+    ["START_MESSAGE", "Go!"],
+    ["END_MESSAGE", "Done!"],
+]
+
+
+@pytest.fixture
+def configured_hunt_bot(hunt_bot, tmp_path):
+    hunt_bot.snapshot_path = str(tmp_path / "snapshot.json.gz")
+    hunt_bot.set_sheet_id("sheet-id")
+    hunt_bot.set_sheet_name("BotConfig")
+    hunt_bot.set_config_table_name("Discord Conf")
+    hunt_bot.update_sheet_values(CONFIG_VALUES)
+    hunt_bot.load_config(hunt_bot.get_typed_table("Discord Conf", hunt_bot.CONFIG_TEXT_COLUMNS))
+    return hunt_bot
+
+
+def test_sheet_snapshot_round_trip(configured_hunt_bot):
+    configured_hunt_bot.start_requested = True
+    configured_hunt_bot.start_announced = True
+    assert configured_hunt_bot.save_sheet_snapshot() is True
+
+    restored = HuntBot()
+    assert restored.load_sheet_snapshot(configured_hunt_bot.snapshot_path) is True
+
+    assert restored.sheet_id == "sheet-id"
+    assert restored.sheet_name == "BotConfig"
+    assert restored.sheet_values == CONFIG_VALUES
+    assert restored.sheet_hash == configured_hunt_bot.sheet_hash
+    assert restored.table_map == configured_hunt_bot.table_map
+    assert restored.config_map == configured_hunt_bot.config_map
+    assert restored.configured is True
+    assert restored.start_datetime == configured_hunt_bot.start_datetime
+    assert restored.start_requested is True
+    assert restored.start_announced is True
+    assert restored.get_typed_table("Current Score")[0]["Total Points"] == 10
+    # A fresh fetch of the same sheet is recognised as unchanged
+    assert restored.update_sheet_values(CONFIG_VALUES) is False
+
+
+def test_sheet_snapshot_writes_nan_config_values_as_null(configured_hunt_bot):
+    configured_hunt_bot.config_map["START_MESSAGE"] = float("nan")
+    assert configured_hunt_bot.save_sheet_snapshot() is True
+
+    with gzip.open(configured_hunt_bot.snapshot_path, "rt", encoding="utf-8") as f:
+        snapshot = json.loads(f.read())
+
+    assert snapshot["config_map"]["START_MESSAGE"] is None
+
+
+def test_load_sheet_snapshot_missing_file(hunt_bot, tmp_path):
+    assert hunt_bot.load_sheet_snapshot(str(tmp_path / "missing.json.gz")) is False
+    assert hunt_bot.sheet_version == 0
+
+
+def test_load_sheet_snapshot_corrupt_file(hunt_bot, tmp_path):
+    path = tmp_path / "snapshot.json.gz"
+    path.write_bytes(b"not gzip")
+
+    assert hunt_bot.load_sheet_snapshot(str(path)) is False
+    assert hunt_bot.sheet_version == 0
+
+
+def test_save_sheet_snapshot_without_data_is_skipped(hunt_bot, tmp_path):
+    assert hunt_bot.save_sheet_snapshot(str(tmp_path / "snapshot.json.gz")) is False
+
+
+def test_get_typed_table_follows_snapshots(hunt_bot):
+    hunt_bot.update_sheet_values(SHEET_VALUES)
+    assert hunt_bot.get_typed_table("Current Score")[0]["Total Points"] == 10
+
+    hunt_bot.update_sheet_values(SHEET_VALUES[:2] + [["Team Red", "11"]])
+    assert hunt_bot.get_typed_table("Current Score")[0]["Total Points"] == 11
+
+
+def test_sheet_data_is_only_built_on_use(hunt_bot):
+    hunt_bot.update_sheet_values(SHEET_VALUES)
+
+    assert hunt_bot._sheet_data is None
+    assert hunt_bot.sheet_data.iloc[2, 1] == "10"
+
+
+def test_load_config_from_typed_table(hunt_bot):
+    hunt_bot.update_sheet_values(CONFIG_VALUES)
+    hunt_bot.load_config(hunt_bot.get_typed_table("Discord Conf", hunt_bot.CONFIG_TEXT_COLUMNS))
+
+    assert hunt_bot.configured is True
+    assert hunt_bot.team_one_name == "Red"
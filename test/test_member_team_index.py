@@ -0,0 +1,158 @@
+import discord
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from huntbot.MemberTeamIndex import MemberTeamIndex
+
+
+def member(user_id: int, *role_names: str):
+    roles = []
+    for name in role_names:
+        role = MagicMock()
+        role.name = name
+        roles.append(role)
+    return SimpleNamespace(id=user_id, roles=roles)
+
+
+class FakeGuild:
+    def __init__(self, members: list, chunked: bool = False) -> None:
+        self.id = 1
+        self.name = "Hunt"
+        self.chunked = chunked
+        self.loaded_members = members
+        self.members = members if chunked else []
+        self.chunk = AsyncMock(side_effect=self.load_members)
+        self.fetch_member = AsyncMock(side_effect=self.find_member)
+
+    async def load_members(self) -> None:
+        self.members = self.loaded_members
+        self.chunked = True
+
+    async def find_member(self, user_id: int):
+        for m in self.loaded_members:
+            if m.id == user_id:
+                return m
+        raise discord.NotFound(MagicMock(status=404), "Unknown Member")
+
+
+@pytest.fixture
+def hunt_bot():
+    return SimpleNamespace(team_one_name="Red", team_two_name="Blue")
+
+
+@pytest.fixture
+def index(hunt_bot):
+    return MemberTeamIndex(hunt_bot)
+
+
+def test_member_roles_are_classified(index):
+    index.update_member(member(1, "@everyone", "Red Team Leader"))
+    index.update_member(member(2, "Blue team", "Sheet helper"))
+    index.update_member(member(3, "Staff"))
+
+    red, blue, staff = index.get(1), index.get(2), index.get(3)
+    assert (red.team_name, red.is_team_leader, red.is_staff) == ("Red", True, False)
+    assert (blue.team_name, blue.is_team_leader, blue.is_sheet_helper) == ("Blue", False, True)
+    assert (staff.team_name, staff.is_staff) == (None, True)
+    assert staff.has_any_role({"staff", "red team leader"})
+
+
+def test_privileged_roles_match_case_sensitively(index):
+    index.update_member(member(1, "red team leader", "staff", "Sheet Helper"))
+
+    info = index.get(1)
+    assert (info.is_team_leader, info.is_staff, info.is_sheet_helper) == (False, False, False)
+    # Teams and has_any_role still ignore case
+    assert info.team_name == "Red"
+    assert info.has_any_role({"staff"})
+
+
+def test_member_events_keep_index_current(index):
+    index.update_member(member(1, "Red Team"))
+    index.update_member(member(1, "Blue Team"))
+    assert index.team_of(1) == "Blue"
+
+    index.remove_member(1)
+    assert index.get(1) is None
+    assert index.misses == 1
+
+
+def test_team_rename_reclassifies_members(index, hunt_bot):
+    index.update_member(member(1, "Green Team"))
+    assert index.team_of(1) is None
+
+    hunt_bot.team_one_name = "Green"
+
+    assert index.team_of(1) == "Green"
+
+
+@pytest.mark.asyncio
+async def test_warm_chunks_guild_once(index):
+    guild = FakeGuild([member(1, "Red Team"), member(2, "Blue Team")])
+
+    await index.warm(guild)
+    await index.warm(guild)
+
+    guild.chunk.assert_awaited_once()
+    assert index.team_of(2) == "Blue"
+
+
+@pytest.mark.asyncio
+async def test_resolve_uses_index_before_fetching(index):
+    guild = FakeGuild([member(1, "Red Team")], chunked=True)
+
+    assert (await index.resolve(guild, 1)).team_name == "Red"
+    assert (await index.resolve(guild, 1)).team_name == "Red"
+
+    guild.fetch_member.assert_not_awaited()
+    assert index.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_indexes_event_member(index):
+    guild = FakeGuild([], chunked=True)
+
+    info = await index.resolve(guild, 5, member=member(5, "Blue Team"))
+
+    assert info.team_name == "Blue"
+    assert index.team_of(5) == "Blue"
+
+
+@pytest.mark.asyncio
+async def test_resolve_prefers_event_member_over_stale_entry(index):
+    guild = FakeGuild([member(5, "Red Team")], chunked=True)
+    await index.warm(guild)
+
+    # Promoted while the index missed the member update
+    info = await index.resolve(guild, 5, member=member(5, "Red Team", "Red Team Leader"))
+
+    assert info.is_team_leader
+    assert index.get(5) is info
+
+
+@pytest.mark.asyncio
+async def test_resolve_fetches_every_time_without_member_events(index):
+    index.member_events = False
+    guild = FakeGuild([member(7, "Red Team")])
+    index.update_member(member(7, "Blue Team"))
+
+    assert (await index.resolve(guild, 7)).team_name == "Red"
+    assert (await index.resolve(guild, 7)).team_name == "Red"
+    assert (await index.resolve(guild, 7, member=member(7, "Blue Team"))).team_name == "Blue"
+
+    guild.chunk.assert_not_awaited()
+    assert guild.fetch_member.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_fetches_unknown_member_once(index):
+    guild = FakeGuild([], chunked=True)
+    guild.loaded_members = [member(7, "Red Team")]
+
+    assert (await index.resolve(guild, 7)).team_name == "Red"
+    assert await index.resolve(guild, 8) is None
+    assert await index.resolve(guild, 8) is None
+
+    assert guild.fetch_member.await_count == 2
+    assert index.fetches == 2
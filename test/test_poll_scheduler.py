@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from huntbot.GDoc import GDoc
+from huntbot.PollScheduler import PollScheduler
+import pytest
+
+START = datetime(2025, 5, 1, 18, 0, tzinfo=timezone.utc)
+END = START + timedelta(days=9)
+
+
+@pytest.fixture
+def scheduler():
+    return PollScheduler(sheet_interval=8)
+
+
+def test_unconfigured_uses_sheet_interval(scheduler):
+    assert scheduler.next_interval(now=START, start=None, end=None) == 8
+
+
+def test_slow_well_before_start(scheduler):
+    assert scheduler.next_interval(now=START - timedelta(days=2), start=START, end=END) == \
+           PollScheduler.PRE_START_INTERVAL
+
+
+def test_never_sleeps_past_precision_window(scheduler):
+    now = START - PollScheduler.PRECISION_WINDOW - timedelta(seconds=30)
+    assert scheduler.next_interval(now=now, start=START, end=END) == 30
+
+
+@pytest.mark.parametrize("offset", [timedelta(minutes=-4), timedelta(0), timedelta(minutes=4)])
+def test_second_precision_around_start_and_end(scheduler, offset):
+    assert scheduler.next_interval(now=START + offset, start=START, end=END) == 1
+    assert scheduler.next_interval(now=END + offset, start=START, end=END) == 1
+
+
+def test_mid_hunt_follows_sheet_interval(scheduler):
+    assert scheduler.next_interval(now=START + timedelta(days=1), start=START, end=END) == 8
+
+    # Capped before the end window
+    now = END - PollScheduler.PRECISION_WINDOW - timedelta(seconds=3)
+    assert scheduler.next_interval(now=now, start=START, end=END) == 3
+
+
+def test_changes_speed_polling_up_and_idle_slows_it_down(scheduler):
+    scheduler.record_poll(changed=True)
+    assert scheduler.sheet_interval == 4
+    scheduler.record_poll(changed=True)
+    scheduler.record_poll(changed=True)
+    assert scheduler.sheet_interval == PollScheduler.MIN_SHEET_INTERVAL
+
+    for _ in range(50):
+        scheduler.record_poll(changed=False)
+    assert scheduler.sheet_interval == PollScheduler.MAX_SHEET_INTERVAL
+    assert scheduler.polls == 53
+    assert scheduler.changed_polls == 3
+
+
+def test_throttling_backs_off_and_recovers(scheduler):
+    scheduler.record_throttle()
+    scheduler.record_throttle()
+    assert scheduler.sheet_interval == 32
+    assert scheduler.throttled_polls == 2
+
+    for _ in range(10):
+        scheduler.record_throttle()
+    assert scheduler.backoff == PollScheduler.MAX_BACKOFF
+
+    scheduler.base_sheet_interval = 8
+    scheduler.record_poll(changed=True)
+    assert scheduler.backoff == PollScheduler.MAX_BACKOFF // 2
+    assert scheduler.sheet_interval == 4 * PollScheduler.MAX_BACKOFF // 2
+
+
+def test_refresh_due():
+    clock = MagicMock(return_value=100.0)
+    scheduler = PollScheduler(sheet_interval=5, clock=clock)
+
+    assert scheduler.refresh_due()
+    clock.return_value = 103.0
+    assert not scheduler.refresh_due()
+    clock.return_value = 105.0
+    assert scheduler.refresh_due()
+
+
+def test_set_bounds_clamps_interval(scheduler):
+    scheduler.set_bounds(60, 240)
+    assert scheduler.sheet_interval == 60
+    scheduler.record_poll(changed=True)
+    assert scheduler.sheet_interval == 60
+
+
+def test_current_interval_metric(scheduler):
+    scheduler.next_interval(now=START, start=START, end=END)
+    assert scheduler.current_interval == 1
+
+
+@pytest.mark.parametrize("status, throttled", [(429, True), (503, True), (500, False), (404, False)])
+def test_gdoc_is_throttled(status, throttled):
+    error = Exception("boom")
+    error.resp = MagicMock(status=status)
+    assert GDoc.is_throttled(error) is throttled
+
+
+def test_gdoc_is_throttled_without_response():
+    assert not GDoc.is_throttled(ValueError("boom"))
@@ -0,0 +1,102 @@
+import pytest
+import asyncio
+from huntbot.RequestScheduler import RequestPriority, RequestScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=60, capacity=2, clock=clock)
+
+    bucket.consume()
+    bucket.consume()
+    assert bucket.time_until_available() == pytest.approx(1.0)
+
+    clock.now = 0.5
+    assert bucket.time_until_available() == pytest.approx(0.5)
+
+    clock.now = 10
+    assert bucket.time_until_available() == 0
+    assert bucket.tokens == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_fast_path_does_not_queue():
+    scheduler = RequestScheduler(burst=2)
+
+    waited = await scheduler.acquire("read")
+
+    assert waited == 0
+    assert scheduler.queued_requests == 0
+    assert scheduler.admitted_requests == 1
+
+
+async def _queue_in_order(scheduler, requests):
+    order = []
+
+    async def request(priority, source, label):
+        await scheduler.acquire("write", priority=priority, source=source)
+        order.append(label)
+
+    # Use up the single token so every request below has to queue
+    await scheduler.acquire("write")
+    tasks = []
+    for priority, source, label in requests:
+        tasks.append(asyncio.create_task(request(priority, source, label)))
+        await asyncio.sleep(0)
+
+    assert scheduler.queue_depth("write") == len(requests)
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_are_admitted_by_priority():
+    scheduler = RequestScheduler(write_per_minute=6000, burst=1)
+
+    order = await _queue_in_order(scheduler, [
+        (RequestPriority.POLL, "hunt", "poll"),
+        (RequestPriority.SCORE, "plugin", "score"),
+        (RequestPriority.PASSWORD, "plugin", "password"),
+    ])
+
+    assert order == ["password", "score", "poll"]
+    assert scheduler.queue_depth() == 0
+    assert scheduler.max_wait_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_same_priority_requests_are_round_robin_per_source():
+    scheduler = RequestScheduler(write_per_minute=6000, burst=1)
+
+    order = await _queue_in_order(scheduler, [
+        (RequestPriority.SCORE, "a", "a1"),
+        (RequestPriority.SCORE, "a", "a2"),
+        (RequestPriority.SCORE, "a", "a3"),
+        (RequestPriority.SCORE, "b", "b1"),
+    ])
+
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    scheduler = RequestScheduler(read_per_minute=1, burst=1)
+    await scheduler.acquire("read")
+
+    task = asyncio.create_task(scheduler.acquire("read"))
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth("read") == 1
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert scheduler.queue_depth("read") == 0
@@ -0,0 +1,125 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from huntbot.GDoc import GDoc
+from huntbot.HuntBot import HuntBot
+from huntbot.SheetDiff import CellChange, diff_cells
+
+OLD_VALUES = [
+    ["Discord Conf", "", "Current Score", ""],
+    ["Key", "Value", "Team Name", "Total Points"],
+    ["TEAM_ONE_NAME", "Red", "Team Red", "10"],
+    ["TEAM_TWO_NAME", "Blue", "Team Blue", "20"],
+    ["START_MESSAGE", "Go!"],
+]
+
+
+def edited(*edits) -> list[list]:
+    values = [list(row) for row in OLD_VALUES]
+    for row, col, value in edits:
+        while len(values) <= row:
+            values.append([])
+        values[row] += [""] * (col + 1 - len(values[row]))
+        values[row][col] = value
+    return values
+
+
+def diff(new_values: list[list]):
+    old_map = GDoc.build_table_map(GDoc.build_dataframe(OLD_VALUES))
+    new_map = GDoc.build_table_map(GDoc.build_dataframe(new_values))
+    return GDoc.diff_sheet_values(OLD_VALUES, new_values, old_map, new_map, config_table_name="Discord Conf")
+
+
+def test_diff_cells_treats_missing_and_empty_cells_alike():
+    assert diff_cells([["a", ""]], [["a"]]) == []
+    assert diff_cells([["a"]], [["a", "b"], ["c"]]) == [CellChange(0, 1, None, "b"), CellChange(1, 0, None, "c")]
+
+
+def test_unchanged_sheet_has_empty_diff():
+    sheet_diff = diff(edited())
+
+    assert sheet_diff.empty
+    assert sheet_diff.tables == {}
+
+
+def test_changed_cell_is_attributed_to_its_table():
+    sheet_diff = diff(edited((2, 3, "15")))
+
+    assert sheet_diff.changed_cells == [CellChange(2, 3, "10", "15")]
+    assert sheet_diff.changed_tables == ["Current Score"]
+    score = sheet_diff.tables["Current Score"]
+    assert score.rows_changed == [({"Team Name": "Team Red", "Total Points": "10"},
+                                   {"Team Name": "Team Red", "Total Points": "15"})]
+    assert score.rows_added == [] and score.rows_removed == []
+    assert sheet_diff.config_changes == {}
+
+
+def test_rows_added_and_removed():
+    sheet_diff = diff(edited((4, 2, "Team Green"), (4, 3, "5")))
+
+    assert sheet_diff.tables["Current Score"].rows_added == [{"Team Name": "Team Green", "Total Points": "5"}]
+
+    removed = [list(row) for row in OLD_VALUES]
+    removed[2] = removed[2][:2]
+    sheet_diff = diff(removed)
+
+    assert sheet_diff.tables["Current Score"].rows_removed == [{"Team Name": "Team Red", "Total Points": "10"}]
+
+
+def test_config_key_changes():
+    sheet_diff = diff(edited((4, 1, "Start!"), (5, 0, "END_MESSAGE"), (5, 1, "Bye")))
+
+    assert sheet_diff.config_changes == {"START_MESSAGE": ("Go!", "Start!"), "END_MESSAGE": (None, "Bye")}
+    assert sheet_diff.changed_tables == ["Discord Conf"]
+
+
+def test_layout_change_lists_new_and_removed_tables():
+    sheet_diff = diff(edited((0, 2, "Leaderboard")))
+
+    assert sheet_diff.layout_changed
+    assert set(sheet_diff.changed_tables) == {"Current Score", "Leaderboard"}
+    assert sheet_diff.tables["Leaderboard"].rows_added == [{"Team Name": "Team Red", "Total Points": "10"},
+                                                           {"Team Name": "Team Blue", "Total Points": "20"}]
+
+
+def test_hunt_bot_records_diff_between_snapshots():
+    hunt_bot = HuntBot()
+    hunt_bot.set_config_table_name("Discord Conf")
+
+    hunt_bot.update_sheet_values(OLD_VALUES)
+    assert hunt_bot.last_diff is None
+
+    hunt_bot.update_sheet_values(edited((3, 3, "25")))
+    assert hunt_bot.last_diff.changed_tables == ["Current Score"]
+
+
+@pytest.mark.asyncio
+async def test_hub_only_checks_tables_in_diff():
+    hunt_bot = HuntBot()
+    hunt_bot.update_sheet_values(OLD_VALUES)
+    config_callback, diff_callback = AsyncMock(), AsyncMock()
+    hunt_bot.sheet_hub.subscribe("Discord Conf", config_callback)
+    hunt_bot.sheet_hub.subscribe_diff(diff_callback)
+    await hunt_bot.sheet_hub.publish()
+    hunt_bot.get_records = MagicMock(side_effect=AssertionError("untouched table extracted"))
+
+    hunt_bot.update_sheet_values(edited((3, 3, "25")))
+    changed = await hunt_bot.sheet_hub.publish(hunt_bot.last_diff)
+
+    assert changed == []
+    config_callback.assert_not_awaited()
+    diff_callback.assert_awaited_once_with(hunt_bot.last_diff)
+
+
+@pytest.mark.asyncio
+async def test_hub_ignores_diff_that_skips_versions():
+    hunt_bot = HuntBot()
+    hunt_bot.update_sheet_values(OLD_VALUES)
+    callback = AsyncMock()
+    hunt_bot.sheet_hub.subscribe("Discord Conf", callback)
+
+    # Two snapshots, but only the last one is published
+    hunt_bot.update_sheet_values(edited((4, 1, "Start!")))
+    hunt_bot.update_sheet_values(edited((4, 1, "Start!"), (3, 3, "25")))
+    await hunt_bot.sheet_hub.publish(hunt_bot.last_diff)
+
+    callback.assert_awaited_once()
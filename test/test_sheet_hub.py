@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import AsyncMock
+from huntbot.HuntBot import HuntBot
+
+SHEET_VALUES = [
+    ["Current Score", "", "Single Bounties", ""],
+    ["Team Name", "Total Points", "Task", "Password"],
+    ["Team Red", "10", "Get a whip", "whip"],
+    ["Team Blue", "20"],
+]
+
+
+def with_cell(row: int, col: int, value: str) -> list[list]:
+    values = [list(r) for r in SHEET_VALUES]
+    values[row][col] = value
+    return values
+
+
+@pytest.fixture
+def hunt_bot():
+    hunt_bot = HuntBot()
+    hunt_bot.update_sheet_values(SHEET_VALUES)
+    return hunt_bot
+
+
+def test_subscribe_tracks_subscribed_tables(hunt_bot):
+    callback = AsyncMock()
+
+    hunt_bot.sheet_hub.subscribe("Current Score", callback)
+    hunt_bot.sheet_hub.subscribe("Current Score", callback)
+
+    assert hunt_bot.subscribed_tables == {"Current Score"}
+    assert hunt_bot.sheet_hub.subscribers["Current Score"] == [callback]
+
+    hunt_bot.sheet_hub.unsubscribe("Current Score", callback)
+
+    assert hunt_bot.subscribed_tables == set()
+    assert "Current Score" not in hunt_bot.sheet_hub.subscribers
+
+
+@pytest.mark.asyncio
+async def test_publish_only_notifies_changed_tables(hunt_bot):
+    score_callback = AsyncMock()
+    bounty_callback = AsyncMock()
+    hunt_bot.sheet_hub.subscribe("Current Score", score_callback)
+    hunt_bot.sheet_hub.subscribe("Single Bounties", bounty_callback)
+
+    hunt_bot.update_sheet_values(with_cell(2, 1, "15"))
+    changed = await hunt_bot.sheet_hub.publish()
+
+    assert changed == ["Current Score"]
+    score_callback.assert_awaited_once_with("Current Score", ({"Team Name": "Team Red", "Total Points": "15"},
+                                                              {"Team Name": "Team Blue", "Total Points": "20"}))
+    bounty_callback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_publish_without_changes_notifies_nobody(hunt_bot):
+    callback = AsyncMock()
+    hunt_bot.sheet_hub.subscribe("Current Score", callback)
+
+    # A new snapshot whose score table is identical
+    hunt_bot.update_sheet_values(with_cell(2, 2, "Get a dragon whip"))
+
+    assert await hunt_bot.sheet_hub.publish() == []
+    callback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_the_same_records(hunt_bot):
+    first, second = AsyncMock(), AsyncMock()
+    hunt_bot.sheet_hub.subscribe("Current Score", first)
+    hunt_bot.sheet_hub.subscribe("Current Score", second)
+
+    hunt_bot.update_sheet_values(with_cell(3, 1, "25"))
+    await hunt_bot.sheet_hub.publish()
+
+    assert first.await_args.args[1] is second.await_args.args[1]
+    assert hunt_bot.sheet_hub.deliveries == 2
+
+
+@pytest.mark.asyncio
+async def test_failing_subscriber_does_not_block_others(hunt_bot):
+    failing = AsyncMock(side_effect=RuntimeError("boom"))
+    healthy = AsyncMock()
+    hunt_bot.sheet_hub.subscribe("Current Score", failing)
+    hunt_bot.sheet_hub.subscribe("Current Score", healthy)
+
+    hunt_bot.update_sheet_values(with_cell(3, 1, "25"))
+    await hunt_bot.sheet_hub.publish()
+
+    healthy.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_publishes_to_subscribers(hunt_bot):
+    callback = AsyncMock()
+    hunt_bot.sheet_hub.subscribe("Current Score", callback)
+    gdoc = AsyncMock()
+    gdoc.aget_table_values.return_value = with_cell(2, 1, "11")
+
+    assert await hunt_bot.refresh_sheet_values(gdoc) is True
+
+    callback.assert_awaited_once()
+    gdoc.aget_table_values.assert_awaited_once()
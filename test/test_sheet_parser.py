@@ -0,0 +1,121 @@
+import pytest
+import random
+import pandas as pd
+from huntbot.GDoc import GDoc
+from huntbot import SheetParser
+
+
+def pandas_records(values: list[list], table_name: str, stacked_tables=()) -> list[dict]:
+    """Today's pandas pipeline, with NA values normalised to None for comparison."""
+    df = GDoc.build_dataframe(values)
+    table_map = GDoc.build_table_map(df, stacked_tables)
+    table_df = GDoc.extract_table(df, table_map, table_name)
+    return [{key: (None if pd.isna(value) else value) for key, value in row.items()}
+            for row in table_df.to_dict("records")]
+
+
+def random_sheet(seed: int, rows: int = 40, tables: int = 4) -> list[list]:
+    rng = random.Random(seed)
+    header, column_headers, widths = [], [], []
+    for table in range(tables):
+        width = rng.randint(1, 4)
+        widths.append(width)
+        header += [f"Table {table}"] + [""] * (width - 1)
+        column_headers += [f"T{table}C{col}" for col in range(width)]
+
+    values = [header, column_headers]
+    for _ in range(rows):
+        row = [rng.choice(["", "", "x", "5", "hello"]) for _ in range(len(column_headers))]
+        # The API trims trailing empty cells, so rows are ragged
+        while row and row[-1] == "":
+            row.pop()
+        values.append(row)
+    return values
+
+
+SIDE_BY_SIDE = [
+    ["Discord Conf", "", "Current Score", "", "Notes"],
+    ["Key", "Value", "Team Name", "Total Points", "Note"],
+    ["A", "1", "Team Red", "10"],
+    ["B", "", "Team Blue", "20", "n1"],
+    [],
+    ["", "", "", "", "n2"],
+]
+
+
+STACKED = [
+    ["Discord Conf", "", "Notes"],
+    ["Key", "Value", "Note"],
+    ["A", "1", "n1"],
+    [],
+    ["Current Score"],
+    ["Team Name", "Total Points"],
+    ["Team Red", "10", "n2"],
+    ["", "", ""],
+    ["Leaderboard", "", "n3"],
+    ["Player", "Points"],
+    ["Zezima", "99"],
+]
+
+
+STACKED_TABLES = {"Current Score", "Leaderboard"}
+
+
+@pytest.mark.parametrize("values", [SIDE_BY_SIDE, STACKED])
+def test_build_table_index_matches_pandas(values):
+    assert SheetParser.build_table_index(values, STACKED_TABLES) == GDoc.build_table_map(
+        GDoc.build_dataframe(values), STACKED_TABLES)
+
+
+@pytest.mark.parametrize("table_name", ["Discord Conf", "Current Score", "Leaderboard", "Notes"])
+def test_stacked_tables_match_pandas(table_name):
+    table_index, tables = SheetParser.parse_tables(STACKED, stacked_tables=STACKED_TABLES)
+
+    assert tables[table_name] == pandas_records(STACKED, table_name, STACKED_TABLES)
+    assert SheetParser.extract_records(STACKED, table_index, table_name) == tables[table_name]
+
+
+def test_only_listed_tables_are_stacked():
+    # A note row after a blank row in a Key/Value table has the shape of a stacked table's label
+    values = [["Config", ""], ["Key", "Value"], ["START", "1"], ["", ""], ["NOTE", ""], ["END", "3"]]
+
+    table_index = SheetParser.build_table_index(values, STACKED_TABLES)
+
+    assert table_index == {"Config": {"start_col": 0, "end_col": 1}}
+    assert SheetParser.extract_records(values, table_index, "Config") == [
+        {"Key": "START", "Value": "1"}, {"Key": "NOTE", "Value": None}, {"Key": "END", "Value": "3"}]
+
+
+@pytest.mark.parametrize("table_name", ["Discord Conf", "Current Score", "Notes", "Missing"])
+def test_extract_records_matches_pandas(table_name):
+    table_index = SheetParser.build_table_index(SIDE_BY_SIDE)
+
+    assert SheetParser.extract_records(SIDE_BY_SIDE, table_index, table_name) == pandas_records(SIDE_BY_SIDE,
+                                                                                               table_name)
+
+
+# Random rows can form stacked tables with duplicate column names
+@pytest.mark.filterwarnings("ignore:DataFrame columns are not unique")
+@pytest.mark.parametrize("seed", range(10))
+def test_parse_tables_matches_pandas_on_random_sheets(seed):
+    values = random_sheet(seed)
+
+    # Random cell values can label stacked tables
+    stacked_tables = {"x", "5", "hello"}
+    table_index, tables = SheetParser.parse_tables(values, stacked_tables=stacked_tables)
+
+    assert table_index == GDoc.build_table_map(GDoc.build_dataframe(values), stacked_tables)
+    for table_name, records in tables.items():
+        assert records == pandas_records(values, table_name, stacked_tables)
+
+
+def test_parse_tables_only_extracts_requested_tables():
+    table_index, tables = SheetParser.parse_tables(SIDE_BY_SIDE, ["Current Score", "Missing"])
+
+    assert list(tables) == ["Current Score"]
+    assert tables["Current Score"] == [{"Team Name": "Team Red", "Total Points": "10"},
+                                       {"Team Name": "Team Blue", "Total Points": "20"}]
+
+
+def test_empty_sheet():
+    assert SheetParser.parse_tables([]) == ({}, {})
@@ -0,0 +1,133 @@
+import pytest
+from huntbot import SheetParser
+from huntbot.GDoc import GDoc
+from huntbot.SheetStore import Column, SheetStore, StoreTable
+
+SCORE_VALUES = [
+    ["Discord Conf", "", "Current Score", ""],
+    ["Key", "Value", "Team Name", "Total Points"],
+    ["TEAM_ONE_NAME", "Red", "Team Red", "10"],
+    ["TEAM_TWO_NAME", "Blue", "Team Blue", "20"],
+]
+
+BOUNTY_VALUES = [
+    ["Single Bounties", "", "", ""],
+    ["Task", "Password", "Points", "Double"],
+    ["Kill a dragon", "1234", "5", ""],
+    ["Catch a fish", "5678", "2.5", "x"],
+    ["Chop a tree", "", "", "x"],
+]
+
+
+def store_for(values: list[list]) -> SheetStore:
+    store = SheetStore()
+    store.update(values, SheetParser.build_table_index(values))
+    return store
+
+
+def test_columns_are_typed_per_table():
+    table = store_for(BOUNTY_VALUES).table("Single Bounties", {"Task", "Password"})
+
+    assert table.column_types == {"Task": "str", "Password": "str", "Points": "float", "Double": "str"}
+    assert table[0]["Password"] == "1234"
+    assert table[1]["Points"] == 2.5
+    assert table[2]["Password"] is None
+    assert table[0].get("Double") is None
+    assert table[1].get("Double") == "x"
+
+
+def test_text_columns_keep_cell_text():
+    table = StoreTable("Single Bounties", ("Task", "Password", "Points"),
+                       [("12", "12", "1"), ("3.5", "3.5", "3.5"), ("1.50", "1.50", "2")],
+                       text_columns={"Task", "Password"})
+
+    assert table["Password"] == ["12", "3.5", "1.50"]
+    assert table["Task"] == ["12", "3.5", "1.50"]
+    assert table.column_types["Points"] == "float"
+
+
+def test_text_columns_are_declared_per_table():
+    store = store_for(BOUNTY_VALUES)
+
+    # Without a declaration a column of numbers is typed, whatever its name
+    assert store.table("Single Bounties")[0]["Password"] == 1234
+    assert store.table("Single Bounties", {"Password"})[0]["Password"] == "1234"
+    assert store.table("Single Bounties", {"Password"}) is store.table("Single Bounties", ["Password"])
+
+
+def test_rows_match_parser_records():
+    table = store_for(SCORE_VALUES).table("Current Score")
+
+    assert table.records() == [{"Team Name": "Team Red", "Total Points": 10},
+                               {"Team Name": "Team Blue", "Total Points": 20}]
+    assert [row["Team Name"] for row in table] == ["Team Red", "Team Blue"]
+
+
+@pytest.mark.parametrize("cells, kind", [
+    (["1", "-2", "0"], "int"),
+    (["1", "2.50"], "float"),
+    (["007", "1"], "str"),
+    (["1e5"], "str"),
+    (["9" * 20], "str"),
+    ([None, None], "str"),
+])
+def test_column_kind_inference(cells, kind):
+    assert Column.from_cells(cells).kind == kind
+
+
+def test_strings_are_interned():
+    values = [["Names", ""], ["Name", "Team"], ["a", "Team " + "Red"], ["b", "".join(["Team ", "Red"])]]
+    column = store_for(values).table("Names")["Team"]
+
+    assert column[0] is column[1]
+
+
+def test_row_dict_access():
+    row = store_for(BOUNTY_VALUES).table("Single Bounties", {"Password"})[0]
+
+    assert "Task" in row
+    assert list(row) == ["Task", "Password", "Points", "Double"]
+    assert row.get("Missing", "default") == "default"
+    assert row == {"Task": "Kill a dragon", "Password": "1234", "Points": 5.0, "Double": None}
+    with pytest.raises(KeyError):
+        row["Missing"]
+
+
+def test_rows_from_offset():
+    table = store_for(BOUNTY_VALUES).table("Single Bounties")
+
+    assert [row["Task"] for row in table.rows(1)] == ["Catch a fish", "Chop a tree"]
+    assert list(table.rows(10)) == []
+
+
+def test_missing_table_is_empty():
+    table = store_for(BOUNTY_VALUES).table("Double Bounties")
+
+    assert table.empty
+    assert list(table) == []
+    assert StoreTable("").empty
+
+
+def test_update_keeps_tables_the_diff_did_not_touch():
+    store = store_for(SCORE_VALUES)
+    config = store.table("Discord Conf")
+    score = store.table("Current Score")
+
+    new_values = [list(row) for row in SCORE_VALUES]
+    new_values[2][3] = "11"
+    table_map = SheetParser.build_table_index(new_values)
+    store.update(new_values, table_map, GDoc.diff_sheet_values(SCORE_VALUES, new_values, store.table_map, table_map))
+
+    assert store.table("Discord Conf") is config
+    assert store.table("Current Score") is not score
+    assert store.table("Current Score")[0]["Total Points"] == 11
+    assert store.tables_kept == 1
+
+
+def test_update_without_diff_rebuilds_every_table():
+    store = store_for(SCORE_VALUES)
+    config = store.table("Discord Conf")
+
+    store.update(SCORE_VALUES, SheetParser.build_table_index(SCORE_VALUES))
+
+    assert store.table("Discord Conf") is not config
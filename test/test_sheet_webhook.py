@@ -0,0 +1,130 @@
+import pytest
+import asyncio
+import aiohttp
+import pytest_asyncio
+from unittest.mock import AsyncMock
+from huntbot.SheetWebhook import SheetWebhook
+
+SECRET = "s3cret"
+
+
+@pytest_asyncio.fixture
+async def webhook():
+    webhook = SheetWebhook(on_change=AsyncMock(), secret=SECRET, host="127.0.0.1", port=0)
+    await webhook.start()
+    yield webhook
+    await webhook.stop()
+
+
+async def post_edit(webhook: SheetWebhook, body, token: str = SECRET) -> aiohttp.ClientResponse:
+    """Stand-in for the Apps Script onEdit trigger."""
+    url = f"http://127.0.0.1:{webhook.port}{SheetWebhook.PATH}"
+    headers = {SheetWebhook.TOKEN_HEADER: token} if token else {}
+    async with aiohttp.ClientSession() as session:
+        if isinstance(body, str):
+            response = await session.post(url, data=body, headers=headers)
+        else:
+            response = await session.post(url, json=body, headers=headers)
+        response.release()
+        return response
+
+
+async def settle(webhook: SheetWebhook) -> None:
+    if webhook.worker:
+        await webhook.worker
+
+
+@pytest.mark.asyncio
+async def test_edit_notification_triggers_refresh(webhook):
+    response = await post_edit(webhook, {"range": "Hunt!C5:D5"})
+    await settle(webhook)
+
+    assert response.status == 202
+    webhook.on_change.assert_awaited_once_with(["Hunt!C5:D5"])
+    assert webhook.notifications_received == 1
+
+
+@pytest.mark.asyncio
+async def test_notification_without_range_refreshes_everything(webhook):
+    await post_edit(webhook, {})
+    await settle(webhook)
+
+    webhook.on_change.assert_awaited_once_with(None)
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_rejected(webhook):
+    response = await post_edit(webhook, {"range": "Hunt!C5"}, token="wrong")
+    missing = await post_edit(webhook, {"range": "Hunt!C5"}, token="")
+
+    assert response.status == 401
+    assert missing.status == 401
+    webhook.on_change.assert_not_awaited()
+    assert webhook.notifications_rejected == 2
+
+
+@pytest.mark.asyncio
+async def test_webhook_refuses_to_start_without_secret():
+    webhook = SheetWebhook(on_change=AsyncMock(), secret="", host="127.0.0.1", port=0)
+
+    with pytest.raises(ValueError):
+        await webhook.start()
+    assert webhook.runner is None
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_is_rejected(webhook):
+    response = await post_edit(webhook, "{not json")
+    listing = await post_edit(webhook, ["Hunt!C5"])
+
+    assert response.status == 400
+    assert listing.status == 400
+    webhook.on_change.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ranges_that_are_not_a_list_of_strings_are_rejected(webhook):
+    text = await post_edit(webhook, {"ranges": "Hunt!A1"})
+    numbers = await post_edit(webhook, {"ranges": [5]})
+    cell = await post_edit(webhook, {"range": ["Hunt!A1"]})
+
+    assert (text.status, numbers.status, cell.status) == (400, 400, 400)
+    webhook.on_change.assert_not_awaited()
+    assert webhook.pending_ranges == []
+
+
+@pytest.mark.asyncio
+async def test_burst_of_edits_is_coalesced(webhook):
+    refresh_started = asyncio.Event()
+    release_refresh = asyncio.Event()
+
+    async def slow_refresh(ranges):
+        refresh_started.set()
+        await release_refresh.wait()
+
+    webhook.on_change.side_effect = slow_refresh
+
+    await post_edit(webhook, {"range": "Hunt!C5"})
+    await refresh_started.wait()
+    # These arrive while the first refresh is still running
+    await post_edit(webhook, {"range": "Hunt!C6"})
+    await post_edit(webhook, {"ranges": ["Hunt!D6", "Hunt!E6"]})
+    release_refresh.set()
+    await settle(webhook)
+
+    assert webhook.on_change.await_count == 2
+    assert webhook.on_change.await_args_list[1].args == (["Hunt!C6", "Hunt!D6", "Hunt!E6"],)
+    assert webhook.refreshes_triggered == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_errors_do_not_stop_the_webhook(webhook):
+    webhook.on_change.side_effect = [RuntimeError("Sheets API down"), None]
+
+    await post_edit(webhook, {"range": "Hunt!C5"})
+    await settle(webhook)
+    response = await post_edit(webhook, {"range": "Hunt!C6"})
+    await settle(webhook)
+
+    assert response.status == 202
+    assert webhook.on_change.await_count == 2
@@ -0,0 +1,145 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+from huntbot.StickyMessage import StickyMessage
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.next_id = 100
+        self.send = AsyncMock(side_effect=self.send_message)
+        self.partial = SimpleNamespace(edit=AsyncMock(), delete=AsyncMock())
+        self.get_partial_message = MagicMock(return_value=self.partial)
+
+    async def send_message(self, content: str):
+        self.next_id += 100
+        return SimpleNamespace(id=self.next_id, content=content)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def channel():
+    return FakeChannel()
+
+
+@pytest.fixture
+def sticky(channel, clock):
+    sleeps = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+        clock.now += delay
+
+    sticky = StickyMessage(channel, min_interval=5, clock=clock, sleep=sleep)
+    sticky.sleeps = sleeps
+    yield sticky
+    sticky.close()
+
+
+@pytest.mark.asyncio
+async def test_first_update_posts_then_edits_in_place(sticky, channel):
+    sticky.update("one")
+    await sticky.pending
+    sticky.update("two")
+    await sticky.pending
+
+    channel.send.assert_awaited_once_with("one")
+    channel.partial.edit.assert_awaited_once_with(content="two")
+    assert (sticky.message_id, sticky.posted_content) == (200, "two")
+    assert sticky.sleeps == [5]
+
+
+@pytest.mark.asyncio
+async def test_updates_are_debounced_to_latest_content(sticky, channel, clock):
+    sticky.update("one")
+    await sticky.pending
+    clock.now = 2
+    for content in ("two", "three", "four"):
+        sticky.update(content)
+    await sticky.pending
+
+    channel.partial.edit.assert_awaited_once_with(content="four")
+    assert sticky.sleeps == [3]
+    assert sticky.edits == 1
+
+
+@pytest.mark.asyncio
+async def test_newer_message_makes_it_repost(sticky, channel, clock):
+    sticky.update("one")
+    await sticky.pending
+    sticky.observe_message(250)
+    clock.now = 10
+    sticky.update("two")
+    await sticky.pending
+
+    channel.partial.delete.assert_awaited_once()
+    assert channel.send.await_args.args == ("two",)
+    assert sticky.message_id == 300 and sticky.is_last
+    assert sticky.reposts == 2
+
+
+@pytest.mark.asyncio
+async def test_unchanged_content_is_not_posted(sticky, channel):
+    sticky.update("one")
+    await sticky.pending
+    sticky.observe_message(250)
+    sticky.update("one")
+
+    assert sticky.pending.done()
+    channel.send.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_deleted_sticky_is_posted_again(sticky, channel, clock):
+    sticky.update("one")
+    await sticky.pending
+    clock.now = 10
+    sticky.observe_delete(200)
+    await sticky.pending
+
+    assert channel.send.await_count == 2
+    channel.partial.delete.assert_not_awaited()
+    assert sticky.message_id == 300
+
+
+@pytest.mark.asyncio
+async def test_edit_of_missing_sticky_reposts(sticky, channel, clock):
+    sticky.update("one")
+    await sticky.pending
+    channel.partial.edit.side_effect = discord.NotFound(MagicMock(status=404), "Unknown Message")
+    clock.now = 10
+    sticky.update("two")
+    await sticky.pending
+
+    assert channel.send.await_args.args == ("two",)
+    assert sticky.message_id == 300
+
+
+@pytest.mark.asyncio
+async def test_failed_post_is_retried_with_backoff(sticky, channel):
+    channel.send.side_effect = [discord.HTTPException(MagicMock(status=500), "boom"),
+                                discord.HTTPException(MagicMock(status=500), "boom"),
+                                SimpleNamespace(id=200)]
+
+    sticky.update("one")
+    await sticky.pending
+
+    assert channel.send.await_count == 3
+    assert sticky.sleeps == [StickyMessage.RETRY_BASE_DELAY, StickyMessage.RETRY_BASE_DELAY * 2]
+    assert (sticky.message_id, sticky.posted_content) == (200, "one")
+    assert sticky.failed_posts == 2
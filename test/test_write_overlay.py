@@ -0,0 +1,108 @@
+from huntbot.WriteOverlay import WriteOverlay
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cell_text_matches_api_formatting():
+    assert WriteOverlay.cell_text(10) == "10"
+    assert WriteOverlay.cell_text(True) == "TRUE"
+    assert WriteOverlay.cell_text(None) == ""
+    assert WriteOverlay.cell_text("pw") == "pw"
+
+
+def test_older_read_gets_write_applied():
+    clock = FakeClock()
+    overlay = WriteOverlay(clock=clock)
+    values = [["Key", "Value"], ["Password", "old"]]
+
+    clock.now = 5
+    overlay.record("plugin", "Config", 1, 1, ["new"])
+    result, invalidated = overlay.apply("plugin", "Config", values, read_started=4)
+
+    assert result == [["Key", "Value"], ["Password", "new"]]
+    assert values[1][1] == "old"
+    assert invalidated == []
+    assert overlay.pending("plugin", "Config") == 1
+
+
+def test_write_outside_payload_pads_rows():
+    overlay = WriteOverlay(clock=FakeClock())
+    overlay.record("plugin", "Config", 3, 2, [7])
+
+    result, _ = overlay.apply("plugin", "Config", [["A"]])
+
+    assert result == [["A"], [], [], ["", "", "7"]]
+
+
+def test_later_read_confirms_write():
+    clock = FakeClock()
+    overlay = WriteOverlay(clock=clock)
+    overlay.record("plugin", "Config", 0, 0, [10])
+
+    values = [["10"]]
+    result, invalidated = overlay.apply("plugin", "Config", values, read_started=1)
+
+    assert result is values
+    assert invalidated == []
+    assert overlay.pending("plugin", "Config") == 0
+    assert overlay.confirmed_writes == 1
+
+
+def test_later_read_with_different_value_invalidates_write():
+    clock = FakeClock()
+    overlay = WriteOverlay(clock=clock)
+    overlay.record("plugin", "Config", 0, 0, ["mine"])
+
+    result, invalidated = overlay.apply("plugin", "Config", [["theirs"]], read_started=1)
+
+    assert result == [["theirs"]]
+    assert invalidated == [(0, 0)]
+    assert overlay.invalidated_writes == 1
+    assert overlay.pending("plugin", "Config") == 0
+
+
+def test_cached_payload_never_settles_writes():
+    overlay = WriteOverlay(clock=FakeClock())
+    overlay.record("plugin", "Config", 0, 0, ["mine"])
+
+    result, invalidated = overlay.apply("plugin", "Config", [["theirs"]])
+
+    assert result == [["mine"]]
+    assert invalidated == []
+    assert overlay.pending("plugin", "Config") == 1
+
+
+def test_range_read_uses_bounds():
+    clock = FakeClock()
+    overlay = WriteOverlay(clock=clock)
+    overlay.record("plugin", "Config", 12, 1, [5, 6])
+    overlay.record("plugin", "Config", 0, 0, ["elsewhere"])
+
+    # B13:B14 read before the write finished
+    result, _ = overlay.apply("plugin", "Config", [["1"], ["2"]], read_started=-1, bounds=(12, 13, 1, 1))
+    assert result == [["5"], ["6"]]
+
+    clock.now = 1
+    overlay.apply("plugin", "Config", [["5"], ["6"]], read_started=2, bounds=(12, 13, 1, 1))
+    assert overlay.pending("plugin", "Config") == 1
+    assert overlay.confirmed_writes == 2
+
+
+def test_only_fetched_cells_are_settled():
+    overlay = WriteOverlay(clock=FakeClock())
+    overlay.record("sheet", "Hunt", 1, 0, ["a"])
+    overlay.record("sheet", "Hunt", 1, 3, ["b"])
+
+    result, _ = overlay.apply("sheet", "Hunt", [["x", "", "", "y"], ["old", "", "", "old"]], read_started=1,
+                              fetched=[(None, None, 0, 1)])
+
+    assert result[1] == ["old", "", "", "b"]
+    assert overlay.pending("sheet", "Hunt") == 1
+    assert overlay.invalidated_writes == 1
+